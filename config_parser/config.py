@@ -177,7 +177,8 @@ def p_error(p):
     print p
     print "Syntax error in input!"
 
-parser = yacc.yacc()
+# See imperative_parser, whose parsers have their own table modules too.
+parser = yacc.yacc(tabmodule='skit_parsetab')
 
 def parse(s):
     global SUCCEEDED
@@ -0,0 +1,73 @@
+"""Measure how quickly configs are converted and coerced by Config.init().
+
+Compiles the skit variants in config_parser/test, as skit -c does, then
+loads each into Config many times over and reports how long Config.init()
+took per load. Copying the compiled config, which skit and worker processes
+do anyway, is not timed.
+
+Usage:
+    python engine/benchmarks/config_benchmark.py [load_count]
+"""
+
+# Add engine package to Python path, as in start.py.
+import sys
+import os
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+CONFIG_PARSER_PATH = os.path.join(ROOT_PATH, 'config_parser')
+
+sys.path.insert(1, ROOT_PATH)
+
+import copy
+import glob
+import time
+
+from engine.src.config.config import Config
+
+
+def compile_variants():
+    """Compile each skit variant in config_parser/test.
+
+    Returns:
+        dict. Config of each variant, keyed by name.
+    """
+
+    # skit compiles from, and into, paths relative to config_parser.
+    os.chdir(CONFIG_PARSER_PATH)
+    sys.path.insert(1, CONFIG_PARSER_PATH)
+
+    import skit
+
+    skit.compile('default.skit')
+
+    configs = {}
+
+    for path in sorted(glob.glob('test/*.skit')):
+        name = os.path.splitext(os.path.basename(path))[0]
+        configs[name] = skit.compile(path)[0].get(name)
+
+    return configs
+
+
+def main(load_count):
+
+    configs = compile_variants()
+
+    for name in sorted(configs):
+        copies = [copy.deepcopy(configs[name]) for _ in range(load_count)]
+
+        start = time.time()
+
+        for config in copies:
+            Config.config = config
+            Config.init()
+
+        init_time = time.time() - start
+
+        print '{}: {:.2f}ms per init'.format(
+            name, 1000 * init_time / load_count)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,50 @@
+"""Measure how many rollouts per second MCTSAgent runs.
+
+Plays the first turns of a game between an MCTSAgent and random agents and
+reports the agent's rollouts per second, with the search spread across the
+given number of processes.
+
+Usage:
+    python engine/benchmarks/mcts_benchmark.py [turn_count] [processes]
+"""
+
+# Add engine package to Python path, as in start.py.
+import sys
+import os
+
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+import copy
+import random
+
+from engine.src.config.config import Config
+from engine.src.config.game_config import game_config
+from engine.src.headless_game import HeadlessGame
+from engine.src.agent.random_agent import RandomAgent
+from engine.src.agent.mcts_agent import MCTSAgent
+
+
+PLAYER_COUNT = 3
+ITERATIONS = 200
+
+
+def main(turn_count, processes):
+
+    Config.config = copy.deepcopy(game_config)
+    Config.init()
+
+    agent = MCTSAgent(random.Random(0), ITERATIONS, processes=processes)
+    game = HeadlessGame([agent] + [RandomAgent(random.Random(seat))
+                                   for seat in range(1, PLAYER_COUNT)],
+                        seed=0)
+    game.start(turn_count)
+
+    print '{} rollouts in {:.1f}s with {} processes, {:.0f} per second'\
+        .format(agent.rollout_count, agent.search_time, processes,
+                agent.rollouts_per_second)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 30,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 1)
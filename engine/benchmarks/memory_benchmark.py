@@ -0,0 +1,133 @@
+"""Measure how many bytes a game in progress takes up.
+
+Builds a number of games, places structures at random on each board, and
+reports the average deep size of a game, i.e. the size of every object
+reachable from it that isn't shared between games, such as classes, enum
+members and the config.
+
+Usage:
+    python engine/benchmarks/memory_benchmark.py [game_count]
+"""
+
+# Add engine package to Python path, as in start.py.
+import sys
+import os
+
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+import copy
+import random
+import types
+from enum import Enum
+
+from engine.src.config.config import Config
+from engine.src.config.game_config import game_config
+from engine.src.game import Game
+from engine.src.player import Player
+from engine.src.direction.edge_direction import EdgeDirection
+from engine.src.direction.vertex_direction import VertexDirection
+from engine.src.exceptions import *
+
+
+PLAYER_COUNT = 4
+PLACEMENT_ATTEMPT_COUNT = 200
+
+EDGE_DIRS = list(EdgeDirection)
+VERTEX_DIRS = list(VertexDirection)
+
+# Objects of these types are shared by every game, so aren't counted.
+SHARED_TYPES = (type, types.ModuleType, types.FunctionType,
+                types.BuiltinFunctionType, types.MethodType, Enum)
+
+
+def deep_getsizeof(obj, seen):
+    """Get the size of obj and of everything reachable from it, in bytes.
+
+    Args:
+        obj (object): Object to measure.
+
+        seen (set): Ids of objects already counted, which won't be counted
+          again.
+
+    Returns:
+        int. Total size in bytes.
+    """
+
+    if id(obj) in seen or isinstance(obj, SHARED_TYPES):
+        return 0
+
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        children = obj.keys() + obj.values()
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        children = obj
+    else:
+        children = []
+
+        if hasattr(obj, '__dict__'):
+            children.append(obj.__dict__)
+
+        for cls in type(obj).__mro__:
+            for slot in cls.__dict__.get('__slots__', ()):
+                if hasattr(obj, slot):
+                    children.append(getattr(obj, slot))
+
+    return size + sum(deep_getsizeof(child, seen) for child in children)
+
+
+def create_game(rng):
+    """Create a game and place structures at random on its board."""
+
+    game = Game()
+    game.players = [Player('Player {}'.format(i))
+                    for i in range(PLAYER_COUNT)]
+
+    board = game.board
+    locations = [(tile.x, tile.y) for tile in board.iter_tiles()]
+
+    for _ in range(PLACEMENT_ATTEMPT_COUNT):
+        player = rng.choice(game.players)
+        x, y = rng.choice(locations)
+
+        try:
+            if rng.random() < 0.6:
+                board.place_edge_structure(
+                    x, y, rng.choice(EDGE_DIRS),
+                    player.get_structure('Road'), False)
+            else:
+                board.place_vertex_structure(
+                    x, y, rng.choice(VERTEX_DIRS),
+                    player.get_structure('Settlement'), False)
+        except (BoardPositionOccupiedException,
+                InvalidBaseStructureException,
+                InvalidStructurePlacementException,
+                NotEnoughStructuresException):
+            continue
+
+    return game
+
+
+def main(game_count):
+
+    Config.config = copy.deepcopy(game_config)
+    Config.init()
+
+    rng = random.Random(0)
+    random.seed(0)
+
+    games = [create_game(rng) for _ in range(game_count)]
+
+    # Anything a game shares with another game is only counted once.
+    seen = set()
+    total_size = sum(deep_getsizeof(game, seen) for game in games)
+
+    print '{} games, {} bytes per game'.format(game_count,
+                                               total_size / game_count)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,82 @@
+"""Measure how quickly logged games are logged and replayed.
+
+Plays a number of games between random agents with an event log attached,
+then replays each log from start to finish, and reports the size of the
+logs and how many events per second were replayed.
+
+Usage:
+    python engine/benchmarks/replay_benchmark.py [game_count]
+"""
+
+# Add engine package to Python path, as in start.py.
+import sys
+import os
+
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+import copy
+import random
+import time
+
+from engine.src.config.config import Config
+from engine.src.config.game_config import game_config
+from engine.src.headless_game import HeadlessGame
+from engine.src.agent.random_agent import RandomAgent
+from engine.src.event_log.game_log import GameLog
+from engine.src.event_log.game_replay import GameReplay
+
+
+PLAYER_COUNT = 4
+MAX_TURNS = 400
+
+
+def play_game(seed):
+    """Play a logged game between random agents.
+
+    Returns:
+        GameLog.
+    """
+
+    game = HeadlessGame([RandomAgent(random.Random((seed, seat)))
+                         for seat in range(PLAYER_COUNT)], seed=seed)
+    log = GameLog.attach(game)
+    game.start(MAX_TURNS)
+
+    return log
+
+
+def main(game_count):
+
+    Config.config = copy.deepcopy(game_config)
+    Config.init()
+
+    start = time.time()
+    logs = [play_game(seed) for seed in range(game_count)]
+    play_time = time.time() - start
+
+    event_count = sum(len(log) for log in logs)
+    byte_count = sum(len(log.to_bytes()) for log in logs)
+
+    # Rebuilding each board from its seed is timed separately, as it's paid
+    # once per log however many positions are rebuilt.
+    start = time.time()
+    replays = [GameReplay(log) for log in logs]
+    setup_time = time.time() - start
+
+    start = time.time()
+
+    for replay in replays:
+        replay.seek(len(replay))
+
+    replay_time = time.time() - start
+
+    print '{} games in {:.1f}s, {} events, {} bytes per game'.format(
+        game_count, play_time, event_count, byte_count / game_count)
+    print 'Setup: {:.1f}ms per game'.format(1000 * setup_time / game_count)
+    print 'Replay: {:.0f} events per second'.format(
+        event_count / replay_time)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
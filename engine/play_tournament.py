@@ -0,0 +1,83 @@
+"""Play a round-robin tournament between agents and report their ratings.
+
+Usage:
+    python engine/play_tournament.py -a NAME=MODULE.CLASS [-a ...]
+        [-c COMPILED_SKIT ...] [-p player_count] [-r rounds] [-j processes]
+        [-s seed] [-t max_turns] [-k checkpoint_path]
+
+Agents are given by the dotted path of their class, e.g.
+random=engine.src.agent.random_agent.RandomAgent. Rule variants are given
+by skit files compiled with skit -c, found in its tmp/ directory, and
+default to the base game. With -k, the tournament resumes from the
+checkpoint if there is one.
+"""
+
+# Add engine package to Python path, as in start.py.
+import sys
+import os
+
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import importlib
+import pickle
+
+from engine.src.tournament.tournament import Tournament
+
+
+def load_agent_class(path):
+    module_name, class_name = path.rsplit('.', 1)
+
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def load_skit_config(path):
+    """Load the config of a skit file compiled by skit -c, as skit's run()
+    does."""
+
+    main_property = os.path.splitext(os.path.basename(path))[0]
+
+    with open(path, 'rb') as skit_file:
+        return pickle.load(skit_file).get(main_property)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Agent tournament')
+    arg_parser.add_argument('-a', '--agent', action='append', required=True)
+    arg_parser.add_argument('-c', '--config', action='append', default=[])
+    arg_parser.add_argument('-p', '--players', type=int, default=3)
+    arg_parser.add_argument('-r', '--rounds', type=int, default=10)
+    arg_parser.add_argument('-j', '--processes', type=int, default=None)
+    arg_parser.add_argument('-s', '--seed', type=int, default=0)
+    arg_parser.add_argument('-t', '--max-turns', type=int, default=1000)
+    arg_parser.add_argument('-k', '--checkpoint', default=None)
+    args = arg_parser.parse_args()
+
+    entrants = dict((name, load_agent_class(path)) for name, path in
+                    (agent.split('=', 1) for agent in args.agent))
+
+    configs = dict((os.path.splitext(os.path.basename(path))[0],
+                    load_skit_config(path)) for path in args.config) or None
+
+    tournament = Tournament(entrants, configs, args.players, args.rounds,
+                            args.seed, args.max_turns,
+                            checkpoint_path=args.checkpoint)
+
+    print '{0} of {1} matches already played'.format(
+        len(tournament.results), len(tournament.matches))
+
+    ratings = tournament.run(args.processes)
+
+    for config_name in sorted(ratings):
+        print '{0}:'.format(config_name)
+
+        win_counts = tournament.get_win_counts(config_name)
+
+        for name, rating in ratings[config_name].get_rankings():
+            print '  {0}: {1:.0f} ({2} wins in {3} matches)'.format(
+                name, rating, win_counts[name],
+                ratings[config_name].game_counts[name])
+
+
+if __name__ == '__main__':
+    main()
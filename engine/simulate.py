@@ -0,0 +1,63 @@
+"""Play many games between random agents and report how each seat fared.
+
+Usage:
+    python engine/simulate.py [-n game_count] [-p player_count] [-j processes]
+        [-s seed] [-t max_turns] [-o archive_path]
+
+With -o, every game and turn is also written to a columnar archive. See
+engine/src/archive/game_archive.py.
+"""
+
+# Add engine package to Python path, as in start.py.
+import sys
+import os
+
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+
+from engine.src.agent.random_agent import RandomAgent
+from engine.src.simulation import simulate
+from engine.src.archive.game_archive import archive_simulation
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Self-play simulation')
+    arg_parser.add_argument('-n', '--games', type=int, default=1000)
+    arg_parser.add_argument('-p', '--players', type=int, default=3)
+    arg_parser.add_argument('-j', '--processes', type=int, default=None)
+    arg_parser.add_argument('-s', '--seed', type=int, default=0)
+    arg_parser.add_argument('-t', '--max-turns', type=int, default=1000)
+    arg_parser.add_argument('-o', '--archive', default=None)
+    args = arg_parser.parse_args()
+
+    start_time = time.time()
+
+    agent_classes = [RandomAgent] * args.players
+
+    if args.archive is None:
+        summary = simulate(args.games, agent_classes, seed=args.seed,
+                           max_turns=args.max_turns,
+                           processes=args.processes)
+    else:
+        summary = archive_simulation(args.archive, args.games, agent_classes,
+                                     seed=args.seed, max_turns=args.max_turns,
+                                     processes=args.processes)
+
+    elapsed = time.time() - start_time
+
+    print '{0} games in {1:.1f}s ({2:.1f} games/s), {3} unfinished'.format(
+        summary.game_count, elapsed, summary.game_count / elapsed,
+        summary.unfinished_count)
+    print 'Mean turns: {0:.1f}'.format(summary.get_mean_turn_count())
+
+    for seat, (win_rate, error, mean_points) in enumerate(zip(
+            summary.get_win_rates(), summary.get_win_rate_errors(),
+            summary.get_mean_points())):
+        print 'Seat {0}: win rate {1:.3f} +/- {2:.3f}, {3:.2f} points'.format(
+            seat + 1, win_rate, 2 * error, mean_points)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from enum import Enum
+
+
+class ActionType(Enum):
+    """The kinds of action a player can take during their turn.
+
+    Actions are (ActionType, argument) tuples, where the argument depends on
+    the kind of action:
+        BUILD: Name of the structure to build.
+        BUY_DEVELOPMENT_CARD: None.
+        PLAY_DEVELOPMENT_CARD: The DevelopmentCard to play.
+        TRADE: None. The trade itself is chosen by Agent.choose_trade().
+        END_TURN: None.
+    """
+
+    BUILD = 'build'
+    BUY_DEVELOPMENT_CARD = 'buy_development_card'
+    PLAY_DEVELOPMENT_CARD = 'play_development_card'
+    TRADE = 'trade'
+    END_TURN = 'end_turn'
+
+    def __str__(self):
+        return '{0}'.format(self.value)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+from abc import ABCMeta, abstractmethod
+
+
+class Agent(object):
+    """Makes a player's decisions in a game without a human at the terminal.
+
+    Every choice is made from a list of legal options given by the game, so an
+    agent never has to know the rules, only how to pick.
+    """
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def choose_action(self, game, player, actions):
+        """Choose what to do next during the player's turn.
+
+        Args:
+            game (Game): The game being played.
+
+            player (Player): Player this agent decides for.
+
+            actions (list): Legal (ActionType, argument) tuples. Always
+              includes ending the turn.
+
+        Returns:
+            tuple. One of actions.
+        """
+        pass
+
+    @abstractmethod
+    def choose_placement(self, game, player, structure_name, placements):
+        """Choose where to place a structure.
+
+        Args:
+            structure_name (str): Name of the structure being placed.
+
+            placements (list): Legal (x, y, direction) tuples, as given by
+              GameBoard.legal_placements(). Never empty.
+
+        Returns:
+            tuple. One of placements.
+        """
+        pass
+
+    @abstractmethod
+    def choose_discards(self, game, player, resources, count):
+        """Choose which resource cards to discard when a 7 is rolled.
+
+        Args:
+            resources (list): The player's resource cards, one ResourceType
+              per card.
+
+            count (int): Number of cards to discard.
+
+        Returns:
+            list. Indices into resources of count distinct cards.
+        """
+        pass
+
+    @abstractmethod
+    def choose_robber_tile(self, game, player, tiles):
+        """Choose a tile to move the robber to.
+
+        Args:
+            tiles (list): Tiles the robber may move to.
+
+        Returns:
+            GameTile. One of tiles.
+        """
+        pass
+
+    @abstractmethod
+    def choose_player(self, game, player, players):
+        """Choose another player, e.g. to draw a resource card from.
+
+        Returns:
+            Player. One of players.
+        """
+        pass
+
+    @abstractmethod
+    def choose_resource_type(self, game, player, resource_types):
+        """Choose a resource type, e.g. when playing a monopoly card.
+
+        Returns:
+            ResourceType. One of resource_types.
+        """
+        pass
+
+    @abstractmethod
+    def choose_trade(self, game, player, trade_offers):
+        """Choose a trade to propose to the bank.
+
+        Args:
+            trade_offers (list): TradeOffers the bank would accept.
+
+        Returns:
+            TradeOffer. One of trade_offers, or None to not trade after all.
+        """
+        pass
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+from engine.src.resource_type import ResourceType
+from engine.src.exceptions import *
+
+
+class AgentInputManager(object):
+    """Stands in for InputManager, asking agents instead of the terminal.
+
+    Robbers and development cards prompt through game.input_manager. With an
+    instance of this class in its place, each prompt is answered by the agent
+    of the player it concerns, and every announcement is dropped.
+
+    Args:
+        game (HeadlessGame): Game whose agents to ask. Prompts that don't
+          name a player concern game.current_player.
+    """
+
+    def __init__(self, game):
+        self.game = game
+
+    def _get_agent(self, player=None):
+        if player is None:
+            player = self.game.current_player
+
+        return self.game.agents[player]
+
+    def output(self, msg):
+        pass
+
+    def input_default(self, msg, default=None, read_result=True):
+        return default
+
+    def prompt_vertex_placement(self, game):
+        return self._prompt_placement(game, 'Settlement')
+
+    def prompt_edge_placement(self, game):
+        return self._prompt_placement(game, 'Road')
+
+    def _prompt_placement(self, game, structure_name):
+
+        player = game.current_player
+        placements = game.board.legal_placements(player, structure_name)
+
+        if not placements:
+            raise InvalidStructurePlacementException()
+
+        return self._get_agent(player).choose_placement(
+            game, player, structure_name, placements)
+
+    def prompt_tile_coordinates(self, game):
+        """Ask for any tile, as development cards compiled by skit may.
+
+        Agents choose tiles only through choose_robber_tile(), so that is
+        asked, with every tile on the board to choose from.
+
+        Returns:
+            tuple. The (x, y) coordinates of the tile.
+        """
+
+        tile = self.prompt_robber_tile(game, game.current_player,
+                                       game.board.iter_tiles())
+
+        return tile.x, tile.y
+
+    def prompt_robber_tile(self, game, player, tiles):
+        return self._get_agent(player).choose_robber_tile(
+            game, player, list(tiles))
+
+    def prompt_discard_resources(self, game, player, resources, count):
+        return self._get_agent(player).choose_discards(
+            game, player, resources, count)
+
+    def prompt_select_player(self, game, players=None):
+
+        if players is None:
+            players = game.players
+
+        return self._get_agent().choose_player(
+            game, game.current_player, list(players))
+
+    def prompt_select_resource_type(self):
+        return self._get_agent().choose_resource_type(
+            self.game, self.game.current_player,
+            ResourceType.get_arable_types())
+
+    def announce_roll_value(self, roll_value):
+        pass
+
+    def announce_initial_structure_placement_stage(self):
+        pass
+
+    def announce_player_turn(self, player):
+        pass
+
+    def announce_structure_placement(self, player, structure_name):
+        pass
+
+    def announce_development_card_played(self, player, development_card):
+        pass
+
+    def announce_resource_distributions(self, distributions):
+        pass
+
+    def announce_trade_completed(self, trade_offer):
+        pass
@@ -0,0 +1,515 @@
+# -*- coding: utf-8 -*-
+import math
+import multiprocessing
+import random
+import time
+
+from engine.src.dice import Dice
+from engine.src.player import Player
+from engine.src.tile.game_tile import GameTile
+from engine.src.resource_type import ResourceType
+from engine.src.trading.trade_offer import TradeOffer
+from engine.src.card.development_card import DevelopmentCard
+from engine.src.agent.agent import Agent
+from engine.src.agent.action_type import ActionType
+
+from imperative_parser.oracle import ORACLE
+
+
+def _get_option_key(option):
+    """Get a hashable key identifying an option across search iterations.
+
+    Options are often objects rebuilt on every call, e.g. trade offers, or
+    shared by value, e.g. development cards of the same name, so are
+    identified by what they stand for rather than by identity.
+    """
+
+    if isinstance(option, tuple):
+        return tuple(_get_option_key(item) for item in option)
+    elif isinstance(option, DevelopmentCard):
+        return option.name
+    elif isinstance(option, TradeOffer):
+        return tuple((option.offered_resources[resource_type],
+                      option.requested_resources[resource_type])
+                     for resource_type in ResourceType.get_arable_types())
+    elif isinstance(option, GameTile):
+        return option.x, option.y
+    elif isinstance(option, Player):
+        return option.name
+
+    return option
+
+
+class _Node(object):
+    """A node of the search tree.
+
+    Decision nodes' children are keyed by (kind, option key) tuples, and
+    chance nodes' by ('roll', roll value) or ('draw', card name) tuples, so
+    that one node may hold both, e.g. when a roll is followed by a decision.
+
+    Attributes:
+        children (dict): Child nodes, keyed as above.
+
+        visits (int): Number of iterations that passed through this node.
+
+        reward_sums (list): Sum of each seat's reward over those iterations.
+    """
+
+    __slots__ = ('children', 'visits', 'reward_sums')
+
+    def __init__(self, player_count):
+        self.children = {}
+        self.visits = 0
+        self.reward_sums = [0.0] * player_count
+
+    def merge(self, other):
+        """Add the statistics of another search's node for the same state."""
+
+        self.visits += other.visits
+
+        for seat, reward_sum in enumerate(other.reward_sums):
+            self.reward_sums[seat] += reward_sum
+
+        for key, other_child in other.children.iteritems():
+            if key in self.children:
+                self.children[key].merge(other_child)
+            else:
+                self.children[key] = other_child
+
+
+class _SearchDice(Dice):
+    """Dice that tell the search what they rolled, see _SearchDriver."""
+
+    def __init__(self, driver, rng):
+        super(_SearchDice, self).__init__(rng=rng)
+        self.driver = driver
+
+    def roll(self):
+        roll_value = super(_SearchDice, self).roll()
+        self.driver.observe(('roll', roll_value))
+
+        return roll_value
+
+
+class _SearchDriver(Agent):
+    """Makes every player's decisions during a search iteration.
+
+    While in the tree, decisions are selected by UCT from the point of view
+    of the player deciding, and the first untried option met is added to
+    the tree. From there on, until the end of the iteration, decisions are
+    made at random.
+
+    Args:
+        game (HeadlessGame): Game being searched.
+
+        rng (random.Random): Source of randomness.
+
+        exploration (float): UCT exploration constant.
+    """
+
+    def __init__(self, game, rng, exploration):
+
+        self.rng = rng
+        self.exploration = exploration
+
+        self.seats = dict((id(player), seat)
+                          for seat, player in enumerate(game.players))
+
+        self.node = None
+        self.path = []
+
+    def begin(self, root):
+        """Start an iteration from the root of the tree."""
+
+        self.node = root
+        self.path = [root]
+
+    def observe(self, key):
+        """Follow a chance outcome down the tree, if still in it."""
+
+        if self.node is None:
+            return
+
+        child = self.node.children.get(key)
+
+        if child is None:
+            child = self.node.children[key] = _Node(len(self.seats))
+
+        self.path.append(child)
+        self.node = child
+
+    def backpropagate(self, rewards):
+        """Add each seat's reward to every node the iteration went through.
+        """
+
+        for node in self.path:
+            node.visits += 1
+
+            for seat, reward in enumerate(rewards):
+                node.reward_sums[seat] += reward
+
+    def _choose(self, kind, player, options):
+
+        node = self.node
+
+        if node is None:
+            return self.rng.choice(options)
+
+        keys = [(kind, _get_option_key(option)) for option in options]
+
+        untried_indices = [
+            index for index, key in enumerate(keys)
+            if key not in node.children or not node.children[key].visits]
+
+        if untried_indices:
+            index = self.rng.choice(untried_indices)
+
+            child = node.children.get(keys[index])
+
+            if child is None:
+                child = node.children[keys[index]] = _Node(len(self.seats))
+
+            # Leave the tree, now that it has grown by a node.
+            self.path.append(child)
+            self.node = None
+
+            return options[index]
+
+        seat = self.seats[id(player)]
+        log_visits = math.log(node.visits) if node.visits else 0.0
+
+        def get_upper_bound(index):
+            child = node.children[keys[index]]
+
+            return child.reward_sums[seat] / child.visits + \
+                self.exploration * math.sqrt(log_visits / child.visits)
+
+        index = max(range(len(options)), key=get_upper_bound)
+        child = node.children[keys[index]]
+
+        self.path.append(child)
+        self.node = child
+
+        return options[index]
+
+    def choose_action(self, game, player, actions):
+
+        action = self._choose('action', player, actions)
+
+        # Which card is drawn is down to chance.
+        if action[0] == ActionType.BUY_DEVELOPMENT_CARD:
+            self.observe(('draw', game.board.bank.development_cards[-1].name))
+
+        return action
+
+    def choose_placement(self, game, player, structure_name, placements):
+        return self._choose(('placement', structure_name), player,
+                            placements)
+
+    def choose_discards(self, game, player, resources, count):
+        return self.rng.sample(range(len(resources)), count)
+
+    def choose_robber_tile(self, game, player, tiles):
+        return self._choose('robber_tile', player, tiles)
+
+    def choose_player(self, game, player, players):
+        return self._choose('player', player, players)
+
+    def choose_resource_type(self, game, player, resource_types):
+        return self._choose('resource_type', player, resource_types)
+
+    def choose_trade(self, game, player, trade_offers):
+        return self._choose('trade', player, trade_offers)
+
+
+# The game and agent being searched, set before forking a search's worker
+# processes, so that they inherit the game rather than having it pickled.
+_search_state = {}
+
+
+def _search_worker(seed):
+    """Search the game in _search_state, from a forked worker process."""
+
+    agent = _search_state['agent']
+
+    return agent._search_tree(_search_state['game'], _search_state['player'],
+                              random.Random(seed),
+                              _search_state['iterations'])
+
+
+class MCTSAgent(Agent):
+    """An agent that picks actions by Monte Carlo tree search.
+
+    Each time the player is to act, the rest of their turn and the next
+    rollout_turns turns are played out many times over on the game itself,
+    which is restored after every iteration with Game.begin_action() and
+    undo_action(). Every player's decisions along the way are part of the
+    tree, each chosen by UCT from its own player's point of view, so that
+    building, trading and where to move the robber are searched together
+    with the action that leads to them. Dice rolls and development card
+    draws are chance nodes, sampled afresh on every iteration, with the
+    deck shuffled first so that the search can't see what's coming.
+
+    Iterations are rewarded with 1 for a win and otherwise with the share
+    of the points needed to win, per seat.
+
+    With processes, the search is root parallel: each worker process grows
+    its own tree from a fork of the game, and their trees are merged. A new
+    pool is forked for every search, so that workers inherit the game as it
+    stands rather than having it pickled, which it can't always be. Forking
+    and tearing down the pool takes on the order of a tenth of a second,
+    i.e. as long as a dozen or so iterations, so searches of fewer than
+    parallel_threshold iterations are run in this process instead.
+
+    Decisions that follow an action, e.g. where to build, are answered from
+    the searched tree. Decisions the search didn't reach, e.g. discards, are
+    made at random.
+
+    Attributes:
+        rollout_count (int): Number of iterations run so far, over every
+          search.
+
+        search_time (float): Seconds spent searching so far.
+
+    Args:
+        rng (random.Random): Source of randomness. Defaults to a new,
+          unseeded one.
+
+        iterations (int): Number of iterations per search, split between
+          processes. Unlimited if None, in which case time_limit must be
+          given.
+
+        time_limit (float): Seconds after which to stop searching, if given.
+
+        rollout_turns (int): Turns to play out after the current one.
+
+        exploration (float): UCT exploration constant.
+
+        processes (int): Number of worker processes to search with. Searches
+          in this process when 1, or when this process is itself a pool
+          worker, which can't have children of its own.
+
+        parallel_threshold (int): Fewest iterations per search worth forking
+          worker processes for. Searches with only a time limit always are.
+    """
+
+    def __init__(self, rng=None, iterations=100, time_limit=None,
+                 rollout_turns=6, exploration=0.7, processes=1,
+                 parallel_threshold=100):
+
+        if iterations is None and time_limit is None:
+            raise ValueError('Searches need an iteration or time budget.')
+
+        self.rng = rng if rng is not None else random.Random()
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.rollout_turns = rollout_turns
+        self.exploration = exploration
+        self.processes = processes
+        self.parallel_threshold = parallel_threshold
+
+        self.rollout_count = 0
+        self.search_time = 0.0
+
+        # Node of the searched tree reached by the last decision, from which
+        # to answer the next.
+        self._node = None
+
+    @property
+    def rollouts_per_second(self):
+        return self.rollout_count / self.search_time if self.search_time \
+            else 0.0
+
+    def choose_action(self, game, player, actions):
+
+        self._node = None
+
+        if len(actions) == 1:
+            return actions[0]
+
+        start = time.time()
+
+        if self.processes > 1 and \
+                not multiprocessing.current_process().daemon and \
+                (self.iterations is None or
+                 self.iterations >= self.parallel_threshold):
+            root, rollout_count = self._search_parallel(game, player)
+        else:
+            root, rollout_count = self._search_tree(game, player, self.rng,
+                                                    self.iterations)
+
+        self.search_time += time.time() - start
+        self.rollout_count += rollout_count
+
+        self._node = root
+
+        return self._follow('action', actions)
+
+    def _follow(self, kind, options):
+        """Choose the most visited option of the current node, if any was
+        searched, and move down to it.
+
+        Returns:
+            object. One of options.
+        """
+
+        node = self._node
+        best_index = None
+        best_visits = 0
+
+        if node is not None:
+            for index, option in enumerate(options):
+                child = node.children.get((kind, _get_option_key(option)))
+
+                if child is not None and child.visits > best_visits:
+                    best_index = index
+                    best_visits = child.visits
+
+        if best_index is None:
+            self._node = None
+
+            return self.rng.choice(options)
+
+        self._node = node.children[(kind, _get_option_key(
+            options[best_index]))]
+
+        return options[best_index]
+
+    def choose_placement(self, game, player, structure_name, placements):
+        return self._follow(('placement', structure_name), placements)
+
+    def choose_discards(self, game, player, resources, count):
+        return self.rng.sample(range(len(resources)), count)
+
+    def choose_robber_tile(self, game, player, tiles):
+        return self._follow('robber_tile', tiles)
+
+    def choose_player(self, game, player, players):
+        return self._follow('player', players)
+
+    def choose_resource_type(self, game, player, resource_types):
+        return self._follow('resource_type', resource_types)
+
+    def choose_trade(self, game, player, trade_offers):
+        return self._follow('trade', trade_offers)
+
+    def _search_parallel(self, game, player):
+        """Search from forked worker processes and merge their trees."""
+
+        _search_state.update(
+            agent=self, game=game, player=player,
+            iterations=None if self.iterations is None else
+            -(-self.iterations // self.processes))
+
+        seeds = [self.rng.getrandbits(64) for _ in range(self.processes)]
+
+        pool = multiprocessing.Pool(self.processes)
+
+        try:
+            searches = pool.map(_search_worker, seeds)
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+            _search_state.clear()
+
+        root, rollout_count = searches[0]
+
+        for other_root, other_rollout_count in searches[1:]:
+            root.merge(other_root)
+            rollout_count += other_rollout_count
+
+        return root, rollout_count
+
+    def _search_tree(self, game, player, rng, iterations):
+        """Grow a search tree from the current state of the game.
+
+        The game is left as it was found.
+
+        Returns:
+            tuple. Of the root _Node and the number of iterations run.
+        """
+
+        root = _Node(len(game.players))
+        driver = _SearchDriver(game, rng, self.exploration)
+
+        points_to_win = game.config.game.points_to_win
+        deadline = None if self.time_limit is None else \
+            time.time() + self.time_limit
+
+        # Everything a play out changes that undo_action() doesn't restore.
+        agents = game.agents
+        dice = game.dice
+        robber_rng = game.robber.rng
+        turn_count = game.turn_count
+        has_played_card = game.has_played_card
+        bought_cards = game.bought_cards
+        event_log = game.event_log
+
+        if event_log is not None:
+            event_log.detach()
+
+        game.agents = dict((game_player, driver)
+                           for game_player in game.players)
+        game.dice = _SearchDice(driver, rng)
+        game.robber.rng = rng
+
+        bank = game.board.bank
+        iteration_count = 0
+
+        try:
+            while (iterations is None or iteration_count < iterations) and \
+                    (deadline is None or time.time() < deadline):
+                game.begin_action()
+
+                game.turn_count = turn_count
+                game.current_player = player
+                game.has_played_card = has_played_card
+                game.bought_cards = list(bought_cards)
+
+                try:
+                    # Sample the order of the deck, which players can't know.
+                    rng.shuffle(bank.development_cards)
+                    bank.rehash_development_cards()
+
+                    driver.begin(root)
+                    winner = self._play_out(game, player, points_to_win)
+
+                    driver.backpropagate([
+                        1.0 if game_player is winner else
+                        min(1.0, float(game_player.get_total_points()) /
+                            points_to_win)
+                        for game_player in game.players])
+                finally:
+                    game.undo_action()
+
+                iteration_count += 1
+        finally:
+            game.agents = agents
+            game.dice = dice
+            game.robber.rng = robber_rng
+            game.turn_count = turn_count
+            game.has_played_card = has_played_card
+            game.bought_cards = bought_cards
+            game.current_player = player
+            ORACLE.set('player', player)
+
+            if event_log is not None:
+                event_log.attach_to(game)
+
+        return root, iteration_count
+
+    def _play_out(self, game, player, points_to_win):
+        """Play the rest of the player's turn and rollout_turns more.
+
+        Returns:
+            Player. The winner, if anyone won.
+        """
+
+        game.continue_turn(player)
+        game.turn_count += 1
+
+        if player.get_total_points() >= points_to_win:
+            return player
+
+        return game.game_loop(game.turn_count + self.rollout_turns)
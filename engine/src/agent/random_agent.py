@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+import random
+
+from engine.src.agent.agent import Agent
+
+
+class RandomAgent(Agent):
+    """An agent that picks uniformly at random among legal options.
+
+    Args:
+        rng (random.Random): Source of randomness. Defaults to a new,
+          unseeded one.
+    """
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random.Random()
+
+    def choose_action(self, game, player, actions):
+        return self.rng.choice(actions)
+
+    def choose_placement(self, game, player, structure_name, placements):
+        return self.rng.choice(placements)
+
+    def choose_discards(self, game, player, resources, count):
+        return self.rng.sample(range(len(resources)), count)
+
+    def choose_robber_tile(self, game, player, tiles):
+        return self.rng.choice(tiles)
+
+    def choose_player(self, game, player, players):
+        return self.rng.choice(players)
+
+    def choose_resource_type(self, game, player, resource_types):
+        return self.rng.choice(resource_types)
+
+    def choose_trade(self, game, player, trade_offers):
+        return self.rng.choice(trade_offers)
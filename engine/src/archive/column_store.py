@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+
+import numpy as np
+
+
+# Lists each table's columns and the number of rows in each of its chunks.
+MANIFEST_FILE_NAME = 'manifest.json'
+
+
+def _get_chunk_path(path, column, chunk_index):
+    return os.path.join(path, '{0}.{1:06d}.npy'.format(column, chunk_index))
+
+
+class ColumnWriter(object):
+    """Appends rows to a table stored as one .npy file per column and chunk.
+
+    Rows are buffered until chunk_size of them have been appended, then each
+    column of the buffer is saved to its own file, so memory use is bounded
+    by the chunk size however many rows are written. The manifest is
+    rewritten after every chunk, so a table is readable while it's written,
+    and up to its last full chunk if writing is interrupted.
+
+    Attributes:
+        path (str): Directory the table is written to.
+
+        dtype (np.dtype): Structured dtype of rows. Each field is a column,
+          and fields with a shape are saved as multidimensional columns.
+
+        chunk_size (int): Number of rows per chunk.
+
+        chunk_lengths (list): Number of rows in each chunk written so far.
+
+    Args:
+        path (str): See above. Created if need be. Any table already there
+          is overwritten.
+
+        dtype (np.dtype): See above.
+
+        chunk_size (int): See above.
+    """
+
+    def __init__(self, path, dtype, chunk_size=65536):
+
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.chunk_size = chunk_size
+        self.chunk_lengths = []
+
+        self._buffer = np.zeros(chunk_size, self.dtype)
+        self._buffer_length = 0
+
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+        self._write_manifest()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def append(self, rows):
+        """Append rows, flushing chunks as they fill up.
+
+        Args:
+            rows (np.ndarray): Rows of self.dtype, or anything np.asarray()
+              can convert to it.
+        """
+
+        rows = np.asarray(rows, self.dtype)
+        start = 0
+
+        while start < len(rows):
+            count = min(len(rows) - start,
+                        self.chunk_size - self._buffer_length)
+
+            self._buffer[self._buffer_length:self._buffer_length + count] = \
+                rows[start:start + count]
+            self._buffer_length += count
+            start += count
+
+            if self._buffer_length == self.chunk_size:
+                self.flush()
+
+    def flush(self):
+        """Write out buffered rows as a chunk, even if it isn't full."""
+
+        if not self._buffer_length:
+            return
+
+        chunk_index = len(self.chunk_lengths)
+
+        for column in self.dtype.names:
+            np.save(_get_chunk_path(self.path, column, chunk_index),
+                    self._buffer[column][:self._buffer_length])
+
+        self.chunk_lengths.append(self._buffer_length)
+        self._buffer_length = 0
+
+        self._write_manifest()
+
+    def close(self):
+        self.flush()
+
+    def _write_manifest(self):
+
+        manifest = {
+            'columns': list(self.dtype.names),
+            'chunk_lengths': self.chunk_lengths
+        }
+
+        # Replaced in one go, so readers never see half a manifest.
+        manifest_path = os.path.join(self.path, MANIFEST_FILE_NAME)
+
+        with open(manifest_path + '.tmp', 'w') as manifest_file:
+            json.dump(manifest, manifest_file)
+
+        os.rename(manifest_path + '.tmp', manifest_path)
+
+
+class ColumnReader(object):
+    """Reads a table written by ColumnWriter, memory-mapping its chunks.
+
+    Chunks are mapped rather than read, so scanning a column only pages in
+    what is actually looked at, and a table may be larger than memory.
+
+    Attributes:
+        path (str): Directory the table was written to.
+
+        columns (list): Names of the table's columns.
+
+        chunk_lengths (list): Number of rows in each chunk.
+
+    Args:
+        path (str): See above.
+    """
+
+    def __init__(self, path):
+
+        self.path = path
+
+        with open(os.path.join(path, MANIFEST_FILE_NAME)) as manifest_file:
+            manifest = json.load(manifest_file)
+
+        self.columns = [str(column) for column in manifest['columns']]
+        self.chunk_lengths = manifest['chunk_lengths']
+
+    def __len__(self):
+        return sum(self.chunk_lengths)
+
+    def get_chunk(self, column, chunk_index):
+        """Map one chunk of one column.
+
+        Returns:
+            np.memmap. Read-only.
+        """
+
+        return np.load(_get_chunk_path(self.path, column, chunk_index),
+                       mmap_mode='r')
+
+    def iter_chunks(self, columns=None):
+        """Iterate over the table a chunk at a time.
+
+        Args:
+            columns (list): Names of the columns to map. Defaults to all.
+
+        Yields:
+            dict. Of each column's chunk, see get_chunk(), keyed by name.
+        """
+
+        if columns is None:
+            columns = self.columns
+
+        for chunk_index in range(len(self.chunk_lengths)):
+            yield dict((column, self.get_chunk(column, chunk_index))
+                       for column in columns)
+
+    def get_column(self, column):
+        """Read a whole column into memory.
+
+        Returns:
+            np.ndarray.
+        """
+
+        chunks = [self.get_chunk(column, chunk_index)
+                  for chunk_index in range(len(self.chunk_lengths))]
+
+        if not chunks:
+            return np.zeros(0)
+
+        return np.concatenate(chunks)
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+import os
+
+import numpy as np
+
+from engine.src.simulation import SimulationSummary, iter_results
+from engine.src.archive.column_store import ColumnReader, ColumnWriter
+
+
+GAMES_TABLE = 'games'
+TURNS_TABLE = 'turns'
+
+
+def get_game_dtype(player_count):
+    """Get the dtype of the games table's rows.
+
+    Players are given by seat, and -1 stands for nobody. game_id is the
+    game's seed, which also replays it.
+    """
+
+    return np.dtype([
+        ('game_id', np.uint64),
+        ('winner', np.int8),
+        ('turn_count', np.int32),
+        ('points', np.int16, (player_count,)),
+        ('longest_road', np.int8),
+        ('largest_army', np.int8)
+    ])
+
+
+class GameArchiveWriter(object):
+    """Writes simulated games to a columnar archive.
+
+    An archive is a directory with two ColumnWriter tables: games, with one
+    row per game, and turns, with one row per seat per turn. Turn rows are a
+    game_id, see get_game_dtype(), followed by the fields of
+    simulation.get_turn_dtype(), and the turns table is only created once
+    a result with turns is added, as workers may play under another config
+    than this process's.
+
+    Attributes:
+        games, turns (ColumnWriter): The archive's tables. turns is None
+          until a result with turns is added.
+
+    Args:
+        path (str): Directory to write the archive to.
+
+        player_count (int): Number of seats at each game.
+
+        chunk_size (int): Number of rows per chunk. See ColumnWriter.
+    """
+
+    def __init__(self, path, player_count, chunk_size=65536):
+
+        self.path = path
+        self.chunk_size = chunk_size
+
+        self.games = ColumnWriter(os.path.join(path, GAMES_TABLE),
+                                  get_game_dtype(player_count), chunk_size)
+        self.turns = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add(self, result):
+        """Append a GameResult, and its turns if they were recorded."""
+
+        def get_seat(seat):
+            return -1 if seat is None else seat
+
+        self.games.append([(result.seed, get_seat(result.winner),
+                            result.turn_count, result.points,
+                            get_seat(result.longest_road),
+                            get_seat(result.largest_army))])
+
+        if result.turns is None:
+            return
+
+        if self.turns is None:
+            self.turns = ColumnWriter(
+                os.path.join(self.path, TURNS_TABLE),
+                [('game_id', np.uint64)] + result.turns.dtype.descr,
+                self.chunk_size)
+
+        rows = np.zeros(len(result.turns), self.turns.dtype)
+        rows['game_id'] = result.seed
+
+        for name in result.turns.dtype.names:
+            rows[name] = result.turns[name]
+
+        self.turns.append(rows)
+
+    def close(self):
+        self.games.close()
+
+        if self.turns is not None:
+            self.turns.close()
+
+
+class GameArchiveReader(object):
+    """Reads an archive written by GameArchiveWriter.
+
+    Attributes:
+        games, turns (ColumnReader): The archive's tables. turns is None if
+          no turns were recorded.
+
+    Args:
+        path (str): Directory the archive was written to.
+    """
+
+    def __init__(self, path):
+        self.games = ColumnReader(os.path.join(path, GAMES_TABLE))
+        self.turns = None
+
+        if os.path.isdir(os.path.join(path, TURNS_TABLE)):
+            self.turns = ColumnReader(os.path.join(path, TURNS_TABLE))
+
+
+def archive_simulation(path, game_count, agent_classes, config=None, seed=0,
+                       max_turns=1000, processes=None, chunk_size=16,
+                       rows_per_chunk=65536):
+    """Play games across a pool of worker processes, archiving every turn.
+
+    Results are written as they stream back from the workers, so memory use
+    doesn't grow with the number of games.
+
+    Args:
+        path (str): Directory to write the archive to.
+
+        config (dict): Config to play under, as compiled by skit. Defaults to
+          game_config. An archive holds games of a single config, as games
+          are keyed by seed and turn rows have its structures' columns.
+
+        rows_per_chunk (int): Number of rows per archive chunk.
+
+        Others: See simulation.iter_results().
+
+    Returns:
+        SimulationSummary.
+    """
+
+    configs = {'archive': config} if config is not None else None
+    summary = SimulationSummary(len(agent_classes))
+
+    with GameArchiveWriter(path, len(agent_classes),
+                           rows_per_chunk) as writer:
+        for result in iter_results(game_count, agent_classes, configs, seed,
+                                   max_turns, processes, chunk_size, True):
+            writer.add(result)
+            summary.add(result)
+
+    return summary
@@ -0,0 +1,445 @@
+# -*- coding: utf-8 -*-
+import copy
+import numpy as np
+
+from engine.src.dice import Dice
+from engine.src.resource_type import ResourceType
+from engine.src.structure.structure import Structure
+
+
+class ArrayBoardState(object):
+    """A GameBoard's state, stored in NumPy arrays indexed by topology ids.
+
+    The GameBoard remains the object view of the board, e.g. for the CLI.
+    Once attached to a board, this state mirrors every structure placed on the
+    board and every change to its tiles, so that production, vertex scores
+    and placement masks can be computed for all positions at once, and so that
+    copying the state is a handful of array copies.
+
+    Players are referred to by their index in the list of players given, and
+    structures by a code: 0 for no structure, otherwise one more than the
+    index of the structure's name in structure_names.
+
+    Attributes:
+        topology (BoardTopology): Topology the ids refer to.
+
+        players (list): Players whose structures may be placed on the board.
+
+        player_indices (dict): Index of each player, keyed by player.
+
+        structure_configs (dict): Config of each structure players can build,
+          keyed by structure name.
+
+        structure_names (list): Sorted names of the structures players can
+          build.
+
+        structure_yields (np.ndarray): Base yield of each structure code.
+
+        tile_resources (np.ndarray): Index of each tile's resource type in
+          RESOURCE_TYPES, indexed by tile id.
+
+        tile_chits (np.ndarray): Chit value of each tile, indexed by tile id.
+
+        tile_blocked (np.ndarray): Whether a calamity blocks each tile's
+          yield, indexed by tile id.
+
+        vertex_owners (np.ndarray): Index of the player owning each vertex,
+          or -1 if unclaimed, indexed by vertex id.
+
+        vertex_structures (np.ndarray): Code of the structure on each vertex,
+          indexed by vertex id.
+
+        edge_owners (np.ndarray): As vertex_owners, but for edges.
+
+        edge_structures (np.ndarray): As vertex_structures, but for edges.
+
+    Args:
+        board (GameBoard): Board whose current state to copy.
+
+        players (list): Players whose structures may be placed on the board.
+    """
+
+    # Arable resource types, followed by ResourceType.FALLOW. Production
+    # arrays have a column for each arable type, in this order.
+    RESOURCE_TYPES = ResourceType.get_arable_types() + [ResourceType.FALLOW]
+    FALLOW_INDEX = len(RESOURCE_TYPES) - 1
+
+    # Arrays that make up the state proper, as opposed to the topology.
+    STATE_ARRAY_NAMES = ('tile_resources', 'tile_chits', 'tile_blocked',
+                         'vertex_owners', 'vertex_structures',
+                         'edge_owners', 'edge_structures')
+
+    def __init__(self, board, players):
+
+        topology = board.topology
+
+        self.topology = topology
+
+        self.players = list(players)
+        self.player_indices = dict(
+            (player, index) for index, player in enumerate(self.players))
+
+        # The board's, so that they're those of the variant it was made under.
+        self.structure_configs = dict(
+            (structure['name'], structure)
+            for structure in board.structure_configs.itervalues())
+
+        self.structure_names = sorted(self.structure_configs)
+        self.structure_yields = np.array(
+            [0] + [self.structure_configs[name]['base_yield']
+                   for name in self.structure_names])
+
+        # Adjacency as arrays. Rows with fewer neighbors are padded with an
+        # id one past the last one, which indexes a False or 0 appended to
+        # whatever array is being gathered from.
+        self.tile_vertices = np.array(topology.tile_vertices)
+        self.vertex_tiles = ArrayBoardState._pad(topology.vertex_tiles,
+                                                 topology.tile_count)
+        self.vertex_vertices = ArrayBoardState._pad(topology.vertex_vertices,
+                                                    topology.vertex_count)
+        self.vertex_edges = ArrayBoardState._pad(topology.vertex_edges,
+                                                 topology.edge_count)
+        self.edge_edges = ArrayBoardState._pad(topology.edge_edges,
+                                               topology.edge_count)
+
+        self.tile_resources = np.zeros(topology.tile_count, np.int8)
+        self.tile_chits = np.zeros(topology.tile_count, np.int8)
+        self.tile_blocked = np.zeros(topology.tile_count, np.bool_)
+
+        for tile_id, tile in enumerate(board.tiles_by_id):
+            self.update_tile(tile_id, tile, tile in board.blocked_tiles)
+
+        self.vertex_owners = np.full(topology.vertex_count, -1, np.int8)
+        self.vertex_structures = np.zeros(topology.vertex_count, np.int8)
+
+        for vertex_id, vertex_val in enumerate(board.vertex_vals):
+            if isinstance(vertex_val, Structure):
+                self.update_vertex(vertex_id, vertex_val)
+
+        self.edge_owners = np.full(topology.edge_count, -1, np.int8)
+        self.edge_structures = np.zeros(topology.edge_count, np.int8)
+
+        for edge_id, edge_val in enumerate(board.edge_vals):
+            if isinstance(edge_val, Structure):
+                self.update_edge(edge_id, edge_val)
+
+    @staticmethod
+    def attach(board, players):
+        """Create the board's array state, and keep it in sync with the board.
+
+        Args:
+            board (GameBoard): Board to mirror.
+
+            players (list): See ArrayBoardState.
+
+        Returns:
+            ArrayBoardState. The state, also available as board.array_state.
+        """
+
+        board.array_state = ArrayBoardState(board, players)
+
+        return board.array_state
+
+    @staticmethod
+    def _pad(rows, pad_value):
+        """Stack rows of varying length into a 2D array, padding as needed."""
+
+        padded = np.full((len(rows), max(len(row) for row in rows)),
+                         pad_value, np.intp)
+
+        for index, row in enumerate(rows):
+            padded[index, :len(row)] = row
+
+        return padded
+
+    @staticmethod
+    def get_pips(dice=None):
+        """Count the ways each sum can be rolled with the given dice.
+
+        Args:
+            dice (Dice): Dice to roll. Defaults to the game's default dice.
+
+        Returns:
+            np.ndarray. Number of outcomes summing to each value, indexed by
+              value.
+        """
+
+        if dice is None:
+            dice = Dice()
+
+        return dice.get_sum_counts()
+
+    def copy(self):
+        """Copy this state. The copy is not attached to any board."""
+
+        state_copy = copy.copy(self)
+
+        for name in ArrayBoardState.STATE_ARRAY_NAMES:
+            setattr(state_copy, name, getattr(self, name).copy())
+
+        return state_copy
+
+    def restore(self, state):
+        """Overwrite this state with a copy of the given one, in place."""
+
+        for name in ArrayBoardState.STATE_ARRAY_NAMES:
+            np.copyto(getattr(self, name), getattr(state, name))
+
+    def get_structure_code(self, structure_name):
+        return self.structure_names.index(structure_name) + 1
+
+    def update_tile(self, tile_id, tile, blocked):
+        """Mirror the tile's resource type and chit value.
+
+        Args:
+            tile_id (int): Id of the tile.
+
+            tile (GameTile): Tile to mirror.
+
+            blocked (bool): Whether a calamity blocks the tile's yield.
+        """
+
+        self.tile_resources[tile_id] = \
+            ArrayBoardState.RESOURCE_TYPES.index(tile.resource_type)
+        self.tile_chits[tile_id] = tile.chit_value
+        self.tile_blocked[tile_id] = blocked
+
+    def update_vertex(self, vertex_id, vertex_val):
+        """Mirror the value of the given vertex, structure or not."""
+
+        if isinstance(vertex_val, Structure):
+            self.vertex_owners[vertex_id] = \
+                self.player_indices[vertex_val.owning_player]
+            self.vertex_structures[vertex_id] = \
+                self.get_structure_code(vertex_val.name)
+        else:
+            self.vertex_owners[vertex_id] = -1
+            self.vertex_structures[vertex_id] = 0
+
+    def update_edge(self, edge_id, edge_val):
+        """Mirror the value of the given edge, structure or not."""
+
+        if isinstance(edge_val, Structure):
+            self.edge_owners[edge_id] = \
+                self.player_indices[edge_val.owning_player]
+            self.edge_structures[edge_id] = \
+                self.get_structure_code(edge_val.name)
+        else:
+            self.edge_owners[edge_id] = -1
+            self.edge_structures[edge_id] = 0
+
+    def _get_producing_tile_mask(self):
+        return (self.tile_resources != ArrayBoardState.FALLOW_INDEX) & \
+            ~self.tile_blocked
+
+    def _gather_production(self, tile_mask):
+        """Get the yield of every structure on the masked, producing tiles.
+
+        Returns:
+            tuple. Arrays of the chit value, owner index, resource type index
+              and yield of each (tile, structure) pair.
+        """
+
+        tile_ids = np.flatnonzero(tile_mask & self._get_producing_tile_mask())
+        vertex_ids = self.tile_vertices[tile_ids]
+
+        owners = self.vertex_owners[vertex_ids]
+        occupied = owners >= 0
+
+        chits = np.broadcast_to(self.tile_chits[tile_ids, np.newaxis],
+                                vertex_ids.shape)
+        resources = np.broadcast_to(self.tile_resources[tile_ids, np.newaxis],
+                                    vertex_ids.shape)
+        yields = self.structure_yields[self.vertex_structures[vertex_ids]]
+
+        return (chits[occupied], owners[occupied], resources[occupied],
+                yields[occupied])
+
+    def get_production_table(self):
+        """Compute what every roll value yields.
+
+        Returns:
+            np.ndarray. Shape (highest chit value + 1, player count, arable
+              resource type count). Entry [r, p, t] is how many resources of
+              the t'th type in RESOURCE_TYPES player p receives when r is
+              rolled.
+        """
+
+        chits, owners, resources, yields = self._gather_production(True)
+
+        production = np.zeros((self.tile_chits.max() + 1, len(self.players),
+                               ArrayBoardState.FALLOW_INDEX), np.int64)
+
+        np.add.at(production, (chits, owners, resources), yields)
+
+        return production
+
+    def get_production(self, roll_value):
+        """Compute what the given roll value yields.
+
+        Returns:
+            np.ndarray. Shape (player count, arable resource type count). See
+              get_production_table().
+        """
+
+        _, owners, resources, yields = self._gather_production(
+            self.tile_chits == roll_value)
+
+        production = np.zeros((len(self.players),
+                               ArrayBoardState.FALLOW_INDEX), np.int64)
+
+        np.add.at(production, (owners, resources), yields)
+
+        return production
+
+    def get_vertex_scores(self, dice=None):
+        """Sum the pips of the producing tiles around each vertex.
+
+        Args:
+            dice (Dice): Dice whose pips to use. See get_pips().
+
+        Returns:
+            np.ndarray. Score of each vertex, indexed by vertex id.
+        """
+
+        pips = ArrayBoardState.get_pips(dice)
+        chits = np.minimum(self.tile_chits, len(pips) - 1)
+
+        tile_pips = np.where(self._get_producing_tile_mask() &
+                             (self.tile_chits < len(pips)), pips[chits], 0)
+
+        return np.append(tile_pips, 0)[self.vertex_tiles].sum(axis=1)
+
+    def _get_replaceable_mask(self, owners, structures, player_index,
+                              structure_name):
+        """Where the structure may be placed, as far as occupancy goes.
+
+        See GameBoard._can_replace().
+        """
+
+        structure_config = self.structure_configs[structure_name]
+        augments = structure_config.get('upgrades') or \
+            structure_config.get('extends')
+
+        replaceable = structures == 0
+
+        if augments is not None:
+            replaceable |= (owners == player_index) & \
+                (structures == self.get_structure_code(augments))
+
+        return replaceable
+
+    def get_vertex_placement_mask(self, player, structure_name,
+                                  must_border_claimed_edge=True):
+        """Find every vertex the player could place the structure on.
+
+        Applies the same rules as GameBoard.legal_placement_ids().
+
+        Returns:
+            np.ndarray. Whether each vertex is legal, indexed by vertex id.
+        """
+
+        return self.compute_vertex_placement_mask(
+            self.vertex_owners, self.vertex_structures, self.edge_owners,
+            self.player_indices[player], structure_name,
+            must_border_claimed_edge)
+
+    def get_edge_placement_mask(self, player, structure_name,
+                                must_border_claimed_edge=True,
+                                vertex_id=None):
+        """Find every edge the player could place the structure on.
+
+        Applies the same rules as GameBoard.legal_placement_ids().
+
+        Args:
+            vertex_id (int): If given, only edges with this vertex as an
+              endpoint are legal, e.g. as during initial placement.
+
+        Returns:
+            np.ndarray. Whether each edge is legal, indexed by edge id.
+        """
+
+        bordering = None
+
+        if vertex_id is not None:
+            bordering = np.zeros(self.topology.edge_count, np.bool_)
+            bordering[list(self.topology.vertex_edges[vertex_id])] = True
+
+        return self.compute_edge_placement_mask(
+            self.edge_owners, self.edge_structures,
+            self.player_indices[player], structure_name,
+            must_border_claimed_edge, bordering)
+
+    @staticmethod
+    def _append_false(mask):
+        """Append a False along the last axis, for padded ids to index."""
+
+        return np.concatenate(
+            [mask, np.zeros(mask.shape[:-1] + (1,), np.bool_)], -1)
+
+    def compute_vertex_placement_mask(self, vertex_owners, vertex_structures,
+                                      edge_owners, player_index,
+                                      structure_name,
+                                      must_border_claimed_edge=True):
+        """Find every vertex a player could place the structure on.
+
+        Works on any state arrays of this topology, e.g. stacked along a
+        leading batch axis, as long as player_index broadcasts against them.
+
+        Args:
+            vertex_owners, vertex_structures, edge_owners (np.ndarray): State
+              arrays, as the attributes of the same name.
+
+            player_index (int or np.ndarray): Index of the player.
+
+            structure_name (str): Name of the structure.
+
+            must_border_claimed_edge (bool): See get_vertex_placement_mask().
+
+        Returns:
+            np.ndarray. Whether each vertex is legal, shaped as
+              vertex_owners.
+        """
+
+        mask = self._get_replaceable_mask(
+            vertex_owners, vertex_structures, player_index, structure_name)
+
+        # The Distance Rule.
+        occupied = ArrayBoardState._append_false(vertex_structures != 0)
+        mask &= ~occupied[..., self.vertex_vertices].any(axis=-1)
+
+        # Only new structures need to neighbor one of the player's roads.
+        if must_border_claimed_edge:
+            claimed = ArrayBoardState._append_false(
+                edge_owners == player_index)
+            mask &= claimed[..., self.vertex_edges].any(axis=-1) | \
+                (vertex_structures != 0)
+
+        return mask
+
+    def compute_edge_placement_mask(self, edge_owners, edge_structures,
+                                    player_index, structure_name,
+                                    must_border_claimed_edge=True,
+                                    bordering=None):
+        """Find every edge a player could place the structure on.
+
+        See compute_vertex_placement_mask().
+
+        Args:
+            bordering (np.ndarray): If given, only edges where this is True
+              are legal. Broadcasts against edge_owners.
+        """
+
+        mask = self._get_replaceable_mask(
+            edge_owners, edge_structures, player_index, structure_name)
+
+        if bordering is not None:
+            mask &= bordering
+
+        if must_border_claimed_edge:
+            claimed = ArrayBoardState._append_false(
+                edge_owners == player_index)
+            mask &= claimed[..., self.edge_edges].any(axis=-1) | \
+                (edge_structures != 0)
+
+        return mask
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+from engine.src.tile.hex_tile import HexTile
+from engine.src.direction.edge_direction import EdgeDirection
+from engine.src.direction.vertex_direction import VertexDirection
+from engine.src.direction.edge_vertex_mapping import EdgeVertexMapping
+
+
+class BoardTopology(object):
+    """Canonical integer indexing of a hextile board's tiles, vertices and edges.
+
+    Neighboring tiles share vertices and edges, so a single physical vertex can
+    be addressed by up to three (x, y, vertex_dir) triples, and a single
+    physical edge by up to two (x, y, edge_dir) triples. Here every physical
+    tile, vertex and edge is assigned one integer id, and all adjacency between
+    them is computed once, so that adjacency queries become tuple lookups
+    rather than walks over tile dicts and direction mappings.
+
+    Attributes:
+        tile_coords (list): Axial (x, y) coordinates of each tile, indexed by
+          tile id. Ordered as in HexBoard.iter_tile_coords().
+
+        tile_ids (dict): Tile ids, keyed by axial (x, y) coordinates.
+
+        vertex_ids (dict): Vertex ids, keyed by every (x, y, vertex_dir)
+          triple that addresses the vertex.
+
+        edge_ids (dict): Edge ids, keyed by every (x, y, edge_dir) triple that
+          addresses the edge.
+
+        vertex_locations (list): For each vertex id, a tuple of every
+          (x, y, vertex_dir) triple addressing that vertex. The first triple
+          is the canonical one.
+
+        edge_locations (list): For each edge id, a tuple of every
+          (x, y, edge_dir) triple addressing that edge. The first triple is the
+          canonical one.
+
+        tile_vertices (list): For each tile id, the ids of its 6 vertices,
+          in VertexDirection order.
+
+        tile_edges (list): For each tile id, the ids of its 6 edges, in
+          EdgeDirection order.
+
+        vertex_tiles (list): For each vertex id, the ids of the 1 to 3 tiles
+          that converge at that vertex.
+
+        vertex_edges (list): For each vertex id, the ids of the 2 or 3 edges
+          that have that vertex as an endpoint.
+
+        vertex_vertices (list): For each vertex id, the ids of the 2 or 3
+          vertices one edge away from it.
+
+        edge_vertices (list): For each edge id, the ids of its 2 endpoints.
+
+        edge_edges (list): For each edge id, the ids of the edges that share
+          an endpoint with it.
+
+    Args:
+        board (HexBoard): Board whose tiles have already been created.
+    """
+
+    # Topologies already computed, keyed by the tile coordinates they cover.
+    _topologies = {}
+
+    @staticmethod
+    def for_board(board):
+        """Get the topology of the board.
+
+        A topology is never modified once computed, so every board with the
+        same tile coordinates shares one.
+        """
+
+        tile_coords = tuple(board.iter_tile_coords())
+
+        if tile_coords not in BoardTopology._topologies:
+            BoardTopology._topologies[tile_coords] = BoardTopology(board)
+
+        return BoardTopology._topologies[tile_coords]
+
+    def __init__(self, board):
+
+        self.tile_coords = list(board.iter_tile_coords())
+        self.tile_ids = {}
+
+        for tile_id, coords in enumerate(self.tile_coords):
+            self.tile_ids[coords] = tile_id
+
+        self.vertex_ids = {}
+        self.vertex_locations = []
+
+        self.edge_ids = {}
+        self.edge_locations = []
+
+        for x, y in self.tile_coords:
+            for vertex_dir in VertexDirection:
+                if (x, y, vertex_dir) not in self.vertex_ids:
+                    self._add_vertex(x, y, vertex_dir)
+
+            for edge_dir in EdgeDirection:
+                if (x, y, edge_dir) not in self.edge_ids:
+                    self._add_edge(x, y, edge_dir)
+
+        self._compute_adjacency()
+
+    def _add_vertex(self, x, y, vertex_dir):
+        """Assign a new id to the vertex and to all its equivalent triples."""
+
+        vertex_id = len(self.vertex_locations)
+        locations = [(x, y, vertex_dir)]
+
+        # The same vertex is also a vertex of the tiles neighboring the two
+        # edges that have it as an endpoint.
+        for edge_dir in EdgeVertexMapping.get_edge_dirs_for_vertex_dir(
+                vertex_dir):
+            neighbor_coords = (x + edge_dir[0], y + edge_dir[1])
+
+            if neighbor_coords in self.tile_ids:
+                neighbor_vertex_dir = HexTile.get_equivalent_vertex_dir(
+                    vertex_dir, edge_dir)
+                locations.append(neighbor_coords + (neighbor_vertex_dir,))
+
+        for location in locations:
+            self.vertex_ids[location] = vertex_id
+
+        self.vertex_locations.append(tuple(locations))
+
+    def _add_edge(self, x, y, edge_dir):
+        """Assign a new id to the edge and to its neighbor's equivalent."""
+
+        edge_id = len(self.edge_locations)
+        locations = [(x, y, edge_dir)]
+
+        neighbor_coords = (x + edge_dir[0], y + edge_dir[1])
+
+        if neighbor_coords in self.tile_ids:
+            locations.append(
+                neighbor_coords + (edge_dir.get_opposite_direction(),))
+
+        for location in locations:
+            self.edge_ids[location] = edge_id
+
+        self.edge_locations.append(tuple(locations))
+
+    def _compute_adjacency(self):
+        """Precompute the adjacency tuples described in the class docstring."""
+
+        self.tile_vertices = []
+        self.tile_edges = []
+
+        for x, y in self.tile_coords:
+            self.tile_vertices.append(tuple(
+                self.vertex_ids[(x, y, vertex_dir)]
+                for vertex_dir in VertexDirection))
+
+            self.tile_edges.append(tuple(
+                self.edge_ids[(x, y, edge_dir)]
+                for edge_dir in EdgeDirection))
+
+        self.vertex_tiles = [
+            tuple(self.tile_ids[(x, y)] for x, y, _ in locations)
+            for locations in self.vertex_locations
+        ]
+
+        self.edge_vertices = []
+
+        for x, y, edge_dir in map(lambda loc: loc[0], self.edge_locations):
+            self.edge_vertices.append(tuple(
+                self.vertex_ids[(x, y, vertex_dir)] for vertex_dir in
+                EdgeVertexMapping.get_vertex_dirs_for_edge_dir(edge_dir)))
+
+        vertex_edges = [[] for _ in self.vertex_locations]
+        vertex_vertices = [[] for _ in self.vertex_locations]
+
+        for edge_id, (start_id, end_id) in enumerate(self.edge_vertices):
+            vertex_edges[start_id].append(edge_id)
+            vertex_edges[end_id].append(edge_id)
+
+            vertex_vertices[start_id].append(end_id)
+            vertex_vertices[end_id].append(start_id)
+
+        self.vertex_edges = map(tuple, vertex_edges)
+        self.vertex_vertices = map(tuple, vertex_vertices)
+
+        self.edge_edges = []
+
+        for edge_id, (start_id, end_id) in enumerate(self.edge_vertices):
+            self.edge_edges.append(tuple(
+                other_id for other_id in
+                self.vertex_edges[start_id] + self.vertex_edges[end_id]
+                if other_id != edge_id))
+
+    @property
+    def vertex_count(self):
+        return len(self.vertex_locations)
+
+    @property
+    def edge_count(self):
+        return len(self.edge_locations)
+
+    @property
+    def tile_count(self):
+        return len(self.tile_coords)
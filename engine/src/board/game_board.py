@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
-import random
+import re
 import pdb
 
+from engine.src.config.config import Config
 from engine.src.lib.utils import Utils
+from engine.src.lib.zobrist import Zobrist
+from engine.src.lib.game_random import GameRandom
 from engine.src.board.hex_board import HexBoard
 from engine.src.tile.game_tile import GameTile
 from engine.src.resource_type import ResourceType
@@ -16,6 +19,7 @@ from engine.src.direction.edge_direction import EdgeDirection
 from engine.src.direction.vertex_direction import VertexDirection
 from engine.src.exceptions import *
 from engine.src.structure.structure import Structure
+from engine.src.longest_road_search import LongestRoadTracker
 
 
 class GameBoard(HexBoard):
@@ -30,21 +34,88 @@ class GameBoard(HexBoard):
 
         bank (Bank): Bank of resources the board will interact with.
 
+        longest_roads (LongestRoadTracker): Keeps every player's longest road
+          up to date as structures are placed.
+
+        chit_value_tiles (dict): Lists of tiles, keyed by their chit value.
+
+        calamity_tiles (dict): The tile each calamity on the board is placed
+          on, keyed by calamity.
+
+        blocked_tiles (set): Tiles whose yield is blocked by a calamity.
+
+        production (dict): What each roll value yields. Primary keys are roll
+          values, secondary keys are players and tertiary keys are resource
+          types. Kept up to date as structures are placed and calamities move,
+          so that distributing resources for a roll is a single lookup.
+
+        array_state (ArrayBoardState): Array copy of this board's state, kept
+          in sync with it, if one has been attached. See
+          ArrayBoardState.attach().
+
+        journal (list): While recording, how to undo each change made to this
+          board, oldest first. None when not recording. See begin_action().
+
+        event_log (GameLog): Log that placements are appended to, if any.
+          See GameLog.attach().
+
+        zobrist_hash (int): Zobrist hash of the tiles' resource types and
+          chit values, the structures on the board and where each calamity
+          is. Kept up to date as these change.
+
+        rng (GameRandom): Source of this board's randomness, i.e. its layout
+          and, through a substream, its bank's deck.
+
+        structure_configs (dict): Config of each structure players can build,
+          keyed as in game.structure.player_built, as it was when the board
+          was made.
+
     Args:
         radius (int): See HexBoard.
+
+        rng (GameRandom): See above. Defaults to a new, unseeded one.
     """
 
-    def __init__(self, radius):
+    def __init__(self, radius, rng=None):
+
+        # HexBoard initializes every vertex and edge through
+        # update_vertex_with_id() and update_edge_with_id(), which hash them.
+        self.structure_hash = 0
 
         super(GameBoard, self).__init__(radius, GameTile)
 
+        self.chit_value_tiles = {}
+        self.calamity_tiles = {}
+        self.blocked_tiles = set()
+        self.production = {}
+
+        self._legal_placements_cache = {}
+        self._legal_placements_version = None
+
+        self.array_state = None
+        self.journal = None
+        self.event_log = None
+
+        self.rng = rng if rng is not None else GameRandom()
+
+        self.structure_configs = Config.get('game.structure.player_built')
+
+        # Let tiles tell the board when their resource type, chit value or
+        # calamities change.
+        for tile in self.iter_tiles():
+            tile.board = self
+
+        self.index_tiles()
+
         # We have tiles, but they currently have no value and are all FALLOW.
         # Here we assign resource types and chit values.
         self.assign_tile_resources()
         self.assign_tile_chit_values()
         self.assign_tile_harbors()
 
-        self.bank = Bank(len(list(self.iter_tiles())))
+        self.bank = Bank(len(list(self.iter_tiles())), self.rng.spawn('bank'))
+
+        self.longest_roads = LongestRoadTracker(self)
 
     def assign_tile_resources(self, assignment_func=None):
         """Assign resource types to this board's tiles.
@@ -63,6 +134,8 @@ class GameBoard(HexBoard):
         else:
             assignment_func()
 
+        self.index_tiles()
+
     def _default_assign_tile_resources(self):
         """Distributes non-fallow resource types across the board evenly.
 
@@ -78,7 +151,7 @@ class GameBoard(HexBoard):
 
         # Get a randomized list of the tiles of this board.
         tiles = list(self.iter_tiles())
-        random.shuffle(tiles)
+        self.rng.shuffle(tiles)
 
         resource_type_count = len(ResourceType.get_arable_types())
 
@@ -129,7 +202,7 @@ class GameBoard(HexBoard):
         """
 
         for tile in self.iter_tiles():
-            tile.resource_type = ResourceType.random()
+            tile.resource_type = self.rng.choice(list(ResourceType))
 
     def assign_tile_chit_values(self, assignment_func=None):
         """Assign chit values to this board's tiles.
@@ -148,6 +221,8 @@ class GameBoard(HexBoard):
         else:
             assignment_func()
 
+        self.index_tiles()
+
     def _randomly_assign_tile_chit_values(self, start=2, end=12,
                                           exclude=Calamity.DEFAULT_ROLL_VALUES):
         """Randomly assign chit values to this board's tiles.
@@ -170,7 +245,7 @@ class GameBoard(HexBoard):
         chit_values = frozenset(range(start, end + 1)).intersection(exclude)
 
         for tile in self.iter_tiles():
-            tile.chit_value = random.choice(chit_values)
+            tile.chit_value = self.rng.choice(chit_values)
 
     def _default_assign_tile_chit_values(self, start=2, end=12,
                                          exclude=Calamity.DEFAULT_ROLL_VALUES):
@@ -243,6 +318,214 @@ class GameBoard(HexBoard):
         # TODO
         pass
 
+    def index_tiles(self):
+        """Rebuild the chit value index and production table from scratch.
+
+        Called whenever tile resource types or chit values are assigned in
+        bulk. Changing a single tile, placing structures and moving calamities
+        update both incrementally.
+        """
+
+        self.chit_value_tiles = {}
+        self.calamity_tiles = {}
+        self.blocked_tiles = set()
+        self.production = {}
+        self.tile_hash = 0
+        self.calamity_hash = 0
+
+        for tile in self.iter_tiles():
+            self.chit_value_tiles.setdefault(tile.chit_value, []).append(tile)
+            self.tile_hash ^= self._get_tile_key(tile)
+
+            for calamity in tile.calamities:
+                self.calamity_tiles[calamity] = tile
+                self.calamity_hash ^= self._get_calamity_key(calamity, tile)
+
+            if CalamityTilePlacementEffect.BLOCK_YIELD in \
+                    tile.get_calamity_tile_placement_effects():
+                self.blocked_tiles.add(tile)
+            else:
+                self._add_tile_production(tile, 1)
+
+    def index_tile(self, tile):
+        """Add the tile to the chit value index and production table.
+
+        Called by GameTile after its resource type or chit value changes.
+        """
+
+        self.chit_value_tiles.setdefault(tile.chit_value, []).append(tile)
+        self.tile_hash ^= self._get_tile_key(tile)
+
+        if tile not in self.blocked_tiles:
+            self._add_tile_production(tile, 1)
+
+        self._update_array_state_tile(tile)
+
+    def unindex_tile(self, tile):
+        """Remove the tile from the chit value index and production table.
+
+        Called by GameTile before its resource type or chit value changes.
+        """
+
+        self._record(self._undo_tile_change, tile, tile.resource_type,
+                     tile.chit_value)
+
+        self.chit_value_tiles[tile.chit_value].remove(tile)
+        self.tile_hash ^= self._get_tile_key(tile)
+
+        if tile not in self.blocked_tiles:
+            self._add_tile_production(tile, -1)
+
+    @property
+    def zobrist_hash(self):
+        return self.tile_hash ^ self.calamity_hash ^ self.structure_hash
+
+    def _get_tile_key(self, tile):
+        return Zobrist.key('tile', self.topology.tile_ids[(tile.x, tile.y)],
+                           tile.resource_type.value, tile.chit_value)
+
+    def _get_calamity_key(self, calamity, tile):
+        return Zobrist.key('calamity', type(calamity).__name__,
+                           self.topology.tile_ids[(tile.x, tile.y)])
+
+    @staticmethod
+    def _get_structure_key(position_type, position_id, value):
+        """Get the key of a vertex or edge value, or 0 if not a structure."""
+
+        if not isinstance(value, Structure):
+            return 0
+
+        return Zobrist.key(position_type, position_id, value.name,
+                           value.owning_player.name)
+
+    def update_vertex_with_id(self, vertex_id, vertex_val):
+
+        position_type = PositionType.VERTEX.value
+
+        self.structure_hash ^= \
+            GameBoard._get_structure_key(position_type, vertex_id,
+                                         self.vertex_vals[vertex_id]) ^ \
+            GameBoard._get_structure_key(position_type, vertex_id, vertex_val)
+
+        super(GameBoard, self).update_vertex_with_id(vertex_id, vertex_val)
+
+    def update_edge_with_id(self, edge_id, edge_val):
+
+        position_type = PositionType.EDGE.value
+
+        self.structure_hash ^= \
+            GameBoard._get_structure_key(position_type, edge_id,
+                                         self.edge_vals[edge_id]) ^ \
+            GameBoard._get_structure_key(position_type, edge_id, edge_val)
+
+        super(GameBoard, self).update_edge_with_id(edge_id, edge_val)
+
+    def get_tiles_with_chit_value(self, chit_value):
+        """Get the tiles whose chit value matches the given value."""
+
+        return self.chit_value_tiles.get(chit_value, [])
+
+    def register_calamity(self, tile, calamity):
+        """Record that the calamity has been placed on the tile.
+
+        Called by GameTile.add_calamity(). If the calamity blocks the tile's
+        yield, the yield of the tile's structures is removed from the
+        production table.
+        """
+
+        if calamity in self.calamity_tiles:
+            self.calamity_hash ^= self._get_calamity_key(
+                calamity, self.calamity_tiles[calamity])
+
+        self.calamity_tiles[calamity] = tile
+        self.calamity_hash ^= self._get_calamity_key(calamity, tile)
+        self._record(tile.remove_calamity, calamity)
+
+        if calamity.tile_placement_effect == \
+                CalamityTilePlacementEffect.BLOCK_YIELD and \
+                tile not in self.blocked_tiles:
+            self.blocked_tiles.add(tile)
+            self._add_tile_production(tile, -1)
+            self._update_array_state_tile(tile)
+
+    def unregister_calamity(self, tile, calamity):
+        """Record that the calamity has been removed from the tile.
+
+        Called by GameTile.remove_calamity(). If no calamity left on the tile
+        blocks its yield, the yield of the tile's structures is restored to
+        the production table.
+        """
+
+        if self.calamity_tiles.get(calamity) is tile:
+            del self.calamity_tiles[calamity]
+            self.calamity_hash ^= self._get_calamity_key(calamity, tile)
+
+        self._record(tile.add_calamity, calamity)
+
+        if tile not in self.blocked_tiles:
+            return
+
+        still_blocked = any(
+            remaining_calamity.tile_placement_effect ==
+            CalamityTilePlacementEffect.BLOCK_YIELD
+            for remaining_calamity in tile.calamities
+        )
+
+        if not still_blocked:
+            self.blocked_tiles.remove(tile)
+            self._add_tile_production(tile, 1)
+            self._update_array_state_tile(tile)
+
+    def _update_array_state_tile(self, tile):
+
+        if self.array_state is not None:
+            self.array_state.update_tile(
+                self.topology.tile_ids[(tile.x, tile.y)], tile,
+                tile in self.blocked_tiles)
+
+    def _add_tile_production(self, tile, sign):
+        """Add the yield of the tile's structures to the production table.
+
+        Args:
+            tile (GameTile): Tile whose structures' yield to add.
+
+            sign (int): 1 to add the yield, -1 to remove it.
+        """
+
+        for structure in tile.get_adjacent_vertex_structures():
+            self._add_production(tile, structure.owning_player,
+                                 sign * structure.base_yield)
+
+    def _add_production(self, tile, player, resource_yield):
+        """Add the given yield of the tile's resource to the player."""
+
+        if tile.resource_type == ResourceType.FALLOW or not resource_yield:
+            return
+
+        player_production = self.production.setdefault(
+            tile.chit_value, {}).setdefault(player, {})
+
+        player_production[tile.resource_type] = \
+            player_production.get(tile.resource_type, 0) + resource_yield
+
+    def _update_vertex_production(self, vertex_id, old_vertex_val,
+                                  new_vertex_val):
+        """Replace the yield of the old vertex value with the new one's."""
+
+        for tile_id in self.topology.vertex_tiles[vertex_id]:
+            tile = self.tiles_by_id[tile_id]
+
+            if tile in self.blocked_tiles:
+                continue
+
+            if isinstance(old_vertex_val, Structure):
+                self._add_production(tile, old_vertex_val.owning_player,
+                                     -old_vertex_val.base_yield)
+
+            if isinstance(new_vertex_val, Structure):
+                self._add_production(tile, new_vertex_val.owning_player,
+                                     new_vertex_val.base_yield)
+
     def iter_arable_tiles(self):
         """Iterate over this board's non-fallow i.e. arable tiles."""
 
@@ -277,8 +560,23 @@ class GameBoard(HexBoard):
                                           vertex_dir, must_border_claimed_edge,
                                           struct_x, struct_y, struct_vertex_dir)
 
+        vertex_id = self.get_vertex_id(x, y, vertex_dir)
+
         self.update_vertex(x, y, vertex_dir, structure)
 
+        road_delta = self.longest_roads.add_vertex_structure(vertex_id,
+                                                             structure)
+        self._update_vertex_production(vertex_id, old_vertex_val, structure)
+
+        if self.array_state is not None:
+            self.array_state.update_vertex(vertex_id, structure)
+
+        self._record(self._undo_vertex_placement, vertex_id, old_vertex_val,
+                     structure, road_delta)
+
+        if self.event_log is not None:
+            self.event_log.log_placement(structure, vertex_id)
+
     def place_edge_structure(self, x, y, edge_dir, structure,
                              must_border_claimed_edge=True, struct_x=None,
                              struct_y=None, struct_vertex_dir=None):
@@ -292,6 +590,165 @@ class GameBoard(HexBoard):
 
         self.update_edge(x, y, edge_dir, structure)
 
+        edge_id = self.get_edge_id(x, y, edge_dir)
+
+        road_delta = self.longest_roads.add_edge_structure(edge_id, structure)
+
+        if self.array_state is not None:
+            self.array_state.update_edge(edge_id, structure)
+
+        self._record(self._undo_edge_placement, edge_id, old_edge_val,
+                     road_delta)
+
+        if self.event_log is not None:
+            self.event_log.log_placement(structure, edge_id)
+
+    def snapshot(self):
+        """Capture this board's mutable state. See restore().
+
+        Structures are never modified once placed, so are captured by
+        reference, as are the longest road tracker's components.
+
+        Returns:
+            tuple. To be passed to restore(), as is.
+        """
+
+        return (
+            tuple(self.vertex_vals),
+            tuple(self.edge_vals),
+            tuple(tile.snapshot() for tile in self.tiles_by_id),
+            dict((roll_value, dict((player, dict(resources))
+                                   for player, resources in
+                                   player_production.iteritems()))
+                 for roll_value, player_production in
+                 self.production.iteritems()),
+            self.longest_roads.snapshot(),
+            self.array_state.copy() if self.array_state is not None else None
+        )
+
+    def restore(self, snapshot):
+        """Return to the state captured by snapshot().
+
+        Only vertices and edges whose value differs from the snapshot's are
+        written to. Discards the journal, if recording. See begin_action().
+        """
+
+        (vertex_vals, edge_vals, tile_snapshots, production, longest_roads,
+         array_state) = snapshot
+
+        for vertex_id, vertex_val in enumerate(vertex_vals):
+            if self.vertex_vals[vertex_id] is not vertex_val:
+                self.update_vertex_with_id(vertex_id, vertex_val)
+
+        for edge_id, edge_val in enumerate(edge_vals):
+            if self.edge_vals[edge_id] is not edge_val:
+                self.update_edge_with_id(edge_id, edge_val)
+
+        self.chit_value_tiles = {}
+        self.calamity_tiles = {}
+        self.blocked_tiles = set()
+        self.tile_hash = 0
+        self.calamity_hash = 0
+
+        for tile, tile_snapshot in zip(self.tiles_by_id, tile_snapshots):
+            tile.restore(tile_snapshot)
+
+            self.chit_value_tiles.setdefault(tile.chit_value, []).append(tile)
+            self.tile_hash ^= self._get_tile_key(tile)
+
+            for calamity in tile.calamities:
+                self.calamity_tiles[calamity] = tile
+                self.calamity_hash ^= self._get_calamity_key(calamity, tile)
+
+                if calamity.tile_placement_effect == \
+                        CalamityTilePlacementEffect.BLOCK_YIELD:
+                    self.blocked_tiles.add(tile)
+
+        self.production = dict(
+            (roll_value, dict((player, dict(resources))
+                              for player, resources in
+                              player_production.iteritems()))
+            for roll_value, player_production in production.iteritems())
+
+        self.longest_roads.restore(longest_roads)
+
+        if self.array_state is not None:
+            if array_state is not None:
+                self.array_state.restore(array_state)
+            else:
+                # The array state was attached after the snapshot was taken.
+                for tile in self.tiles_by_id:
+                    self._update_array_state_tile(tile)
+
+                for vertex_id, vertex_val in enumerate(self.vertex_vals):
+                    self.array_state.update_vertex(vertex_id, vertex_val)
+
+                for edge_id, edge_val in enumerate(self.edge_vals):
+                    self.array_state.update_edge(edge_id, edge_val)
+
+        if self.journal is not None:
+            self.journal = []
+
+    def begin_action(self):
+        """Start recording changes to this board, if not already recording.
+
+        Returns:
+            int. Mark to pass to undo_to() to undo every change made from
+              now on.
+        """
+
+        if self.journal is None:
+            self.journal = []
+
+        return len(self.journal)
+
+    def undo_to(self, mark):
+        """Undo every change recorded since begin_action() returned mark.
+
+        Stops recording if mark was the first one returned.
+        """
+
+        journal = self.journal
+
+        # Undoing a change makes changes of its own, which mustn't be
+        # recorded.
+        self.journal = None
+
+        while len(journal) > mark:
+            undo_func, args = journal.pop()
+            undo_func(*args)
+
+        self.journal = journal if mark else None
+
+    def _record(self, undo_func, *args):
+        """Record how to undo a change, if recording."""
+
+        if self.journal is not None:
+            self.journal.append((undo_func, args))
+
+    def _undo_vertex_placement(self, vertex_id, old_vertex_val, structure,
+                               road_delta):
+
+        self.update_vertex_with_id(vertex_id, old_vertex_val)
+        self.longest_roads.revert(road_delta)
+        self._update_vertex_production(vertex_id, structure, old_vertex_val)
+
+        if self.array_state is not None:
+            self.array_state.update_vertex(vertex_id, old_vertex_val)
+
+    def _undo_edge_placement(self, edge_id, old_edge_val, road_delta):
+
+        self.update_edge_with_id(edge_id, old_edge_val)
+        self.longest_roads.revert(road_delta)
+
+        if self.array_state is not None:
+            self.array_state.update_edge(edge_id, old_edge_val)
+
+    def _undo_tile_change(self, tile, resource_type, chit_value):
+
+        tile.resource_type = resource_type
+        tile.chit_value = chit_value
+
     def validate_structure_placement(self, x, y, old_value, new_value,
                                      placement_dir, must_border_claimed_edge,
                                      struct_x, struct_y, struct_vertex_dir):
@@ -315,10 +772,11 @@ class GameBoard(HexBoard):
         # edge to place must border e.g. as in initial placement stage.
         if new_value.position_type == PositionType.EDGE and \
                         struct_x is not None:
-            allowable_edges = self.get_adjacent_edges(struct_x, struct_y, struct_vertex_dir)
-            target_edge = self.get_tile_with_coords(x, y).get_edge(placement_dir)
+            struct_vertex_id = self.get_vertex_id(struct_x, struct_y,
+                                                  struct_vertex_dir)
+            allowable_edge_ids = self.topology.vertex_edges[struct_vertex_id]
 
-            if target_edge not in allowable_edges:
+            if self.get_edge_id(x, y, placement_dir) not in allowable_edge_ids:
                 raise InvalidStructurePlacementException()
 
         # If the player is replacing an existing structure...
@@ -354,6 +812,165 @@ class GameBoard(HexBoard):
             if not len(claimed_edge_structs):
                 raise InvalidStructurePlacementException()
 
+    def legal_placements(self, player, structure_name,
+                         must_border_claimed_edge=True, struct_x=None,
+                         struct_y=None, struct_vertex_dir=None):
+        """Find every position the player could place the structure on.
+
+        Applies the same rules as validate_structure_placement(), but to all
+        positions at once and using the board topology, so that callers don't
+        have to attempt a placement per position and catch the exceptions.
+
+        Args:
+            player (Player): Player who would own the structure.
+
+            structure_name (str): Name of the structure, as given to
+              Player.get_structure().
+
+            must_border_claimed_edge, struct_x, struct_y, struct_vertex_dir:
+              See place_vertex_structure() and place_edge_structure().
+
+        Returns:
+            list. An (x, y, direction) tuple for each legal position, where
+              direction is a VertexDirection or EdgeDirection depending on the
+              structure's position type.
+        """
+
+        topology = self.topology
+
+        structure_ids = self.legal_placement_ids(
+            player, structure_name, must_border_claimed_edge, struct_x,
+            struct_y, struct_vertex_dir)
+
+        if self._get_structure_config(structure_name)['position_type'] == \
+                PositionType.EDGE:
+            locations = topology.edge_locations
+        else:
+            locations = topology.vertex_locations
+
+        return [locations[structure_id][0] for structure_id in structure_ids]
+
+    def legal_placement_ids(self, player, structure_name,
+                            must_border_claimed_edge=True, struct_x=None,
+                            struct_y=None, struct_vertex_dir=None):
+        """Like legal_placements(), but returns vertex or edge ids.
+
+        Results are cached until the next vertex or edge update.
+        """
+
+        if self._legal_placements_version != self.version:
+            self._legal_placements_cache = {}
+            self._legal_placements_version = self.version
+
+        key = (player, structure_name, must_border_claimed_edge, struct_x,
+               struct_y, struct_vertex_dir)
+
+        if key not in self._legal_placements_cache:
+            structure_config = self._get_structure_config(structure_name)
+
+            if structure_config['position_type'] == PositionType.EDGE:
+                structure_ids = self._find_legal_edge_ids(
+                    player, structure_config, must_border_claimed_edge,
+                    struct_x, struct_y, struct_vertex_dir)
+            else:
+                structure_ids = self._find_legal_vertex_ids(
+                    player, structure_config, must_border_claimed_edge)
+
+            self._legal_placements_cache[key] = tuple(structure_ids)
+
+        return self._legal_placements_cache[key]
+
+    def _get_structure_config(self, structure_name):
+
+        structure_name = re.sub(r'\s', '_', structure_name).lower()
+
+        try:
+            return self.structure_configs[structure_name]
+        except KeyError:
+            raise NoConfigValueDefinedException(
+                'game.structure.player_built.' + structure_name)
+
+    @staticmethod
+    def _can_replace(old_value, player, structure_config):
+        """Whether the structure may be placed where old_value currently is.
+
+        See validate_structure_placement().
+        """
+
+        augments = structure_config.get('upgrades') or \
+            structure_config.get('extends')
+
+        if isinstance(old_value, Structure):
+            return augments is not None and \
+                old_value.owning_player == player and \
+                old_value.name == augments
+
+        return True
+
+    def _find_legal_vertex_ids(self, player, structure_config,
+                               must_border_claimed_edge):
+
+        topology = self.topology
+        vertex_vals = self.vertex_vals
+        edge_vals = self.edge_vals
+
+        legal_vertex_ids = []
+
+        for vertex_id, vertex_val in enumerate(vertex_vals):
+
+            if not self._can_replace(vertex_val, player, structure_config):
+                continue
+
+            # The Distance Rule.
+            if any(isinstance(vertex_vals[adjacent_id], Structure)
+                   for adjacent_id in topology.vertex_vertices[vertex_id]):
+                continue
+
+            # Only new structures need to neighbor one of the player's roads.
+            if must_border_claimed_edge and \
+                    not isinstance(vertex_val, Structure) and \
+                    not any(isinstance(edge_vals[edge_id], Structure) and
+                            edge_vals[edge_id].owning_player == player
+                            for edge_id in topology.vertex_edges[vertex_id]):
+                continue
+
+            legal_vertex_ids.append(vertex_id)
+
+        return legal_vertex_ids
+
+    def _find_legal_edge_ids(self, player, structure_config,
+                             must_border_claimed_edge, struct_x, struct_y,
+                             struct_vertex_dir):
+
+        topology = self.topology
+        edge_vals = self.edge_vals
+
+        if struct_x is not None:
+            struct_vertex_id = self.get_vertex_id(struct_x, struct_y,
+                                                  struct_vertex_dir)
+            edge_ids = topology.vertex_edges[struct_vertex_id]
+        else:
+            edge_ids = range(topology.edge_count)
+
+        legal_edge_ids = []
+
+        for edge_id in edge_ids:
+            edge_val = edge_vals[edge_id]
+
+            if not self._can_replace(edge_val, player, structure_config):
+                continue
+
+            if must_border_claimed_edge and \
+                    not isinstance(edge_val, Structure) and \
+                    not any(isinstance(edge_vals[adjacent_id], Structure) and
+                            edge_vals[adjacent_id].owning_player == player
+                            for adjacent_id in topology.edge_edges[edge_id]):
+                continue
+
+            legal_edge_ids.append(edge_id)
+
+        return legal_edge_ids
+
     def distribute_resources_for_roll(self, roll_value):
         """Distribute resources to the players based on the given roll value.
 
@@ -372,34 +989,17 @@ class GameBoard(HexBoard):
               distributed to the player.
         """
 
-        # Find those tiles whose chit value matches the roll value,
-        # and whose yield isn't blocked by a calamity.
-        resource_tiles = filter(
-            lambda tile:
-                tile.chit_value == roll_value and
-                (CalamityTilePlacementEffect.BLOCK_YIELD not in
-                    tile.get_calamity_tile_placement_effects()),
-            list(self.iter_tiles())
-        )
-
         distributions = Utils.nested_dict()
 
-        # Create a dictionary that stores per-player resource distributions.
+        # The production table already holds, per roll value, the combined
+        # yield of every structure on an unblocked tile with that chit value.
+        # Copy it so that callers can't modify the table.
         # i.e. distributions => player => resource_type => (int)
-        for resource_tile in resource_tiles:
-
-            # Find any structures built on the vertices of the found tiles.
-            adjacent_structures = resource_tile.get_adjacent_vertex_structures()
-
-            for structure in adjacent_structures:
-                player = structure.owning_player
-                resource_type = resource_tile.resource_type
-                resource_yield = structure.base_yield
-
-                if not distributions[player][resource_type]:
-                    distributions[player][resource_type] = 0
-
-                distributions[player][resource_type] += resource_yield
+        for player, resource_yields in \
+                self.production.get(roll_value, {}).iteritems():
+            for resource_type, resource_yield in resource_yields.iteritems():
+                if resource_yield:
+                    distributions[player][resource_type] = resource_yield
 
         self.distribute_resources(distributions)
 
@@ -436,10 +1036,11 @@ class GameBoard(HexBoard):
     def find_robber(self):
         """Return the robber we can find."""
 
-        for tile in self.iter_tiles():
-            for calamity in tile.calamities:
-                if isinstance(calamity, Robber):
-                    return calamity
+        # Only calamities currently on the board are registered, of which
+        # there are only ever a handful.
+        for calamity in self.calamity_tiles:
+            if isinstance(calamity, Robber):
+                return calamity
 
         return None
 
@@ -454,11 +1055,7 @@ class GameBoard(HexBoard):
 
     def find_tile_with_calamity(self, calamity):
 
-        for tile in self.iter_tiles():
-            if calamity in tile.calamities:
-                return tile
-
-        return None
+        return self.calamity_tiles.get(calamity)
 
     def place_calamity(self, x, y, calamity):
 
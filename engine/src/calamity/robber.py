@@ -5,11 +5,19 @@ from engine.src.calamity.calamity import CalamityTilePlacementEffect
 
 class Robber(Calamity):
 
+    """The robber, which blocks the tile it's on and steals when activated.
+
+    Args:
+        rng (random.Random): Picks which card is stolen. Defaults to the
+          random module.
+    """
+
     MIN_ROBBER_ACTIVATING_RESOURCE_COUNT_THRESHOLD = 8
 
-    def __init__(self):
+    def __init__(self, rng=None):
         # TODO: Not sure if this is the best way to represent these effects.
         self.tile_placement_effect = CalamityTilePlacementEffect.BLOCK_YIELD
+        self.rng = rng
 
     def roll_value(self):
         # TODO: Move to config?
@@ -39,10 +47,16 @@ class Robber(Calamity):
                 resources = game_player.get_resource_list()
 
                 resource_indices = game.input_manager.prompt_discard_resources(
-                    game, player, resources, cards_to_discard)
+                    game, game_player, resources, cards_to_discard)
 
+                # Discarded cards go back to the bank.
                 for index in resource_indices:
-                    game_player.withdraw_resources(resources[index], 1)
+                    game_player.transfer_resources(game.board.bank,
+                                                   resources[index], 1)
+
+                    if game.event_log is not None:
+                        game.event_log.log_discard(game_player,
+                                                   resources[index])
 
         self.outside_trigger_effect(game, player)
 
@@ -55,26 +69,24 @@ class Robber(Calamity):
                 structures built adjacent to the tile.
         """
 
-        robber_successfully_moved = False
         previous_tile = game.board.find_tile_with_calamity(self)
-        previous_tile.remove_calamity(self)
-
-        tile = None
 
         prompt = 'Select a tile to move the robber to. Current location: {0}'\
             .format(previous_tile)
 
         game.input_manager.input_default(prompt, None, False)
 
-        while not robber_successfully_moved:
-            x, y = game.input_manager.prompt_tile_coordinates(game)
+        tile = game.input_manager.prompt_robber_tile(
+            game, player,
+            filter(lambda tile: tile is not previous_tile,
+                   game.board.iter_tiles()))
 
-            # Move robber to new tile.
-            tile = game.board.get_tile_with_coords(x, y)
+        # Move robber to new tile.
+        previous_tile.remove_calamity(self)
+        tile.add_calamity(self)
 
-            if tile != previous_tile:
-                tile.add_calamity(self)
-                robber_successfully_moved = True
+        if game.event_log is not None:
+            game.event_log.log_robber_move(tile)
 
         # Draw card from player that has a structure built adjacent to the tile.
         # The player can not draw from herself or from a player with no cards.
@@ -92,9 +104,12 @@ class Robber(Calamity):
             chosen_player = game.input_manager.prompt_select_player(
                 game, eligible_players)
 
-            resource_type = chosen_player.withdraw_random_resource()
+            resource_type = chosen_player.withdraw_random_resource(self.rng)
             player.deposit_resources(resource_type, 1)
 
+            if game.event_log is not None:
+                game.event_log.log_steal(player, chosen_player, resource_type)
+
             # Announce received resource.
             msg = 'You received 1 {0} from {1}.'.format(
                 resource_type, chosen_player.name)
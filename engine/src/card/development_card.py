@@ -32,30 +32,24 @@ class DevelopmentCard(object):
     def __str__(self):
         return self.name
         
-    def draw_card(self, game, player):
+    def draw_card(self):
         """Draw this card and activate any effect incurred by holding it.
          
          This method should be called only once when purchased by a player.
-         
-        Args:
-            game (Game): The game this card may possibly affect.
-            
-            player(Player): The player that bought this development card.
+         The game and the player that bought this card are got from ORACLE,
+         see Game.buy_development_card().
         
         Returns:
             None. Should call functions on game and player.
         """
         pass
 
-    def play_card(self, game, player):
+    def play_card(self):
         """Draw this card and activate any relevant effect.
          
          This method should be called only once when played by a player.
-         
-        Args:
-            game (Game): The game this card may possibly affect.
-            
-            player(Player): The player that played this development card.
+         The game and the player that played this card are got from ORACLE,
+         see Game.play_development_card().
         
         Returns:
             None. Should call functions on game and player.
@@ -1,10 +1,16 @@
-def draw_card(self, game, player):
+from imperative_parser.oracle import ORACLE
+
+
+def draw_card(self):
     pass
 
 
-def play_card(self, game, player):
+def play_card(self):
     """Move the robber and draw a card from another adjacent player."""
 
+    game = ORACLE.get('game')
+    player = ORACLE.get('player')
+
     game.input_manager.announce_development_card_played(player, self)
 
     robber = game.board.find_robber()
@@ -1,16 +1,22 @@
-def draw_card(self, game, player):
+from imperative_parser.oracle import ORACLE
+
+
+def draw_card(self):
     pass
 
 
-def play_card(self, game, player):
+def play_card(self):
     """Allow player to take all carried cards of selected resource type."""
 
+    game = ORACLE.get('game')
+    player = ORACLE.get('player')
+
     game.input_manager.announce_development_card_played(player, self)
     resource_type = game.input_manager.prompt_select_resource_type()
 
     for game_player in game.players:
         if player != game_player:
-            count = player.resources[resource_type]
+            count = game_player.resources[resource_type]
 
             game_player.transfer_resources(player, resource_type, count)
 
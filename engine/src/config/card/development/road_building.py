@@ -1,15 +1,21 @@
-def draw_card(self, game, player):
+from imperative_parser.oracle import ORACLE
+
+
+def draw_card(self):
     pass
 
 
-def play_card(self, game, player):
+def play_card(self):
     """Allow player to take all carried cards of selected resource type."""
 
+    game = ORACLE.get('game')
+    player = ORACLE.get('player')
+
     game.input_manager.announce_development_card_played(player, self)
 
     for _ in range(2):
         x, y, edge_dir = game.input_manager.prompt_edge_placement(game)
         game.board.place_edge_structure(x, y, edge_dir,
-                                        player.get_structure('road'))
+                                        player.get_structure('Road'))
 
     self.played = True
@@ -1,8 +1,11 @@
-def draw_card(self, game, player):
-    player.hidden_points += 1
+from imperative_parser.oracle import ORACLE
 
 
-def play_card(self, game, player):
+def draw_card(self):
+    ORACLE.get('player').hidden_points += 1
+
+
+def play_card(self):
     # We could convert the player's hidden points to public points,
     # but keeping the points hidden makes it easier to recompute
     # a player's overall point total from scratch.
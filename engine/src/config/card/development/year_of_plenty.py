@@ -1,10 +1,16 @@
-def draw_card(self, game, player):
+from imperative_parser.oracle import ORACLE
+
+
+def draw_card(self):
     pass
 
 
-def play_card(self, game, player):
+def play_card(self):
     """Allow player to take 2 cards of their chosen resource type."""
 
+    game = ORACLE.get('game')
+    player = ORACLE.get('player')
+
     game.input_manager.announce_development_card_played(player, self)
     resource_type = game.input_manager.prompt_select_resource_type()
 
@@ -1,5 +1,12 @@
 from types import *
+import contextlib
+import copy
+import hashlib
+import marshal
+import sys
 from engine.src.lib.utils import Utils
+from engine.src.lib.frozen_dict import FrozenDict
+from engine.src.config.config_snapshot import ConfigSnapshot
 from engine.src.config.game_config import game_config
 from engine.src.config.type_config import type_config
 from engine.src.config.type_mapping import type_mapping
@@ -13,9 +20,15 @@ class Config(object):
 
     @classmethod
     def init_from_config(cls, obj, config_path):
-        property_dict = Config.get(config_path)
-        dct = { Utils.convert_format(k): v for (k, v) in property_dict.iteritems()}
-        Utils.init_from_dict(obj, dct)
+        cache = Config.get_cache()
+        key = ('init_from_config', config_path)
+
+        if key not in cache:
+            property_dict = Config.get(config_path)
+            cache[key] = {Utils.convert_format(k): v
+                          for (k, v) in property_dict.iteritems()}
+
+        Utils.init_from_dict(obj, cache[key])
 
     @classmethod
     def pluck(cls, config_path, prop):
@@ -55,6 +68,10 @@ class Config(object):
 
         set_recursive(dct, keys)
 
+        if dct is Config.config:
+            Config.initialized_config = None
+            Config.invalidate()
+
 
     @classmethod
     def get(cls, dot_notation_str, dct=None, remove_default=True):
@@ -63,6 +80,10 @@ class Config(object):
         E.g. if caller wants config['game']['points_to_win'], they can pass in
         as their dot_notation_str 'game.points_to_win'.
 
+        Values of the main config dict are looked up once, and cached until
+        it is changed through set() or init(). Dicts are returned as read-only
+        FrozenDicts, shared between callers, rather than as copies.
+
         See coerce() for effect of coerce_type flag.
         """
 
@@ -70,7 +91,14 @@ class Config(object):
             Config.coerce_all()
 
         if dct is None:
-            dct = Config.config
+            cache = Config.get_cache()
+            key = (dot_notation_str, remove_default)
+
+            if key not in cache:
+                cache[key] = FrozenDict.freeze(Config.get(
+                    dot_notation_str, Config.config, remove_default))
+
+            return cache[key]
 
         if not dot_notation_str:
             return dct
@@ -111,16 +139,183 @@ class Config(object):
 
         return value
 
+    @classmethod
+    def get_snapshot(cls):
+        """Get a read-only ConfigSnapshot of the main config dict.
+
+        The snapshot is made by init(), and again if the main config dict is
+        changed through set() after, so holding on to the one returned is
+        safe as long as the config isn't changed.
+
+        Returns:
+            ConfigSnapshot.
+        """
+
+        if not Config.is_coerced:
+            Config.coerce_all()
+
+        cache = Config.get_cache()
+
+        if 'snapshot' not in cache:
+            cache['snapshot'] = ConfigSnapshot.from_config(
+                Config.config, Config.type_config)
+
+        return cache['snapshot']
+
+    @classmethod
+    def get_cache(cls):
+        """Get the values cached for the main config dict, emptied first if
+        the main config dict was replaced since they were cached."""
+
+        if Config.cached_config is not Config.config:
+            Config.invalidate()
+
+        return Config.cache
+
+    @classmethod
+    def invalidate(cls):
+        """Forget every value cached for the main config dict."""
+
+        Config.cache = {}
+        Config.cached_config = Config.config
+
     @classmethod
     def init(cls):
+        """Convert and coerce the main config dict, unless that was done
+        already and it hasn't been changed through set() since."""
+
+        if Config.initialized_config is Config.config:
+            return
+
         Config.convert_keys()
         Config.coerce_all()
+        Config.invalidate()
+        Config.get_snapshot()
+
+        Config.initialized_config = Config.config
+
+    @classmethod
+    def register(cls, name, config):
+        """Initialize a config variant, to be switched to by name with use().
+
+        A variant keeps the values cached for it while others are in use, so
+        switching between variants, e.g. to play games under several rule
+        sets in one process, costs nothing after it was registered.
+
+        Args:
+            name (str): Name to switch to the variant by.
+
+            config (dict): The variant's config dict, e.g. as compiled by
+              skit. It's copied, so the caller's is left as it is.
+        """
+
+        state = Config.get_state()
+
+        try:
+            Config.config = copy.deepcopy(config)
+            Config.init()
+
+            Config.variants[name] = Config.get_state()
+        finally:
+            Config.set_state(state)
+
+    @classmethod
+    def unregister(cls, name):
+        """Forget a variant registered by register(), along with what's
+        cached for it. Does nothing if no variant is registered under name.
+        """
+
+        Config.variants.pop(name, None)
+
+    @classmethod
+    def get_digest(cls, config):
+        """Get an md5 digest of a config dict's contents, the same in every
+        process and run as long as the config is.
+
+        Used to name variants by their contents, so that configs of the same
+        name but other contents are never mistaken for each other.
+
+        Args:
+            config (dict): A config dict, e.g. as compiled by skit.
+
+        Returns:
+            str. The digest, in hex.
+        """
+
+        def get_stable_value(value):
+            if type(value) is dict:
+                return sorted((get_stable_value(key), get_stable_value(item))
+                              for key, item in value.iteritems())
+
+            if type(value) in (list, tuple):
+                return [get_stable_value(item) for item in value]
+
+            if type(value) is FunctionType:
+                module = sys.modules.get(value.__module__)
+
+                # Functions compiled by skit aren't found in their module, and
+                # are told apart by their code alone.
+                if getattr(module, value.__name__, None) is value:
+                    return value.__module__, value.__name__
+
+                return marshal.dumps(value.func_code)
+
+            return value
+
+        return hashlib.md5(repr(get_stable_value(config))).hexdigest()
+
+    @classmethod
+    @contextlib.contextmanager
+    def use(cls, name):
+        """Make a variant registered by register() the main config dict for
+        the duration of a with block, then switch back to what it was.
+
+        Args:
+            name (str): Name of the variant. If None, whatever config dict is
+              loaded stays in use.
+
+        Raises:
+            NoConfigVariantDefinedException. If no variant is registered
+              under name.
+        """
+
+        if name is None:
+            yield
+            return
+
+        if name not in Config.variants:
+            raise NoConfigVariantDefinedException(name)
+
+        state = Config.get_state()
+        Config.set_state(Config.variants[name])
+
+        try:
+            yield
+        finally:
+            # Keep what was cached for the variant in the meantime.
+            Config.variants[name] = Config.get_state()
+            Config.set_state(state)
+
+    @classmethod
+    def get_state(cls):
+        """Get the main config dict and what's cached for it."""
+
+        return (Config.config, Config.cache, Config.cached_config,
+                Config.initialized_config)
+
+    @classmethod
+    def set_state(cls, state):
+        """Return to a state given by get_state()."""
+
+        (Config.config, Config.cache, Config.cached_config,
+         Config.initialized_config) = state
 
     @classmethod
     def convert_keys(cls):
 
         def convert(dct):
-            for k, v in dct.iteritems():
+            # Over a copy of the items, as keys are replaced along the way.
+            for k, v in dct.items():
 
                 if type(k) is StringType:
                     dct.pop(k)
@@ -134,38 +329,44 @@ class Config(object):
     @classmethod
     def coerce_all(cls):
         Config.is_coerced = True
-        Config.coerce_recursive('')
+        Config.coerce_struct(Config.config, Config.type_config)
+        Config.invalidate()
 
     @classmethod
-    def coerce_recursive(cls, path_so_far):
-        curr_value = Config.get(path_so_far, Config.config, False)
+    def coerce_struct(cls, dct, type_dct):
+        """Coerce the values of a config dict in place, to the types given by
+        the matching dict of type_config, in a single walk over both.
 
-        try:
-            target_type = Config.get(
-                Config.get_default_path(path_so_far), Config.type_config, False)
-        except NoConfigValueDefinedException:
-            return
+        A type dict with a default entry, e.g. that of
+        game.structure.player_built, gives the type of each entry of the
+        config dict, e.g. road, by its default entry. Values with no type
+        are left as they are.
 
-        is_struct = False
+        Args:
+            dct (dict): A config dict, e.g. Config.config.
 
-        if type(curr_value) is dict:
-            is_struct = len(filter(
-                lambda key: type(key) == StringType,
-                target_type.keys()
-            )) != 0
+            type_dct (dict): Its types, e.g. Config.type_config.
+        """
 
-        if is_struct:
-            for k, v in curr_value.iteritems():
-                path = k if not path_so_far else '.'.join([path_so_far, k])
-                Config.coerce_recursive(path)
+        if 'default' in type_dct:
+            default_type = type_dct['default']
         else:
-            # print "Beginning coercion, path: {}".format(path_so_far)
-            # print "Current type: {}".format(type(curr_value))
-            # print "Target type: {}".format(target_type)
-            Config.set(
-                Config.coerce(curr_value, type(curr_value), target_type),
-                path_so_far
-            )
+            default_type = None
+
+        for key, value in dct.items():
+            target_type = default_type or type_dct.get(key)
+
+            if target_type is None:
+                continue
+
+            is_struct = type(value) is dict and \
+                type(target_type) is dict and \
+                any(type(k) is StringType for k in target_type)
+
+            if is_struct:
+                Config.coerce_struct(value, target_type)
+            else:
+                dct[key] = Config.coerce(value, type(value), target_type)
 
     @classmethod
     def coerce(cls, value, from_type, to_type):
@@ -190,41 +391,20 @@ class Config(object):
             coercion_func = type_mapping[from_type][to_type]
             return coercion_func(value)
 
-    @classmethod
-    def get_default_path(cls, dot_notation_str):
-        # e.g. structure.player_built.road.cost =>
-        #      structure.player_built.default.cost
-        """
-        If last prop is not a dict, replace second to last with default
-        If last prop is a dict, e.g. structure.player_built.road
-            if dict is a struct, replace last with default
-            if dict isn't a struct, replace second to last with default
-        """
-
-        value = None
-        path = None
-
-        repl_index = -1
-
-        while True:
-            keys = dot_notation_str.split('.')
+    # The dictionary accessed by Config.get()
+    config = {}
 
-            try:
-                keys[repl_index] = 'default'
-                path = '.'.join(keys)
-                value = Config.get(path, Config.type_config, False)
-                break
-            except NoConfigValueDefinedException:
-                repl_index -= 1
-            except IndexError:
-                # No defaults; return as is.
-                path = dot_notation_str
-                break
+    # Values looked up in config by get() and init_from_config(), and the
+    # config dict they were looked up in.
+    cache = {}
+    cached_config = None
 
-        return path
+    # The config dict init() was last done for.
+    initialized_config = None
 
-    # The dictionary accessed by Config.get()
-    config = {}
+    # State of each variant registered by register(), keyed by name. See
+    # get_state().
+    variants = {}
 
     # A dictionary telling us what object types we should expect
     # for values in config.
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+from types import StringTypes
+
+from engine.src.lib.frozen_dict import FrozenDict
+from engine.src.lib.utils import Utils
+from engine.src.resource_type import ResourceType
+
+
+class ResourceVector(tuple):
+    """A count of each arable resource type, e.g. a cost.
+
+    Counts are in the order of RESOURCE_TYPES, which is that of
+    ResourceType.get_arable_types(), so vectors line up with arrays indexed
+    the same way, e.g. BatchGame's hands.
+    """
+
+    __slots__ = ()
+
+    RESOURCE_TYPES = tuple(ResourceType.get_arable_types())
+
+    @classmethod
+    def from_dict(cls, dct):
+        """Make a vector of a dict of counts keyed by ResourceType, counting
+        resource types it leaves out as 0."""
+
+        return cls(dct.get(resource_type, 0)
+                   for resource_type in cls.RESOURCE_TYPES)
+
+    def get(self, resource_type):
+        return self[ResourceVector.RESOURCE_TYPES.index(resource_type)]
+
+    def to_dict(self):
+        """Get the counts as a dict keyed by ResourceType, leaving out 0s."""
+
+        return dict((resource_type, count) for resource_type, count in
+                    zip(ResourceVector.RESOURCE_TYPES, self) if count)
+
+
+class ConfigSnapshot(object):
+    """A read-only copy of a coerced config dict, with attribute access.
+
+    Nested config dicts become nested ConfigSnapshots, e.g.
+    snapshot.game.board.radius, with keys in the underscored format of
+    Utils.convert_format(), and each entry of a collection with a
+    default entry, e.g. game.structure.player_built, has the default's
+    properties it leaves out filled in. Dicts keyed by ResourceType, e.g.
+    costs, become ResourceVectors. Values can also be got by key, e.g.
+    snapshot.game.structure.player_built['city'], and iterating over a
+    snapshot gives its keys.
+
+    Engine classes can hold on to a snapshot, or part of one, rather than
+    looking values up by dot notation string through Config.get(). Being
+    immutable, a snapshot is also safe to share between processes forked
+    after it was made.
+
+    Args:
+        values (dict): Values of this level of the config, already made
+          into snapshots by from_config().
+    """
+
+    def __init__(self, values):
+        self.__dict__.update(values)
+
+    def _read_only(self, *args):
+        raise TypeError('{0} is read-only.'.format(type(self).__name__))
+
+    __setattr__ = __delattr__ = __setitem__ = __delitem__ = _read_only
+
+    def __getitem__(self, key):
+        return self.__dict__[key]
+
+    def __contains__(self, key):
+        return key in self.__dict__
+
+    def __iter__(self):
+        return iter(self.__dict__)
+
+    def __len__(self):
+        return len(self.__dict__)
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other.__dict__ == self.__dict__
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        return type(self), (dict(self.__dict__),)
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(type(self).__name__, self.__dict__)
+
+    def get(self, key, default=None):
+        return self.__dict__.get(key, default)
+
+    def keys(self):
+        return self.__dict__.keys()
+
+    def values(self):
+        return self.__dict__.values()
+
+    def items(self):
+        return self.__dict__.items()
+
+    @classmethod
+    def from_config(cls, value, value_type=None):
+        """Make a snapshot of a coerced config value.
+
+        Args:
+            value: A config value, e.g. Config.config, as coerced by
+              Config.init().
+
+            value_type: The value's type in Config.type_config, if it has
+              one, e.g. Config.type_config itself for Config.config.
+
+        Returns:
+            ResourceVector if value is a dict keyed by ResourceType,
+            ConfigSnapshot if it's one keyed by strings, FrozenDict if it's
+            any other dict, else value itself.
+        """
+
+        if type(value) is not dict:
+            return value
+
+        key_types = set(type(key) for key in value)
+
+        if type(value_type) is dict:
+            key_types.update(key for key in value_type
+                             if not isinstance(key, StringTypes))
+
+        if key_types and key_types <= set([ResourceType]):
+            return ResourceVector.from_dict(value)
+
+        if not all(issubclass(key_type, StringTypes)
+                   for key_type in key_types):
+            return FrozenDict.freeze(value)
+
+        if type(value_type) is not dict:
+            value_type = {}
+
+        default = value.get('default')
+        values = {}
+
+        for key, item in value.iteritems():
+            item_type = value_type.get(key, value_type.get('default'))
+
+            if type(default) is dict and key != 'default' and \
+                    type(item) is dict:
+                item = dict(default)
+                item.update(value[key])
+
+            values[Utils.convert_format(key)] = cls.from_config(item,
+                                                                item_type)
+
+        return cls(values)
@@ -1,10 +1,12 @@
 from engine.src.resource_type import ResourceType
 from engine.src.lib.utils import Utils
+from engine.src.lib.lazy_import import LazyImport
 
 def get_import_value(dot_notation_str, var_name, prefix='engine.src.config.'):
-    mod = __import__(prefix + dot_notation_str, globals(), locals(), [var_name], -1)
-    value = getattr(mod, var_name)
-    return value
+    """Reference a function of a module, which is only imported once the
+    function is first called. See LazyImport."""
+
+    return LazyImport(prefix + dot_notation_str, var_name)
 
 game_config = {
     # Game
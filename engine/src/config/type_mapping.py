@@ -1,4 +1,5 @@
 import engine.src.lib.utils as utils
+from engine.src.lib.lazy_import import LazyImport
 from engine.src.resource_type import ResourceType
 from engine.src.position_type import PositionType
 from types import *
@@ -12,5 +13,10 @@ type_mapping = { # from_type => to_type => conversion function
     NoneType: {
         FunctionType: lambda _: utils.noop,
         MethodType: lambda _: utils.Utils.noop
+    },
+    # Functions referenced lazily are left as they are, to be imported when
+    # first called.
+    LazyImport: {
+        FunctionType: lambda reference: reference
     }
 }
@@ -1,19 +1,36 @@
 # -*- coding: utf-8 -*-
 import random
 
+import numpy as np
+
 
 class Dice(object):
     """ Represents a set of game dice.
 
     Args:
         dice_count (int): Number of dice in the game.
-        
+
         range (list): List of possible dice values.
+
+        rng (random.Random): Source of randomness. Defaults to the random
+          module.
+
+        buffer_size (int): If given, rolls are generated this many at a time
+          with NumPy and served from a buffer, which is much faster in bulk
+          than rolling each die in Python. The NumPy generator is seeded from
+          rng, so buffered rolls are just as reproducible.
     """
 
-    def __init__(self, dice_count=2, values=range(1, 7)):
+    def __init__(self, dice_count=2, values=range(1, 7), rng=None,
+                 buffer_size=None):
         self.dice_count = dice_count
         self.values = values
+        self.rng = rng if rng is not None else random
+        self.buffer_size = buffer_size
+
+        self._np_rng = None
+        self._buffer = []
+        self._buffer_index = 0
 
     def roll(self):
         """ Rolls dice.
@@ -22,4 +39,65 @@ class Dice(object):
             int. Sum of dice face values after a random throw.
         """
 
-        return sum(random.choice(self.values) for _ in range(self.dice_count))
+        if self.buffer_size is None:
+            return sum(self.rng.choice(self.values)
+                       for _ in range(self.dice_count))
+
+        if self._buffer_index == len(self._buffer):
+            self._fill_buffer()
+
+        roll_value = self._buffer[self._buffer_index]
+        self._buffer_index += 1
+
+        return roll_value
+
+    def roll_many(self, count):
+        """Roll the dice count times over, with NumPy.
+
+        Returns:
+            np.ndarray. Sum of each roll.
+        """
+
+        if self._np_rng is None:
+            self._np_rng = np.random.RandomState(self.rng.getrandbits(32))
+
+        face_indices = self._np_rng.randint(
+            len(self.values), size=(count, self.dice_count))
+
+        return np.asarray(self.values)[face_indices].sum(1)
+
+    def _fill_buffer(self):
+
+        # Served as a list of ints, as NumPy scalars are slow to index and
+        # hash.
+        self._buffer = self.roll_many(self.buffer_size).tolist()
+        self._buffer_index = 0
+
+    def get_sum_counts(self):
+        """Count the ways each sum can be rolled, exactly.
+
+        Values must be non-negative integers.
+
+        Returns:
+            np.ndarray. Number of outcomes summing to each value, indexed by
+              value, out of len(values) ** dice_count outcomes in all.
+        """
+
+        face_counts = np.bincount(self.values)
+        sum_counts = np.array([1])
+
+        for _ in range(self.dice_count):
+            sum_counts = np.convolve(sum_counts, face_counts)
+
+        return sum_counts
+
+    def get_sum_probabilities(self):
+        """Get the probability of rolling each sum.
+
+        Returns:
+            np.ndarray. See get_sum_counts().
+        """
+
+        sum_counts = self.get_sum_counts()
+
+        return sum_counts / float(sum_counts.sum())
@@ -2,4 +2,4 @@
 
 
 class Edge(object):
-    pass
\ No newline at end of file
+    __slots__ = ()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+from engine.src.config.config import Config
+from engine.src.resource_type import ResourceType
+from engine.src.position_type import PositionType
+
+
+class ActionSpace(object):
+    """Numbers every decision a GameEnv learner can make from 0 upwards.
+
+    Ids are laid out in blocks, in this order:
+        END_TURN: One id.
+        BUY_DEVELOPMENT_CARD: One id.
+        PLAY_DEVELOPMENT_CARD: One id per development card name.
+        TRADE: One id per (offered, requested) pair of arable resource types,
+          for trading with the bank.
+        BUILD: Per structure name, one id per vertex or edge id. Also used to
+          answer placement decisions, e.g. during initial placement.
+        ROBBER_TILE: One id per tile id.
+        PLAYER: One id per seat, counted from the learner's.
+        RESOURCE_TYPE: One id per arable resource type, also used to discard.
+
+    Attributes:
+        topology (BoardTopology): Topology of the board being played on.
+
+        size (int): Number of ids in all.
+
+        card_names (list): Sorted development card names.
+
+        resource_types (list): Arable resource types, in the order of
+          ArrayBoardState.RESOURCE_TYPES.
+
+        structure_names (list): Sorted names of the structures players can
+          build.
+
+        structure_position_types (dict): PositionType of each structure,
+          keyed by structure name.
+
+        structure_position_counts (dict): Number of vertices or edges each
+          structure can be placed on, keyed by structure name.
+
+        end_turn_id, buy_development_card_id (int): Id of each action.
+
+        play_development_card_offset, trade_offset, robber_tile_offset,
+        player_offset, resource_type_offset (int): First id of each block.
+
+        build_offsets (dict): First id of each structure's BUILD block, keyed
+          by structure name.
+
+    Args:
+        topology (BoardTopology): Topology of the board being played on.
+
+        player_count (int): Number of seats at the game.
+
+        config (str): Name of the config variant the game is played under, if
+          any. See Config.register().
+    """
+
+    def __init__(self, topology, player_count, config=None):
+
+        self.topology = topology
+
+        with Config.use(config):
+            card_configs = Config.get('game.card.development')
+            structure_configs = Config.get('game.structure.player_built')
+
+        self.card_names = sorted(
+            card['name'] for card in card_configs.itervalues())
+        self.resource_types = ResourceType.get_arable_types()
+
+        self.structure_names = sorted(
+            structure['name'] for structure in structure_configs.itervalues())
+        self.structure_position_types = {}
+        self.structure_position_counts = {}
+
+        for structure in structure_configs.itervalues():
+            if structure['position_type'] == PositionType.EDGE:
+                position_count = topology.edge_count
+            else:
+                position_count = topology.vertex_count
+
+            self.structure_position_types[structure['name']] = \
+                structure['position_type']
+            self.structure_position_counts[structure['name']] = position_count
+
+        self.end_turn_id = 0
+        self.buy_development_card_id = 1
+        self.play_development_card_offset = 2
+        self.trade_offset = \
+            self.play_development_card_offset + len(self.card_names)
+
+        size = self.trade_offset + len(self.resource_types) ** 2
+
+        self.build_offsets = {}
+
+        for structure_name in self.structure_names:
+            self.build_offsets[structure_name] = size
+            size += self.structure_position_counts[structure_name]
+
+        self.robber_tile_offset = size
+        self.player_offset = self.robber_tile_offset + topology.tile_count
+        self.resource_type_offset = self.player_offset + player_count
+        self.size = self.resource_type_offset + len(self.resource_types)
+
+    def get_play_development_card_id(self, card_name):
+        return self.play_development_card_offset + \
+            self.card_names.index(card_name)
+
+    def get_trade_id(self, offered_type, requested_type):
+        return self.trade_offset + \
+            self.resource_types.index(offered_type) * \
+            len(self.resource_types) + \
+            self.resource_types.index(requested_type)
+
+    def get_build_id(self, structure_name, position_id):
+        return self.build_offsets[structure_name] + position_id
+
+    def get_robber_tile_id(self, tile_id):
+        return self.robber_tile_offset + tile_id
+
+    def get_player_id(self, seat):
+        return self.player_offset + seat
+
+    def get_resource_type_id(self, resource_type):
+        return self.resource_type_offset + \
+            self.resource_types.index(resource_type)
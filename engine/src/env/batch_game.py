@@ -0,0 +1,693 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from engine.src.config.config import Config
+from engine.src.dice import Dice
+from engine.src.board.game_board import GameBoard
+from engine.src.board.array_board_state import ArrayBoardState
+from engine.src.calamity.robber import Robber
+from engine.src.env.action_space import ActionSpace
+from engine.src.env.decision_type import DecisionType
+from engine.src.headless_game import HeadlessGame
+from engine.src.lib.game_random import GameRandom
+from engine.src.position_type import PositionType
+from engine.src.exceptions import *
+
+
+class BatchGame(object):
+    """Many independent games, stored in arrays and advanced in lockstep.
+
+    Where GameEnv runs the engine's objects for one game, a BatchGame keeps
+    the state of every game in arrays with a leading batch axis, so that one
+    step() moves all of them on at the cost of a few NumPy operations. Boards
+    are laid out by GameBoard, placement legality comes from ArrayBoardState
+    and costs, yields, point values and stock come from the structures in the
+    config, so skit variants of these carry over.
+
+    Games follow the rules of HeadlessGame, less development cards, the
+    longest road and the largest army. Actions are ids of an ActionSpace, of
+    which only ending the turn, bank trades and builds are ever legal. The
+    robber's choices, i.e. what to discard, where to move it and whom to
+    steal from, are made at random.
+
+    Attributes:
+        batch_size (int): Number of games.
+
+        player_count (int): Number of seats at each game.
+
+        action_space (ActionSpace): Numbering of actions.
+
+        phase (np.ndarray): Phase of each game. See the class constants.
+
+        current_player (np.ndarray): Seat whose decision it is, per game.
+
+        turn_count (np.ndarray): Turns played, per game.
+
+        winner (np.ndarray): Seat of the winner, or -1, per game.
+
+        last_rolls (np.ndarray): Most recent dice roll, per game.
+
+        tile_resources, tile_chits, tile_blocked, vertex_owners,
+        vertex_structures, edge_owners, edge_structures (np.ndarray): As in
+          ArrayBoardState, with a leading batch axis. Owners are seats.
+
+        hands (np.ndarray): Resource cards of each seat of each game, shaped
+          (batch, seat, resource type), in ActionSpace.resource_types order.
+
+        bank (np.ndarray): Resource cards of the bank of each game.
+
+        remaining_structures (np.ndarray): Structures each seat has left to
+          build, shaped (batch, seat, structure code).
+
+        points (np.ndarray): Points of each seat of each game.
+
+    Args:
+        batch_size (int): See above.
+
+        player_count (int): See above. Defaults to the config's.
+
+        seed (int): Seeds every board and dice roll. Defaults to one drawn
+          from the random module.
+
+        max_turns (int): Turns after which a game is over without a winner,
+          if given.
+
+        config (str): Name of the config variant to play under, if any. See
+          Config.register().
+    """
+
+    INITIAL_SETTLEMENT = 0
+    INITIAL_ROAD = 1
+    MAIN = 2
+    OVER = 3
+
+    def __init__(self, batch_size, player_count=None, seed=None,
+                 max_turns=None, config=None):
+
+        self.rng = GameRandom(seed)
+        self.dice = Dice(rng=self.rng.spawn('dice'))
+        self.robber = Robber()
+        self.np_rng = np.random.RandomState(
+            self.rng.spawn('robber').getrandbits(32))
+
+        with Config.use(config):
+            snapshot = Config.get_snapshot()
+
+            # Never holds structures. Its layout is redone for every new
+            # game, and mirrored into rules, which it is attached to.
+            board = GameBoard(snapshot.game.board.radius,
+                              self.rng.spawn('template'))
+
+        if player_count is None:
+            player_count = snapshot.game.player_count
+
+        self.batch_size = batch_size
+        self.player_count = player_count
+        self.max_turns = max_turns
+        self.points_to_win = snapshot.game.points_to_win
+
+        self.board = board
+        self.rules = ArrayBoardState.attach(board, range(player_count))
+        self.action_space = ActionSpace(board.topology, player_count, config)
+
+        self._init_structure_tables()
+
+        topology = board.topology
+
+        # Seat placing at each step of initial placement.
+        self.placement_order = np.array(
+            range(player_count) + range(player_count)[::-1])
+
+        # Which edges have each vertex as an endpoint.
+        self.vertex_edge_mask = np.zeros(
+            (topology.vertex_count, topology.edge_count), np.bool_)
+
+        for vertex_id, edge_ids in enumerate(topology.vertex_edges):
+            self.vertex_edge_mask[vertex_id, list(edge_ids)] = True
+
+        shape = (batch_size,)
+        resource_count = len(self.action_space.resource_types)
+
+        self.phase = np.zeros(shape, np.int8)
+        self.current_player = np.zeros(shape, np.intp)
+        self.placement_index = np.zeros(shape, np.intp)
+        self.last_settlement = np.zeros(shape, np.intp)
+        self.turn_count = np.zeros(shape, np.int32)
+        self.winner = np.zeros(shape, np.int8)
+        self.last_rolls = np.zeros(shape, np.int8)
+
+        self.tile_resources = np.zeros(shape + (topology.tile_count,),
+                                       np.int8)
+        self.tile_chits = np.zeros_like(self.tile_resources)
+        self.tile_blocked = np.zeros(self.tile_resources.shape, np.bool_)
+
+        self.vertex_owners = np.zeros(shape + (topology.vertex_count,),
+                                      np.int8)
+        self.vertex_structures = np.zeros_like(self.vertex_owners)
+        self.edge_owners = np.zeros(shape + (topology.edge_count,), np.int8)
+        self.edge_structures = np.zeros_like(self.edge_owners)
+
+        self.hands = np.zeros(shape + (player_count, resource_count),
+                              np.int16)
+        self.bank = np.zeros(shape + (resource_count,), np.int16)
+        self.remaining_structures = np.zeros(
+            shape + (player_count, len(self.structure_costs)), np.int16)
+        self.points = np.zeros(shape + (player_count,), np.int16)
+
+        self._action_mask = None
+        self._game_count = 0
+
+        self.reset()
+
+    def _init_structure_tables(self):
+        """Tabulate each structure's config by its ArrayBoardState code."""
+
+        rules = self.rules
+        action_space = self.action_space
+        resource_types = action_space.resource_types
+
+        structure_configs = [None] + [
+            rules.structure_configs[structure_name]
+            for structure_name in rules.structure_names]
+
+        self.structure_costs = np.zeros(
+            (len(structure_configs), len(resource_types)), np.int16)
+        self.structure_point_values = np.zeros(len(structure_configs),
+                                               np.int16)
+        self.structure_counts = np.zeros(len(structure_configs), np.int16)
+        self.structure_is_edge = np.zeros(len(structure_configs), np.bool_)
+
+        for code, structure in enumerate(structure_configs[1:], 1):
+            for resource_type, count in structure['cost'].iteritems():
+                self.structure_costs[code,
+                                     resource_types.index(resource_type)] = \
+                    count
+
+            self.structure_point_values[code] = structure['point_value']
+            self.structure_counts[code] = structure['count']
+            self.structure_is_edge[code] = \
+                structure['position_type'] == PositionType.EDGE
+
+        self.structure_yields = rules.structure_yields
+
+        # The structure code and position id of each BUILD action, or 0 and
+        # 0 for other actions.
+        self.action_structures = np.zeros(action_space.size, np.intp)
+        self.action_positions = np.zeros(action_space.size, np.intp)
+
+        for structure_name in rules.structure_names:
+            offset = action_space.build_offsets[structure_name]
+            position_count = \
+                action_space.structure_position_counts[structure_name]
+
+            self.action_structures[offset:offset + position_count] = \
+                rules.get_structure_code(structure_name)
+            self.action_positions[offset:offset + position_count] = \
+                np.arange(position_count)
+
+        # As in Game.initial_settlement_and_road_placement().
+        self.settlement_code = rules.get_structure_code('Settlement')
+        self.road_code = rules.get_structure_code('Road')
+
+    def reset(self, indices=None):
+        """Start new games in place of the given ones.
+
+        Args:
+            indices (list): Games to restart. Defaults to all of them.
+        """
+
+        if indices is None:
+            indices = range(self.batch_size)
+
+        board = self.board
+
+        for index in indices:
+            board.rng = self.rng.spawn('board', self._game_count)
+            board.assign_tile_resources()
+            board.assign_tile_chit_values()
+            self._game_count += 1
+
+            self.tile_resources[index] = self.rules.tile_resources
+            self.tile_chits[index] = self.rules.tile_chits
+
+        # As in Game, the robber starts on a fallow tile.
+        self.tile_blocked[indices] = False
+        self.tile_blocked[indices, np.argmax(
+            self.tile_resources[indices] == ArrayBoardState.FALLOW_INDEX,
+            1)] = True
+
+        # The template board's bank is never drawn from.
+        self.bank[indices] = [
+            board.bank.resources[resource_type]
+            for resource_type in self.action_space.resource_types]
+
+        self.vertex_owners[indices] = -1
+        self.vertex_structures[indices] = 0
+        self.edge_owners[indices] = -1
+        self.edge_structures[indices] = 0
+
+        self.hands[indices] = 0
+        self.remaining_structures[indices] = self.structure_counts
+        self.points[indices] = 0
+
+        self.phase[indices] = BatchGame.INITIAL_SETTLEMENT
+        self.placement_index[indices] = 0
+        self.current_player[indices] = self.placement_order[0]
+        self.turn_count[indices] = 0
+        self.winner[indices] = -1
+        self.last_rolls[indices] = 0
+
+        self._action_mask = None
+
+    @property
+    def done(self):
+        """Whether each game is over."""
+
+        return self.phase == BatchGame.OVER
+
+    def get_action_mask(self):
+        """Find every legal action of each game.
+
+        Returns:
+            np.ndarray. Shape (batch, ActionSpace.size). All False for games
+              that are over.
+        """
+
+        if self._action_mask is not None:
+            return self._action_mask
+
+        action_space = self.action_space
+        rules = self.rules
+        mask = np.zeros((self.batch_size, action_space.size), np.bool_)
+
+        player_indices = self.current_player[:, np.newaxis]
+
+        def set_build_mask(games, structure_name, position_mask):
+            offset = action_space.build_offsets[structure_name]
+            mask[games, offset:offset + position_mask.shape[-1]] = \
+                position_mask
+
+        games = np.flatnonzero(self.phase == BatchGame.INITIAL_SETTLEMENT)
+
+        if len(games):
+            set_build_mask(games, 'Settlement',
+                           rules.compute_vertex_placement_mask(
+                               self.vertex_owners[games],
+                               self.vertex_structures[games],
+                               self.edge_owners[games],
+                               player_indices[games], 'Settlement', False))
+
+        games = np.flatnonzero(self.phase == BatchGame.INITIAL_ROAD)
+
+        if len(games):
+            set_build_mask(games, 'Road', rules.compute_edge_placement_mask(
+                self.edge_owners[games], self.edge_structures[games],
+                player_indices[games], 'Road', False,
+                self.vertex_edge_mask[self.last_settlement[games]]))
+
+        games = np.flatnonzero(self.phase == BatchGame.MAIN)
+
+        if len(games):
+            mask[games, action_space.end_turn_id] = True
+
+            players = self.current_player[games]
+            hands = self.hands[games, players]
+
+            # Bank trades, of any one type for any other.
+            resource_count = len(action_space.resource_types)
+            trades = (hands >= HeadlessGame.BANK_TRADE_RATIO)[:, :, None] & \
+                (self.bank[games] > 0)[:, None, :] & \
+                ~np.eye(resource_count, dtype=np.bool_)
+
+            mask[games, action_space.trade_offset:
+                 action_space.trade_offset + resource_count ** 2] = \
+                trades.reshape(len(games), -1)
+
+            for code, structure_name in enumerate(rules.structure_names, 1):
+                buildable = (hands >= self.structure_costs[code]).all(1) & \
+                    (self.remaining_structures[games, players, code] > 0)
+
+                build_games = games[buildable]
+
+                if not len(build_games):
+                    continue
+
+                if self.structure_is_edge[code]:
+                    position_mask = rules.compute_edge_placement_mask(
+                        self.edge_owners[build_games],
+                        self.edge_structures[build_games],
+                        player_indices[build_games], structure_name)
+                else:
+                    position_mask = rules.compute_vertex_placement_mask(
+                        self.vertex_owners[build_games],
+                        self.vertex_structures[build_games],
+                        self.edge_owners[build_games],
+                        player_indices[build_games], structure_name)
+
+                set_build_mask(build_games, structure_name, position_mask)
+
+        self._action_mask = mask
+
+        return mask
+
+    def step(self, actions):
+        """Take one action in every game that isn't over.
+
+        Args:
+            actions (np.ndarray): Action id per game. Ignored for games that
+              are over.
+
+        Raises:
+            IllegalActionException. When an action is not legal, in which
+              case no game is changed.
+        """
+
+        actions = np.asarray(actions)
+        games = np.flatnonzero(self.phase != BatchGame.OVER)
+
+        illegal = ~self.get_action_mask()[games, actions[games]]
+
+        if illegal.any():
+            raise IllegalActionException(actions[games[illegal][0]])
+
+        self._action_mask = None
+
+        action_space = self.action_space
+        game_actions = actions[games]
+
+        is_build = self.action_structures[game_actions] > 0
+
+        self._build(games[is_build], game_actions[is_build])
+
+        trade_offset = action_space.trade_offset
+        resource_count = len(action_space.resource_types)
+        is_trade = (game_actions >= trade_offset) & \
+            (game_actions < trade_offset + resource_count ** 2)
+
+        self._trade(games[is_trade], game_actions[is_trade] - trade_offset)
+
+        is_end_turn = game_actions == action_space.end_turn_id
+
+        self._end_turn(games[is_end_turn])
+
+    def _build(self, games, actions):
+
+        if not len(games):
+            return
+
+        codes = self.action_structures[actions]
+        positions = self.action_positions[actions]
+        players = self.current_player[games]
+        is_edge = self.structure_is_edge[codes]
+
+        edge_games = games[is_edge]
+        vertex_games = games[~is_edge]
+
+        old_codes = np.zeros_like(codes)
+        old_codes[is_edge] = self.edge_structures[edge_games,
+                                                  positions[is_edge]]
+        old_codes[~is_edge] = self.vertex_structures[vertex_games,
+                                                     positions[~is_edge]]
+
+        self.edge_owners[edge_games, positions[is_edge]] = players[is_edge]
+        self.edge_structures[edge_games, positions[is_edge]] = codes[is_edge]
+        self.vertex_owners[vertex_games, positions[~is_edge]] = \
+            players[~is_edge]
+        self.vertex_structures[vertex_games, positions[~is_edge]] = \
+            codes[~is_edge]
+
+        # Structures are free during initial placement.
+        costs = self.structure_costs[codes] * \
+            (self.phase[games] == BatchGame.MAIN)[:, np.newaxis]
+
+        self.hands[games, players] -= costs
+        self.bank[games] += costs
+
+        self.remaining_structures[games, players, codes] -= 1
+        self.points[games, players] += \
+            self.structure_point_values[codes] - \
+            self.structure_point_values[old_codes]
+
+        won = self.points[games, players] >= self.points_to_win
+        self.phase[games[won]] = BatchGame.OVER
+        self.winner[games[won]] = players[won]
+
+        self._advance_initial_placement(games[~won], positions[~won])
+
+    def _advance_initial_placement(self, games, positions):
+        """Move games in initial placement on to what follows a build."""
+
+        phases = self.phase[games]
+
+        settled = phases == BatchGame.INITIAL_SETTLEMENT
+        settled_games = games[settled]
+
+        self.last_settlement[settled_games] = positions[settled]
+        self.phase[settled_games] = BatchGame.INITIAL_ROAD
+
+        # The second settlement yields a resource per producing tile.
+        second_games = settled_games[
+            self.placement_index[settled_games] >= self.player_count]
+
+        if len(second_games):
+            demand = self._get_initial_demand(second_games)
+
+            self._distribute(second_games, demand)
+
+        road_games = games[phases == BatchGame.INITIAL_ROAD]
+
+        self.placement_index[road_games] += 1
+
+        finished = self.placement_index[road_games] == \
+            len(self.placement_order)
+
+        self.phase[road_games[finished]] = BatchGame.MAIN
+        self.current_player[road_games[finished]] = 0
+        self._start_turn(road_games[finished])
+
+        placing_games = road_games[~finished]
+
+        self.phase[placing_games] = BatchGame.INITIAL_SETTLEMENT
+        self.current_player[placing_games] = \
+            self.placement_order[self.placement_index[placing_games]]
+
+    def _get_initial_demand(self, games):
+        """Get what the last settlement of each game yields at placement."""
+
+        resource_count = len(self.action_space.resource_types)
+
+        tile_ids = self.rules.vertex_tiles[self.last_settlement[games]]
+        resources = np.append(
+            self.tile_resources[games],
+            np.full((len(games), 1), ArrayBoardState.FALLOW_INDEX, np.int8),
+            1)[np.arange(len(games))[:, np.newaxis], tile_ids]
+
+        demand = np.zeros((len(games), self.player_count, resource_count),
+                          np.int16)
+
+        for index, resource_index in np.argwhere(
+                resources != ArrayBoardState.FALLOW_INDEX):
+            demand[index, self.current_player[games[index]],
+                   resources[index, resource_index]] += \
+                self.structure_yields[self.settlement_code]
+
+        return demand
+
+    def _trade(self, games, trade_indices):
+
+        if not len(games):
+            return
+
+        resource_count = len(self.action_space.resource_types)
+        offered = trade_indices // resource_count
+        requested = trade_indices % resource_count
+        players = self.current_player[games]
+
+        self.hands[games, players, offered] -= HeadlessGame.BANK_TRADE_RATIO
+        self.bank[games, offered] += HeadlessGame.BANK_TRADE_RATIO
+        self.hands[games, players, requested] += 1
+        self.bank[games, requested] -= 1
+
+    def _end_turn(self, games):
+
+        if not len(games):
+            return
+
+        self.turn_count[games] += 1
+        self.current_player[games] = \
+            (self.current_player[games] + 1) % self.player_count
+
+        if self.max_turns is not None:
+            over = self.turn_count[games] >= self.max_turns
+            self.phase[games[over]] = BatchGame.OVER
+            games = games[~over]
+
+        self._start_turn(games)
+
+    def _start_turn(self, games):
+        """Roll the dice for the current player of each game."""
+
+        if not len(games):
+            return
+
+        rolls = self.dice.roll_many(len(games))
+        self.last_rolls[games] = rolls
+
+        robbed = rolls == self.robber.roll_value()
+
+        for game in games[robbed]:
+            self._trigger_robber(game)
+
+        self._produce(games[~robbed], rolls[~robbed])
+
+    def _produce(self, games, rolls):
+        """Distribute what each game's roll yields."""
+
+        tile_vertices = self.rules.tile_vertices
+        resource_count = len(self.action_space.resource_types)
+
+        producing = (self.tile_chits[games] == rolls[:, np.newaxis]) & \
+            (self.tile_resources[games] != ArrayBoardState.FALLOW_INDEX) & \
+            ~self.tile_blocked[games]
+
+        owners = self.vertex_owners[games][:, tile_vertices]
+        yields = self.structure_yields[
+            self.vertex_structures[games][:, tile_vertices]] * \
+            producing[:, :, np.newaxis] * (owners >= 0)
+
+        # Unproducing tiles and vertices yield nothing, so where they add to
+        # doesn't matter as long as it's in bounds.
+        resources = np.minimum(self.tile_resources[games],
+                               resource_count - 1)
+
+        # Sum yields by (game, seat, resource type), as a flat index.
+        demand_ids = (np.arange(len(games))[:, None, None] *
+                      self.player_count + np.maximum(owners, 0)) * \
+            resource_count + resources[:, :, np.newaxis]
+
+        demand = np.bincount(
+            demand_ids.ravel(), yields.ravel(),
+            len(games) * self.player_count * resource_count).astype(np.int16)
+
+        self._distribute(games, demand.reshape(
+            len(games), self.player_count, resource_count))
+
+    def _distribute(self, games, demand):
+        """Hand out resources, if the bank has enough of each type.
+
+        As GameBoard.distribute_resources(), a resource type the bank can't
+        cover for everyone isn't handed out at all.
+
+        Args:
+            games (np.ndarray): Games to distribute in.
+
+            demand (np.ndarray): What each seat receives, shaped (game, seat,
+              resource type).
+        """
+
+        totals = demand.sum(1)
+        covered = totals <= self.bank[games]
+
+        self.hands[games] += demand * covered[:, np.newaxis, :]
+        self.bank[games] -= totals * covered
+
+    def _trigger_robber(self, game):
+        """As Robber.trigger_effect(), with every choice made at random."""
+
+        np_rng = self.np_rng
+        hands = self.hands[game]
+        player = self.current_player[game]
+        threshold = Robber.MIN_ROBBER_ACTIVATING_RESOURCE_COUNT_THRESHOLD
+
+        for seat in range(self.player_count):
+            card_count = hands[seat].sum()
+
+            if card_count > threshold:
+                cards = np.repeat(np.arange(len(hands[seat])), hands[seat])
+                discards = np.bincount(
+                    np_rng.choice(cards, card_count // 2, replace=False),
+                    minlength=len(hands[seat]))
+
+                hands[seat] -= discards
+                self.bank[game] += discards
+
+        tile_ids = np.flatnonzero(~self.tile_blocked[game])
+        tile_id = np_rng.choice(tile_ids)
+
+        self.tile_blocked[game] = False
+        self.tile_blocked[game, tile_id] = True
+
+        owners = self.vertex_owners[game, self.rules.tile_vertices[tile_id]]
+        victims = [seat for seat in set(owners.tolist())
+                   if seat >= 0 and seat != player and hands[seat].any()]
+
+        if victims:
+            victim = np_rng.choice(sorted(victims))
+            resource_index = np_rng.choice(
+                np.repeat(np.arange(len(hands[victim])), hands[victim]))
+
+            hands[victim, resource_index] -= 1
+            hands[player, resource_index] += 1
+
+    def get_observations(self):
+        """Encode each game from its current player's point of view.
+
+        Returns:
+            dict. Arrays named and laid out as in GameEnv's observations,
+              with a leading batch axis, less those about development cards,
+              knights and roads.
+        """
+
+        action_mask = self.get_action_mask()
+        players = self.current_player
+        games = np.arange(self.batch_size)
+
+        # Seats counted from the current player's, for each game.
+        seats = (players[:, np.newaxis] + np.arange(self.player_count)) % \
+            self.player_count
+
+        def get_seats(owners):
+            return np.where(owners >= 0,
+                            (owners - players[:, np.newaxis]) %
+                            self.player_count, -1).astype(np.int8)
+
+        decisions = np.where(self.phase == BatchGame.MAIN,
+                             DecisionType.ACTION.value,
+                             DecisionType.PLACEMENT.value)
+
+        return {
+            'tile_resources': self.tile_resources.copy(),
+            'tile_chits': self.tile_chits.copy(),
+            'robber': self.tile_blocked.copy(),
+            'vertex_owners': get_seats(self.vertex_owners),
+            'vertex_structures': self.vertex_structures.copy(),
+            'edge_owners': get_seats(self.edge_owners),
+            'edge_structures': self.edge_structures.copy(),
+            'bank': self.bank.copy(),
+            'hand': self.hands[games, players],
+            'remaining_structures':
+                self.remaining_structures[games, players, 1:],
+            'hand_sizes': self.hands.sum(2)[games[:, np.newaxis], seats],
+            'points': self.points[games[:, np.newaxis], seats],
+            'decision': np.where(self.done, -1, decisions).astype(np.int8),
+            'action_mask': action_mask,
+        }
+
+    def sample_actions(self, rng=None):
+        """Pick a legal action uniformly at random for each game.
+
+        Args:
+            rng (np.random.RandomState): Source of randomness. Defaults to
+              this batch's own.
+
+        Returns:
+            np.ndarray. Action id per game, 0 for games that are over.
+        """
+
+        if rng is None:
+            rng = self.np_rng
+
+        keys = rng.random_sample((self.batch_size, self.action_space.size))
+        keys[~self.get_action_mask()] = -1
+
+        return keys.argmax(1)
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from enum import Enum
+
+
+class DecisionType(Enum):
+    """The kinds of decision a GameEnv can ask of its learner.
+
+    Each corresponds to one of the Agent.choose_*() methods, except that
+    discarding is asked one card at a time.
+    """
+
+    ACTION = 0
+    PLACEMENT = 1
+    DISCARD = 2
+    ROBBER_TILE = 3
+    PLAYER = 4
+    RESOURCE_TYPE = 5
+
+    def __str__(self):
+        return '{0}'.format(self.name.lower())
@@ -0,0 +1,462 @@
+# -*- coding: utf-8 -*-
+import sys
+import threading
+from Queue import Queue
+
+import numpy as np
+
+from engine.src.agent.agent import Agent
+from engine.src.agent.action_type import ActionType
+from engine.src.board.array_board_state import ArrayBoardState
+from engine.src.env.action_space import ActionSpace
+from engine.src.env.decision_type import DecisionType
+from engine.src.exceptions import *
+from engine.src.headless_game import HeadlessGame
+from engine.src.position_type import PositionType
+
+
+class _GameAborted(Exception):
+    """Raised in a game's thread to unwind it when its env moves on."""
+    pass
+
+
+class _LearnerAgent(Agent):
+    """Answers each of the learner's decisions with an action from its env.
+
+    Runs in the game's thread, where every choice hands the env a decision
+    and blocks until GameEnv.step() supplies the action.
+
+    Args:
+        env (GameEnv): Env to ask.
+    """
+
+    def __init__(self, env):
+        self.env = env
+
+        # Set when an action also settles the choice that follows it, i.e.
+        # where to BUILD or what to TRADE.
+        self.pending_choice = None
+
+    def choose_action(self, game, player, actions):
+
+        action_space = self.env.action_space
+        choices = {}
+
+        for action in actions:
+            action_type, argument = action
+
+            if action_type == ActionType.END_TURN:
+                choices[action_space.end_turn_id] = (action, None)
+
+            elif action_type == ActionType.BUY_DEVELOPMENT_CARD:
+                choices[action_space.buy_development_card_id] = (action, None)
+
+            elif action_type == ActionType.PLAY_DEVELOPMENT_CARD:
+                choices.setdefault(
+                    action_space.get_play_development_card_id(argument.name),
+                    (action, None))
+
+            elif action_type == ActionType.TRADE:
+                for trade_offer in game.get_bank_trade_offers(player):
+                    offered_type, = [
+                        resource_type for resource_type, count in
+                        trade_offer.offered_resources.iteritems() if count]
+                    requested_type, = [
+                        resource_type for resource_type, count in
+                        trade_offer.requested_resources.iteritems() if count]
+
+                    choices[action_space.get_trade_id(
+                        offered_type, requested_type)] = (action, trade_offer)
+
+            elif action_type == ActionType.BUILD:
+                locations = self.env.get_locations(argument)
+
+                for position_id in \
+                        game.board.legal_placement_ids(player, argument):
+                    choices[action_space.get_build_id(
+                        argument, position_id)] = \
+                        (action, locations[position_id][0])
+
+        action, self.pending_choice = self.env._ask(DecisionType.ACTION,
+                                                    choices)
+
+        return action
+
+    def choose_placement(self, game, player, structure_name, placements):
+
+        if self.pending_choice is not None:
+            placement, self.pending_choice = self.pending_choice, None
+            return placement
+
+        action_space = self.env.action_space
+        position_ids = self.env.get_position_ids(structure_name)
+
+        return self.env._ask(DecisionType.PLACEMENT, dict(
+            (action_space.get_build_id(structure_name,
+                                       position_ids[placement]), placement)
+            for placement in placements))
+
+    def choose_trade(self, game, player, trade_offers):
+
+        trade_offer, self.pending_choice = self.pending_choice, None
+
+        return trade_offer
+
+    def choose_discards(self, game, player, resources, count):
+
+        action_space = self.env.action_space
+        indices = []
+
+        # One card at a time, so that the action space stays small.
+        for _ in range(count):
+            choices = {}
+
+            for index, resource_type in enumerate(resources):
+                if index not in indices:
+                    choices.setdefault(
+                        action_space.get_resource_type_id(resource_type),
+                        index)
+
+            indices.append(self.env._ask(DecisionType.DISCARD, choices))
+
+        return indices
+
+    def choose_robber_tile(self, game, player, tiles):
+
+        action_space = self.env.action_space
+        tile_ids = game.board.topology.tile_ids
+
+        return self.env._ask(DecisionType.ROBBER_TILE, dict(
+            (action_space.get_robber_tile_id(tile_ids[(tile.x, tile.y)]),
+             tile)
+            for tile in tiles))
+
+    def choose_player(self, game, player, players):
+
+        action_space = self.env.action_space
+
+        return self.env._ask(DecisionType.PLAYER, dict(
+            (action_space.get_player_id(self.env.get_seat(other_player)),
+             other_player)
+            for other_player in players))
+
+    def choose_resource_type(self, game, player, resource_types):
+
+        action_space = self.env.action_space
+
+        return self.env._ask(DecisionType.RESOURCE_TYPE, dict(
+            (action_space.get_resource_type_id(resource_type), resource_type)
+            for resource_type in resource_types))
+
+
+class GameEnv(object):
+    """A reinforcement learning environment in which one seat learns to play.
+
+    Follows the reset()/step() protocol of OpenAI Gym, without depending on
+    it. Each step answers one decision of the learner with an action id from
+    the env's ActionSpace; the other seats are played by the given agents in
+    between.
+
+    The engine calls its agents rather than being driven step by step, so
+    each game runs in a thread of its own, which waits whenever the learner
+    has a decision to make.
+
+    Observations are dicts of NumPy arrays, built from the board's
+    ArrayBoardState rather than from its tiles. Seats are counted from the
+    learner's, i.e. the learner is always seat 0:
+        tile_resources, tile_chits: See ArrayBoardState, indexed by tile id.
+        robber: Whether the robber is on each tile.
+        vertex_owners, edge_owners: Seat of the owner of each vertex or edge,
+          or -1 if unclaimed.
+        vertex_structures, edge_structures: See ArrayBoardState.
+        bank: Number of cards of each resource type the bank has, in
+          ActionSpace.resource_types order.
+        hand: As bank, for the learner.
+        development_cards: Number of unplayed development cards the learner
+          has of each name, in ActionSpace.card_names order.
+        remaining_structures: Number of each structure the learner has left
+          to build, in ActionSpace.structure_names order.
+        hand_sizes, development_card_counts, points, knights,
+        longest_road_lengths: Per seat. Points are visible points, except for
+          the learner's own.
+        decision: Value of the DecisionType being asked, or -1 once the game
+          is over.
+        action_mask: Whether each action id is legal.
+
+    Attributes:
+        opponents (list): Agents playing the other seats, in turn order.
+
+        learner_seat (int): Position of the learner in the turn order.
+
+        max_turns (int): Turns after which a game ends without a winner.
+
+        config (str): Name of the config variant games are played under, if
+          any. See Config.register().
+
+        game (HeadlessGame): Game being played.
+
+        action_space (ActionSpace): Numbering of the learner's actions. Set by
+          reset().
+
+        decision_type (DecisionType): Decision being asked of the learner, or
+          None once the game is over.
+
+        choices (dict): What each legal action id stands for.
+
+        done (bool): Whether the game is over.
+
+        winner (Player): Winner of the game, once over, if anyone.
+
+    Args:
+        opponents, learner_seat, max_turns, config: See above.
+    """
+
+    def __init__(self, opponents, learner_seat=0, max_turns=1000,
+                 config=None):
+        self.opponents = list(opponents)
+        self.learner_seat = learner_seat
+        self.max_turns = max_turns
+        self.config = config
+        self.player_count = len(self.opponents) + 1
+
+        self.game = None
+        self.action_space = None
+        self.decision_type = None
+        self.choices = {}
+        self.done = True
+        self.winner = None
+
+        self._learner_agent = _LearnerAgent(self)
+        self._thread = None
+        self._error = None
+        self._requests = None
+        self._actions = None
+
+    def reset(self, seed=None):
+        """Start a new game, abandoning any game in progress.
+
+        Args:
+            seed (int): See Game.
+
+        Returns:
+            dict. The observation at the learner's first decision.
+        """
+
+        self.close()
+
+        agents = list(self.opponents)
+        agents.insert(self.learner_seat, self._learner_agent)
+
+        self.game = HeadlessGame(agents, seed=seed, config=self.config)
+        self.array_state = ArrayBoardState.attach(self.game.board,
+                                                  self.game.players)
+
+        topology = self.game.board.topology
+
+        if self.action_space is None or self.action_space.topology is not \
+                topology:
+            self.action_space = ActionSpace(topology, self.player_count,
+                                            self.config)
+
+        self.done = False
+        self.winner = None
+        self._learner_agent.pending_choice = None
+
+        # Fresh queues for every game, so nothing is left over from the last.
+        self._requests = Queue()
+        self._actions = Queue()
+
+        self._thread = threading.Thread(target=self._play)
+        self._thread.daemon = True
+        self._thread.start()
+
+        self._wait()
+
+        return self.get_observation()
+
+    def step(self, action):
+        """Answer the learner's current decision.
+
+        Args:
+            action (int): A legal action id, per the observation's
+              action_mask.
+
+        Returns:
+            tuple. The observation at the learner's next decision, the
+              reward, whether the game is over and a dict of extra info. The
+              reward is 1 if the learner has just won, -1 if someone else
+              has, and 0 otherwise.
+
+        Raises:
+            IllegalActionException. When the action is not legal.
+        """
+
+        if self.done or action not in self.choices:
+            raise IllegalActionException(action)
+
+        self._actions.put(action)
+        self._wait()
+
+        reward = 0
+
+        if self.done and self.winner is not None:
+            reward = 1 if self.get_seat(self.winner) == 0 else -1
+
+        info = {'turn_count': self.game.turn_count, 'winner': self.winner}
+
+        return self.get_observation(), reward, self.done, info
+
+    def close(self):
+        """Abandon the game in progress, if any, and end its thread."""
+
+        if self._thread is not None:
+            self._actions.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def get_seat(self, player):
+        """Get the player's seat, counted from the learner's."""
+
+        return (self.game.players.index(player) - self.learner_seat) % \
+            self.player_count
+
+    def get_position_ids(self, structure_name):
+        """Get the vertex or edge ids the structure's locations map to."""
+
+        topology = self.game.board.topology
+
+        if self.action_space.structure_position_types[structure_name] == \
+                PositionType.EDGE:
+            return topology.edge_ids
+
+        return topology.vertex_ids
+
+    def get_locations(self, structure_name):
+        """Get the locations of each vertex or edge id for the structure."""
+
+        topology = self.game.board.topology
+
+        if self.action_space.structure_position_types[structure_name] == \
+                PositionType.EDGE:
+            return topology.edge_locations
+
+        return topology.vertex_locations
+
+    def get_observation(self):
+        """Encode the game from the learner's point of view.
+
+        Returns:
+            dict. See GameEnv.
+        """
+
+        action_space = self.action_space
+        array_state = self.array_state
+        bank = self.game.board.bank
+
+        players = self.game.players
+        players = players[self.learner_seat:] + players[:self.learner_seat]
+        learner = players[0]
+
+        development_cards = np.zeros(len(action_space.card_names), np.int8)
+
+        for card in learner.get_unplayed_development_cards():
+            development_cards[action_space.card_names.index(card.name)] += 1
+
+        action_mask = np.zeros(action_space.size, np.bool_)
+        action_mask[self.choices.keys()] = True
+
+        return {
+            'tile_resources': array_state.tile_resources.copy(),
+            'tile_chits': array_state.tile_chits.copy(),
+            'robber': array_state.tile_blocked.copy(),
+            'vertex_owners': self._get_seats(array_state.vertex_owners),
+            'vertex_structures': array_state.vertex_structures.copy(),
+            'edge_owners': self._get_seats(array_state.edge_owners),
+            'edge_structures': array_state.edge_structures.copy(),
+            'bank': np.array([bank.resources[resource_type] for resource_type
+                              in action_space.resource_types], np.int16),
+            'hand': np.array([learner.resources[resource_type]
+                              for resource_type in
+                              action_space.resource_types], np.int16),
+            'development_cards': development_cards,
+            'remaining_structures': np.array(
+                [learner.remaining_structure_counts[structure_name]
+                 for structure_name in action_space.structure_names],
+                np.int8),
+            'hand_sizes': np.array([player.count_resources()
+                                    for player in players], np.int16),
+            'development_card_counts': np.array(
+                [len(player.get_unplayed_development_cards())
+                 for player in players], np.int8),
+            'points': np.array(
+                [learner.get_total_points()] +
+                [player.get_visible_points() for player in players[1:]],
+                np.int8),
+            'knights': np.array([player.knights for player in players],
+                                np.int8),
+            'longest_road_lengths': np.array(
+                [player.longest_road_length for player in players], np.int8),
+            'decision': np.array(self.decision_type.value
+                                 if self.decision_type is not None else -1,
+                                 np.int8),
+            'action_mask': action_mask,
+        }
+
+    def _get_seats(self, owners):
+        """Convert owner indices into seats counted from the learner's."""
+
+        return np.where(owners >= 0,
+                        (owners - self.learner_seat) % self.player_count,
+                        -1).astype(np.int8)
+
+    def _play(self):
+        """Play the game through. Runs in the game's thread."""
+
+        try:
+            self.winner = self.game.start(self.max_turns)
+        except _GameAborted:
+            return
+        except Exception:
+            self._error = sys.exc_info()
+
+        self._requests.put((None, None))
+
+    def _ask(self, decision_type, choices):
+        """Hand the learner a decision and wait for its action.
+
+        Runs in the game's thread.
+
+        Args:
+            decision_type (DecisionType): Kind of decision.
+
+            choices (dict): What each legal action id stands for.
+
+        Returns:
+            object. What the chosen action stands for.
+        """
+
+        self._requests.put((decision_type, choices))
+
+        action = self._actions.get()
+
+        if action is None:
+            raise _GameAborted()
+
+        return choices[action]
+
+    def _wait(self):
+        """Wait for the game's thread to ask a decision or finish the game."""
+
+        self.decision_type, choices = self._requests.get()
+
+        if self.decision_type is None:
+            self.done = True
+            self.choices = {}
+            self._thread.join()
+            self._thread = None
+
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error[0], error[1], error[2]
+        else:
+            self.choices = choices
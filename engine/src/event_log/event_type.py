@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+from enum import Enum
+
+
+class EventType(Enum):
+    """The kinds of event a GameLog records.
+
+    Every event is a record of the same fields, see GameLog.RECORD, of which
+    each kind uses a few. Players are given by seat, and the bank as -1.
+    Resource types, structures and development cards are given by their
+    index in GameLog's resource_types, structure_names and card_names.
+
+        ROLL: value is the roll.
+        RESOURCE_COUNT: player's count of item is now value. The player
+          may be the bank.
+        PLACE: player has placed item on the vertex or edge with id
+          position.
+        MOVE_ROBBER: The robber has moved to the tile with id position.
+        BUY_DEVELOPMENT_CARD: player has bought the card on top of the deck,
+          item.
+        PLAY_DEVELOPMENT_CARD: player has played item. value is 1 if that
+          used the card up, else 0.
+        KNIGHTS, HIDDEN_POINTS: player's knights or hidden points are now
+          value, after drawing or playing a card.
+        TRADE: player has traded with other.
+        DISCARD: player has discarded value of item.
+        STEAL: player has stolen value of item from other.
+
+    Resources only ever change through RESOURCE_COUNT events, which is all a
+    replay needs, so TRADE, DISCARD and STEAL are logged after the resource
+    counts they changed and are for reference only.
+    """
+
+    ROLL = 1
+    RESOURCE_COUNT = 2
+    PLACE = 3
+    MOVE_ROBBER = 4
+    BUY_DEVELOPMENT_CARD = 5
+    PLAY_DEVELOPMENT_CARD = 6
+    KNIGHTS = 7
+    HIDDEN_POINTS = 8
+    TRADE = 9
+    DISCARD = 10
+    STEAL = 11
+
+    def __str__(self):
+        return '{0}'.format(self.name.lower())
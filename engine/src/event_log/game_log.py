@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+import struct
+
+import numpy as np
+
+from engine.src.config.config import Config
+from engine.src.resource_type import ResourceType
+from engine.src.event_log.event_type import EventType
+
+
+class GameLog(object):
+    """A compact binary log of every change made to a game's state.
+
+    Each event is a fixed size record packed into a bytearray, so a game of
+    a few thousand events takes a few tens of kilobytes and appending one is
+    a single struct.pack(). Together with the game's seed, which determines
+    its board and deck, the log is enough for a GameReplay to rebuild the
+    game's state after any event, without asking anyone for their choices.
+
+    The log records the game as played. Changes made while looking ahead
+    with Game.begin_action() and undone, or reverted with Game.restore(),
+    aren't logged, so a game should be detached from its log while an agent
+    searches it.
+
+    Attributes:
+        seed (int): Seed of the logged game. See Game.
+
+        player_count (int): Number of seats at the logged game.
+
+        config_name (str): Name of the config variant the game was played
+          under, if any. See Config.register().
+
+        data (bytearray): Events logged so far, RECORD.size bytes each.
+
+        resource_types (list): Arable resource types, as numbered in events.
+
+        structure_names (list): Sorted names of the structures players can
+          build, as numbered in events.
+
+        card_names (list): Sorted development card names, as numbered in
+          events.
+
+    Args:
+        seed (int): See above. Must fit in 64 unsigned bits.
+
+        player_count (int): See above.
+
+        data (bytearray): Events to start from. Defaults to none.
+
+        config_name (str): See above. Structure and card names are taken
+          from this variant, or the config loaded if None.
+    """
+
+    # Fields of each event: kind, player, other, item, value and position.
+    # See EventType for what each kind uses them for.
+    RECORD = struct.Struct('<BbbbhH')
+
+    # NumPy equivalent of RECORD, to decode a whole log at once.
+    RECORD_DTYPE = np.dtype([('kind', '<u1'), ('player', '<i1'),
+                             ('other', '<i1'), ('item', '<i1'),
+                             ('value', '<i2'), ('position', '<u2')])
+
+    # Magic bytes, format version, player count, seed and the length of the
+    # config name, which follows in UTF-8.
+    HEADER = struct.Struct('<4sBBQB')
+    MAGIC = 'CTNL'
+    VERSION = 2
+
+    def __init__(self, seed, player_count, data=None, config_name=None):
+
+        self.seed = seed
+        self.player_count = player_count
+        self.config_name = config_name
+        self.data = bytearray() if data is None else data
+
+        self.resource_types = ResourceType.get_arable_types()
+
+        with Config.use(config_name):
+            self.structure_names = sorted(
+                structure['name'] for structure in
+                Config.get('game.structure.player_built').values())
+            self.card_names = sorted(
+                card['name'] for card in
+                Config.get('game.card.development').values())
+
+        self._resource_indices = dict(
+            (resource_type, index)
+            for index, resource_type in enumerate(self.resource_types))
+        self._structure_indices = dict(
+            (name, index) for index, name in enumerate(self.structure_names))
+        self._card_indices = dict(
+            (name, index) for index, name in enumerate(self.card_names))
+
+        # Seat of each player and the bank's, keyed by their id(), as players
+        # compare by name. See attach_to().
+        self._seats = {}
+
+        self._game = None
+
+    def __len__(self):
+        return len(self.data) // GameLog.RECORD.size
+
+    @classmethod
+    def attach(cls, game):
+        """Start logging the given game. Players must already be seated.
+
+        Returns:
+            GameLog.
+        """
+
+        log = cls(game.rng.seed_value, len(game.players),
+                  config_name=game.config_name)
+        log.attach_to(game)
+
+        return log
+
+    def attach_to(self, game):
+        """Log the given game from now on, e.g. after detach()."""
+
+        self._game = game
+        self._seats = dict((id(player), seat)
+                           for seat, player in enumerate(game.players))
+        self._seats[id(game.board.bank)] = -1
+
+        for entity in game.players + [game.board.bank]:
+            entity.event_log = self
+
+        game.event_log = self
+        game.board.event_log = self
+
+    def detach(self):
+        """Stop logging the game this log is attached to, if any."""
+
+        if self._game is None:
+            return
+
+        for entity in self._game.players + [self._game.board.bank]:
+            entity.event_log = None
+
+        self._game.event_log = None
+        self._game.board.event_log = None
+        self._game = None
+
+    def append(self, event_type, player=-1, other=-1, item=-1, value=0,
+               position=0):
+        """Append an event. See EventType for what each field means."""
+
+        self.data.extend(GameLog.RECORD.pack(
+            event_type.value, player, other, item, value, position))
+
+    def log_roll(self, roll_value):
+        self.append(EventType.ROLL, value=roll_value)
+
+    def log_resource_count(self, entity, resource_type, count):
+        self.append(EventType.RESOURCE_COUNT, self._seats[id(entity)],
+                    item=self._resource_indices[resource_type], value=count)
+
+    def log_placement(self, structure, position_id):
+        self.append(EventType.PLACE, self._seats[id(structure.owning_player)],
+                    item=self._structure_indices[structure.name],
+                    position=position_id)
+
+    def log_robber_move(self, tile):
+        self.append(EventType.MOVE_ROBBER,
+                    position=self._game.board.topology.tile_ids[
+                        (tile.x, tile.y)])
+
+    def log_card_bought(self, player, card):
+        self.append(EventType.BUY_DEVELOPMENT_CARD, self._seats[id(player)],
+                    item=self._card_indices[card.name])
+
+    def log_card_played(self, player, card):
+        self.append(EventType.PLAY_DEVELOPMENT_CARD, self._seats[id(player)],
+                    item=self._card_indices[card.name], value=int(card.played))
+
+    def log_card_effects(self, player, knights, hidden_points):
+        """Log the player's knights and hidden points, if a card changed them.
+
+        Args:
+            player (Player): Player who drew or played the card.
+
+            knights, hidden_points (int): The player's counts beforehand.
+        """
+
+        seat = self._seats[id(player)]
+
+        if player.knights != knights:
+            self.append(EventType.KNIGHTS, seat, value=player.knights)
+
+        if player.hidden_points != hidden_points:
+            self.append(EventType.HIDDEN_POINTS, seat,
+                        value=player.hidden_points)
+
+    def log_trade(self, entity, other_entity):
+        self.append(EventType.TRADE, self._seats[id(entity)],
+                    self._seats[id(other_entity)])
+
+    def log_discard(self, player, resource_type, count=1):
+        self.append(EventType.DISCARD, self._seats[id(player)],
+                    item=self._resource_indices[resource_type], value=count)
+
+    def log_steal(self, player, other_player, resource_type, count=1):
+        self.append(EventType.STEAL, self._seats[id(player)],
+                    self._seats[id(other_player)],
+                    self._resource_indices[resource_type], count)
+
+    def get_events(self):
+        """Decode every event logged so far.
+
+        Returns:
+            np.ndarray. Of RECORD_DTYPE, one entry per event, in order.
+        """
+
+        return np.frombuffer(bytes(self.data), GameLog.RECORD_DTYPE)
+
+    def to_bytes(self):
+        """Serialize this log: a HEADER, the config name and every event."""
+
+        config_name = (self.config_name or u'').encode('utf-8')
+
+        return GameLog.HEADER.pack(GameLog.MAGIC, GameLog.VERSION,
+                                   self.player_count, self.seed,
+                                   len(config_name)) + \
+            config_name + bytes(self.data)
+
+    @classmethod
+    def from_bytes(cls, log_bytes):
+        """Deserialize a log serialized by to_bytes().
+
+        If the game was played under a config variant, it must be registered
+        under the same name. Otherwise the config loaded must be the one the
+        game was played under.
+
+        Raises:
+            ValueError. If log_bytes isn't a log of this version.
+        """
+
+        magic, version, player_count, seed, name_length = \
+            cls.HEADER.unpack_from(log_bytes)
+
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError('Not a version {0} game log.'.format(
+                cls.VERSION))
+
+        data_start = cls.HEADER.size + name_length
+        config_name = log_bytes[cls.HEADER.size:data_start].decode('utf-8')
+
+        return cls(seed, player_count, bytearray(log_bytes[data_start:]),
+                   config_name or None)
+
+    def save(self, path):
+
+        with open(path, 'wb') as log_file:
+            log_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+
+        with open(path, 'rb') as log_file:
+            return cls.from_bytes(log_file.read())
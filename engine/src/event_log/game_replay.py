@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+from engine.src.config.config import Config
+from engine.src.lib.game_random import GameRandom
+from engine.src.board.game_board import GameBoard
+from engine.src.resource_type import ResourceType
+from engine.src.position_type import PositionType
+from engine.src.event_log.event_type import EventType
+
+
+_ROLL = EventType.ROLL.value
+_RESOURCE_COUNT = EventType.RESOURCE_COUNT.value
+_PLACE = EventType.PLACE.value
+_MOVE_ROBBER = EventType.MOVE_ROBBER.value
+_BUY_DEVELOPMENT_CARD = EventType.BUY_DEVELOPMENT_CARD.value
+_PLAY_DEVELOPMENT_CARD = EventType.PLAY_DEVELOPMENT_CARD.value
+_KNIGHTS = EventType.KNIGHTS.value
+_HIDDEN_POINTS = EventType.HIDDEN_POINTS.value
+
+
+class GameReplay(object):
+    """Rebuilds the state of a logged game after any of its events.
+
+    The board and deck are rebuilt from the log's seed, as Game builds them,
+    and events are then applied one by one to plain lists, so that replaying
+    is a matter of a few list assignments per event rather than playing the
+    game again. The config is the log's config variant, if it has one, else
+    the one loaded, which must then be the one the game was played under.
+
+    Players are given by seat, and resource types, structures and
+    development cards by their index in the log's resource_types,
+    structure_names and card_names. -1 stands for no one and nothing.
+
+    Attributes:
+        log (GameLog): Log being replayed.
+
+        topology (BoardTopology): Topology of the board played on.
+
+        tile_resource_types (list): ResourceType of each tile, by tile id.
+
+        tile_chit_values (list): Chit value of each tile, by tile id.
+
+        position (int): Number of events applied so far.
+
+        roll (int): Last roll, or None before the first.
+
+        robber_tile (int): Id of the tile the robber is on.
+
+        resources (list): Per seat, then for the bank last, the count of each
+          resource type. Indexing with -1 gives the bank's, as in events.
+
+        vertex_structures, vertex_owners (list): Structure on each vertex,
+          and its owner's seat, by vertex id.
+
+        edge_structures, edge_owners (list): As above, by edge id.
+
+        remaining_structures (list): Per seat, how many of each structure
+          are left to build.
+
+        points (list): Points from structures, per seat.
+
+        knights, hidden_points (list): Per seat.
+
+        development_cards (list): Per seat, how many of each card are held,
+          not yet used up.
+
+        played_cards (list): Per seat, how many of each card are used up.
+
+        deck (list): Cards left to buy. The last is bought next.
+
+    Args:
+        log (GameLog): See above.
+    """
+
+    def __init__(self, log):
+
+        self.log = log
+
+        with Config.use(log.config_name):
+            board = GameBoard(Config.get('game.board.radius'),
+                              GameRandom(log.seed).spawn('board'))
+
+        self.topology = board.topology
+        self.tile_resource_types = [tile.resource_type
+                                    for tile in board.tiles_by_id]
+        self.tile_chit_values = [tile.chit_value
+                                 for tile in board.tiles_by_id]
+
+        # As placed by Game.
+        robber_tile = board.get_tile_of_resource_type(ResourceType.FALLOW)
+        self._initial_robber_tile = \
+            self.topology.tile_ids[(robber_tile.x, robber_tile.y)]
+
+        self._initial_bank_resources = [board.bank.resources[resource_type]
+                                        for resource_type in
+                                        log.resource_types]
+        self._initial_deck = [log.card_names.index(card.name)
+                              for card in board.bank.development_cards]
+
+        structures = dict((structure['name'], structure)
+                          for structure in board.structure_configs.values())
+
+        self._structure_counts = [structures[name]['count']
+                                  for name in log.structure_names]
+
+        # Points gained by placing each structure, as counted by
+        # Game.place_structure(): structures that augment another gain the
+        # difference from it.
+        self._structure_point_gains = []
+
+        for name in log.structure_names:
+            point_gain = structures[name]['point_value']
+            augments = structures[name]['upgrades'] or \
+                structures[name]['extends']
+
+            if augments:
+                point_gain -= structures[augments]['point_value']
+
+            self._structure_point_gains.append(point_gain)
+
+        self._structure_is_edge = [
+            structures[name]['position_type'] == PositionType.EDGE
+            for name in log.structure_names]
+
+        self._decode()
+        self.reset()
+
+    def _decode(self):
+        """Decode the log into a list per field, which are quick to index."""
+
+        events = self.log.get_events()
+
+        self._kinds = events['kind'].tolist()
+        self._players = events['player'].tolist()
+        self._others = events['other'].tolist()
+        self._items = events['item'].tolist()
+        self._values = events['value'].tolist()
+        self._positions = events['position'].tolist()
+
+    def __len__(self):
+        return len(self._kinds)
+
+    def reset(self):
+        """Return to the state before the first event."""
+
+        player_count = self.log.player_count
+        resource_count = len(self.log.resource_types)
+        card_count = len(self.log.card_names)
+
+        self.position = 0
+        self.roll = None
+        self.robber_tile = self._initial_robber_tile
+
+        self.resources = [[0] * resource_count
+                          for _ in range(player_count)]
+        self.resources.append(list(self._initial_bank_resources))
+
+        self.vertex_structures = [-1] * len(self.topology.vertex_locations)
+        self.vertex_owners = [-1] * len(self.topology.vertex_locations)
+        self.edge_structures = [-1] * len(self.topology.edge_locations)
+        self.edge_owners = [-1] * len(self.topology.edge_locations)
+
+        self.remaining_structures = [list(self._structure_counts)
+                                     for _ in range(player_count)]
+        self.points = [0] * player_count
+        self.knights = [0] * player_count
+        self.hidden_points = [0] * player_count
+
+        self.development_cards = [[0] * card_count
+                                  for _ in range(player_count)]
+        self.played_cards = [[0] * card_count for _ in range(player_count)]
+        self.deck = list(self._initial_deck)
+
+    def seek(self, position):
+        """Rebuild the state after the given number of events.
+
+        Replays forward from the current position, or from the start if
+        position is behind it.
+
+        Args:
+            position (int): Number of events to have applied. May be
+              negative, to count back from the end of the log.
+        """
+
+        if position < 0:
+            position += len(self)
+
+        if not 0 <= position <= len(self):
+            raise IndexError('No event {0} in a log of {1}.'.format(
+                position, len(self)))
+
+        if position < self.position:
+            self.reset()
+
+        kinds = self._kinds
+        players = self._players
+        items = self._items
+        values = self._values
+        positions = self._positions
+
+        resources = self.resources
+        is_edge = self._structure_is_edge
+        point_gains = self._structure_point_gains
+
+        for index in xrange(self.position, position):
+            kind = kinds[index]
+
+            if kind == _RESOURCE_COUNT:
+                resources[players[index]][items[index]] = values[index]
+
+            elif kind == _ROLL:
+                self.roll = values[index]
+
+            elif kind == _PLACE:
+                player = players[index]
+                structure = items[index]
+
+                if is_edge[structure]:
+                    self.edge_structures[positions[index]] = structure
+                    self.edge_owners[positions[index]] = player
+                else:
+                    self.vertex_structures[positions[index]] = structure
+                    self.vertex_owners[positions[index]] = player
+
+                self.points[player] += point_gains[structure]
+                self.remaining_structures[player][structure] -= 1
+
+            elif kind == _MOVE_ROBBER:
+                self.robber_tile = positions[index]
+
+            elif kind == _BUY_DEVELOPMENT_CARD:
+                self.deck.pop()
+                self.development_cards[players[index]][items[index]] += 1
+
+            elif kind == _PLAY_DEVELOPMENT_CARD:
+                if values[index]:
+                    self.development_cards[players[index]][items[index]] -= 1
+                    self.played_cards[players[index]][items[index]] += 1
+
+            elif kind == _KNIGHTS:
+                self.knights[players[index]] = values[index]
+
+            elif kind == _HIDDEN_POINTS:
+                self.hidden_points[players[index]] = values[index]
+
+        self.position = position
+
+    def find(self, event_type):
+        """Get the index of every event of the given EventType, in order.
+
+        seek() to an index plus one for the state right after that event.
+        """
+
+        kind = event_type.value
+
+        return [index for index, event_kind in enumerate(self._kinds)
+                if event_kind == kind]
+
+    def get_event(self, index):
+        """Get an event as (EventType, player, other, item, value, position).
+        """
+
+        return (EventType(self._kinds[index]), self._players[index],
+                self._others[index], self._items[index], self._values[index],
+                self._positions[index])
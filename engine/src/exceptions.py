@@ -107,6 +107,13 @@ class NoConfigValueDefinedException(UserMessageException):
         self.msg = 'No config value defined for {}.'.format(dot_notation_str)
 
 
+class NoConfigVariantDefinedException(UserMessageException):
+
+    def __init__(self, name):
+
+        self.msg = 'No config variant registered as {}.'.format(name)
+
+
 class NoSuchVertexException(UserMessageException):
 
     def __init__(self, tile, vertex_dir):
@@ -128,3 +135,10 @@ class InvalidStructurePlacementException(UserMessageException):
 
     def __init__(self):
         self.msg = 'Not a valid position to place the structure.'
+
+
+class IllegalActionException(UserMessageException):
+    """Raise when an environment is given an action its mask doesn't allow."""
+
+    def __init__(self, action):
+        self.msg = 'Action {} is not legal here.'.format(action)
@@ -2,6 +2,7 @@ import pdb
 import re
 from engine.src.config.config import Config
 from engine.src.lib.utils import Utils
+from engine.src.lib.game_random import GameRandom
 from engine.src.exceptions import *
 from engine.src.player import Player
 from engine.src.dice import Dice
@@ -12,30 +13,66 @@ from engine.src.resource_type import ResourceType
 from engine.src.position_type import PositionType
 from engine.src.structure.structure import Structure
 from engine.src.calamity.robber import Robber
-from engine.src.longest_road_search import LongestRoadSearch
 
 from imperative_parser.oracle import ORACLE
 
 class Game(object):
-    """A game of Settlers of Catan."""
+    """A game of Settlers of Catan.
 
-    def __init__(self):
+    Attributes:
+        config (ConfigSnapshot): The config this game is played by.
 
-        Config.init()
-        ORACLE.set('game', self)
+        config_name (str): Name of the config variant this game was made
+          under, if any. See Config.register().
+
+        rng (GameRandom): Source of all of this game's randomness. The dice,
+          board, bank and robber each draw from their own substream of it, so
+          a game is reproducible from its seed, config and players' choices.
+
+        event_log (GameLog): Log that this game's events are appended to, if
+          any. See GameLog.attach().
+
+    Args:
+        seed (int): Seeds rng. Defaults to one drawn from the random module.
+
+        config (str): Name of a config variant registered with
+          Config.register() to play by, whatever config is loaded meanwhile.
+          Defaults to the config loaded.
+    """
+
+    def __init__(self, seed=None, config=None):
+
+        self.config_name = config
+
+        with Config.use(config):
+            Config.init()
+            ORACLE.set('game', self)
+
+            self.config = Config.get_snapshot()
+
+            self.rng = GameRandom(seed)
+
+            self.dice = Dice(rng=self.rng.spawn('dice'))
+            self.board = GameBoard(self.config.game.board.radius,
+                                   self.rng.spawn('board'))
 
-        self.dice = Dice()
-        self.board = GameBoard(Config.get('game.board.radius'))
         ORACLE.set('board', self.board)
 
         # Place the robber on a fallow tile.
-        self.robber = Robber()
+        self.robber = Robber(self.rng.spawn('robber'))
         tile = self.board.get_tile_of_resource_type(ResourceType.FALLOW)
         tile.add_calamity(self.robber)
 
         self.players = []
+        self.current_player = None
         self.input_manager = InputManager
 
+        # Per action, the board's journal mark and the players' and bank's
+        # state beforehand. See begin_action().
+        self.undo_stack = []
+
+        self.event_log = None
+
     def start(self):
         self.create_players()
         self.initial_settlement_and_road_placement()
@@ -45,8 +82,9 @@ class Game(object):
 
         max_point_count = 0
 
-        while max_point_count < Config.get('game.points_to_win'):
+        while max_point_count < self.config.game.points_to_win:
             for player in self.players:
+                self.current_player = player
                 ORACLE.set('player', player)
                 InputManager(self, player).cmdloop()
                 self.update_point_counts()
@@ -92,13 +130,13 @@ class Game(object):
                     raise NotEnoughResourcesException(obstructing_entity, obstructing_resource_type)
 
             if structure.position_type == PositionType.EDGE:
-                prompt_func = InputManager.prompt_edge_placement
                 placement_func = self.board.place_edge_structure
             elif structure.position_type == PositionType.VERTEX:
-                prompt_func = InputManager.prompt_vertex_placement
                 placement_func = self.board.place_vertex_structure
 
-            x, y, struct_dir = prompt_func(self)
+            x, y, struct_dir = self.choose_placement(
+                player, structure, must_border_claimed_edge, struct_x,
+                struct_y, struct_vertex_dir)
 
             params = [x, y, struct_dir, structure, must_border_claimed_edge]
 
@@ -114,7 +152,9 @@ class Game(object):
                 # TODO: conversions from camelcase to underscore
                 structure_name = re.sub(r'\s', '_', structure_name).lower()
                 augments = re.sub(r'\s', '_', structure.augments()).lower()
-                points = structure.point_value - Config.get('game.structure.player_built.' + augments + '.point_value')
+                structures = self.config.game.structure.player_built
+                points = structure.point_value - \
+                    structures[augments].point_value
             else:
                 points = structure.point_value
 
@@ -139,6 +179,23 @@ class Game(object):
             # it in a custom fashion.
             raise
 
+    def choose_placement(self, player, structure,
+                         must_border_claimed_edge=True, struct_x=None,
+                         struct_y=None, struct_vertex_dir=None):
+        """Ask where the player would like to place the structure.
+
+        Args:
+            See place_structure().
+
+        Returns:
+            tuple. Of x, y and the vertex or edge direction.
+        """
+
+        if structure.position_type == PositionType.EDGE:
+            return self.input_manager.prompt_edge_placement(self)
+        else:
+            return self.input_manager.prompt_vertex_placement(self)
+
     def place_init_structure(self, player, structure_name,
                              must_border_claimed_edge=False,
                              struct_x=None, struct_y=None,
@@ -157,39 +214,43 @@ class Game(object):
             except (BoardPositionOccupiedException,
                     InvalidBaseStructureException,
                     InvalidStructurePlacementException), e:
-                player.restore_structure(structure_name)
-                InputManager.output(e)
+                # place_structure() has already returned the structure.
+                self.input_manager.output(e)
 
         return x, y, struct_dir
 
     def initial_settlement_and_road_placement(self):
 
-        InputManager.announce_initial_structure_placement_stage()
+        self.input_manager.announce_initial_structure_placement_stage()
 
         for player in self.players:
 
-            InputManager.announce_player_turn(player)
+            self.current_player = player
+            self.input_manager.announce_player_turn(player)
 
             # Place settlement
-            InputManager.announce_structure_placement(player, 'Settlement')
+            self.input_manager.announce_structure_placement(player,
+                                                            'Settlement')
             x, y, vertex_dir = self.place_init_structure(player, 'Settlement')
 
             # Place road
-            InputManager.announce_structure_placement(player, 'Road')
+            self.input_manager.announce_structure_placement(player, 'Road')
             self.place_init_structure(player, 'Road', False, x, y, vertex_dir)
 
         distributions = Utils.nested_dict()
 
         for player in list(reversed(self.players)):
 
-            InputManager.announce_player_turn(player)
+            self.current_player = player
+            self.input_manager.announce_player_turn(player)
 
             # Place settlement
-            InputManager.announce_structure_placement(player, 'Settlement')
+            self.input_manager.announce_structure_placement(player,
+                                                            'Settlement')
             x, y, vertex_dir = self.place_init_structure(player, 'Settlement')
 
             # Place road
-            InputManager.announce_structure_placement(player, 'Road')
+            self.input_manager.announce_structure_placement(player, 'Road')
             self.place_init_structure(player, 'Road', False, x, y, vertex_dir)
 
             neighboring_tiles = filter(
@@ -206,47 +267,213 @@ class Game(object):
                 if not distributions[player][resource_type]:
                     distributions[player][resource_type] = 0
 
-                distributions[player][resource_type] += \
-                    Config.get('game.structure.player_built.settlement.base_yield')
+                distributions[player][resource_type] += self.config.game \
+                    .structure.player_built.settlement.base_yield
 
         self.board.distribute_resources(distributions)
-        InputManager.announce_resource_distributions(distributions)
+        self.input_manager.announce_resource_distributions(distributions)
 
     def roll_dice(self, value=None):
 
         roll_value = self.dice.roll()
-        InputManager.announce_roll_value(roll_value)
+
+        if self.event_log is not None:
+            self.event_log.log_roll(roll_value)
+
+        self.input_manager.announce_roll_value(roll_value)
         ORACLE.set('dice_value', roll_value)
 
         # If a calamity value, handle calamity
+        if roll_value == self.robber.roll_value():
+            self.robber.trigger_effect(self, self.current_player)
+
         distributions = self.board.distribute_resources_for_roll(roll_value)
 
-        InputManager.announce_resource_distributions(distributions)
+        self.input_manager.announce_resource_distributions(distributions)
+
+    def buy_development_card(self, player):
+        """Have the player buy the top development card and draw it.
+
+        Returns:
+            DevelopmentCard. The card bought.
+
+        Raises:
+            NotEnoughDevelopmentCardsException, NotEnoughResourcesException.
+        """
+
+        knights, hidden_points = player.knights, player.hidden_points
+
+        card = self.board.bank.buy_development_card(player)
+        self._call_card_function(card, 'draw_card', player)
+
+        if self.event_log is not None:
+            self.event_log.log_card_bought(player, card)
+            self.event_log.log_card_effects(player, knights, hidden_points)
+
+        return card
+
+    def play_development_card(self, player, card):
+        """Have the player play one of their development cards.
+
+        Exceptions raised by the card, e.g. when there's nowhere to place a
+        structure, are passed on, once what the card did is logged.
+        """
+
+        knights, hidden_points = player.knights, player.hidden_points
+
+        try:
+            self._call_card_function(card, 'play_card', player)
+        finally:
+            if self.event_log is not None:
+                self.event_log.log_card_played(player, card)
+                self.event_log.log_card_effects(player, knights,
+                                                hidden_points)
+
+    def _call_card_function(self, card, function_name, player):
+        """Call a development card's draw_card or play_card.
+
+        Card functions, whether of the engine's game_config or compiled by
+        skit, take only the card, and get the game and player from ORACLE.
+        Both are set here first, as games under different configs may be
+        played side by side.
+        """
+
+        ORACLE.set('game', self)
+        ORACLE.set('player', player)
+
+        getattr(card, function_name)()
+
+    def snapshot(self):
+        """Capture the mutable state of this game. See restore().
+
+        Much cheaper than copy.deepcopy(), as tiles, vertices and edges are
+        not copied, only the values stored on them.
+
+        Returns:
+            tuple. To be passed to restore(), as is.
+        """
+
+        return (tuple(self.players),
+                tuple(player.snapshot() for player in self.players),
+                self.board.bank.snapshot(),
+                self.board.snapshot())
+
+    def restore(self, snapshot):
+        """Return to the state captured by snapshot().
+
+        Discards the undo stack. See begin_action().
+        """
+
+        players, player_snapshots, bank_snapshot, board_snapshot = snapshot
+
+        self.players = list(players)
+
+        for player, player_snapshot in zip(players, player_snapshots):
+            player.restore(player_snapshot)
+
+        self.board.bank.restore(bank_snapshot)
+        self.board.restore(board_snapshot)
+
+        self.undo_stack = []
+        self.board.journal = None
+
+    def begin_action(self):
+        """Start recording an action, so that undo_action() can revert it.
+
+        Changes to the board are recorded as they happen, as per-change
+        deltas. The players' and bank's state, being a handful of counts,
+        is captured whole. Actions may be nested, e.g. during a tree search.
+        """
+
+        self.undo_stack.append((
+            self.board.begin_action(),
+            tuple(player.snapshot() for player in self.players),
+            self.board.bank.snapshot()
+        ))
+
+    def undo_action(self):
+        """Revert every change made since the last call to begin_action()."""
+
+        board_mark, player_snapshots, bank_snapshot = self.undo_stack.pop()
+
+        self.board.undo_to(board_mark)
+
+        for player, player_snapshot in zip(self.players, player_snapshots):
+            player.restore(player_snapshot)
+
+        self.board.bank.restore(bank_snapshot)
+
+    def forget_actions(self):
+        """Stop recording actions, keeping their changes without a way back."""
+
+        self.undo_stack = []
+        self.board.journal = None
+
+    def state_hash(self):
+        """Get a 64-bit Zobrist hash of this game's state.
+
+        Covers the board, see GameBoard.zobrist_hash, each player's and the
+        bank's resource counts and the bank's remaining development cards.
+        Kept up to date incrementally, so this is a handful of XORs.
+        """
+
+        state_hash = self.board.zobrist_hash ^ self.board.bank.zobrist_hash ^ \
+            self.board.bank.deck_hash
+
+        for player in self.players:
+            state_hash ^= player.zobrist_hash
+
+        return state_hash
 
     def get_winning_player(self):
         """Get the player who is winning this game of Settlers of Catan."""
 
         return max(self.players, key=lambda player: player.points)
 
+    def get_largest_army_player(self):
+        """Get the player holding the largest army, if anyone."""
+
+        player_with_largest_army = max(self.players, key=lambda player: player.knights)
+
+        # TODO: Move thresholds to config
+        if player_with_largest_army.knights >= 3:
+            return player_with_largest_army
+
+        return None
+
+    def get_longest_road_player(self):
+        """Get the player holding the longest road, if anyone."""
+
+        player_with_longest_road = max(
+            self.players, key=lambda player: player.longest_road_length)
+
+        if player_with_longest_road.longest_road_length >= 5:
+            return player_with_longest_road
+
+        return None
+
     def update_point_counts(self):
 
         for player in self.players:
             player.special_points = 0
 
-        player_with_largest_army = max(self.players, key=lambda player: player.knights)
+        player_with_largest_army = self.get_largest_army_player()
 
-        # TODO: Move thresholds to config
-        if player_with_largest_army.knights >= 3:
-            print 'Largest army given to: {}'.format(player_with_largest_army)
+        if player_with_largest_army is not None:
+            self.input_manager.output('Largest army given to: {}'.format(
+                player_with_largest_army))
             player_with_largest_army.special_points += 2
 
-        player_road_len_dict = LongestRoadSearch(self.board).execute()
+        # Roads are tracked by the board as they are placed, so this is a
+        # lookup rather than a search.
+        player_road_len_dict = self.board.longest_roads.get_per_player_road_lens()
 
         for player, road_len in player_road_len_dict.iteritems():
             player.longest_road_length = road_len
 
-        player_with_longest_road = max(player_road_len_dict)
+        player_with_longest_road = self.get_longest_road_player()
 
-        if player_with_longest_road.longest_road_length >= 5:
-            print 'Longest road given to: {}'.format(player_with_longest_road)
+        if player_with_longest_road is not None:
+            self.input_manager.output('Longest road given to: {}'.format(
+                player_with_longest_road))
             player_with_longest_road.special_points += 2
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+from engine.src.config.config import Config
+from engine.src.exceptions import *
+from engine.src.game import Game
+from engine.src.player import Player
+from engine.src.resource_type import ResourceType
+from engine.src.trading.trade_offer import TradeOffer
+from engine.src.agent.action_type import ActionType
+from engine.src.agent.agent_input_manager import AgentInputManager
+
+from imperative_parser.oracle import ORACLE
+
+
+class HeadlessGame(Game):
+    """A game of Settlers of Catan played by agents, without a terminal.
+
+    Every decision is delegated to the agent of the player concerned, chosen
+    from the legal options, and nothing is printed.
+
+    Attributes:
+        agents (dict): Agent of each player, keyed by player.
+
+        turn_count (int): Number of turns played so far.
+
+        has_played_card (bool): Whether the current player has played a
+          development card this turn.
+
+        bought_cards (list): Development cards the current player has bought
+          this turn, which can't be played until a later turn.
+
+    Args:
+        agents (list): Agent of each player, in turn order.
+
+        player_names (list): Name of each player, in turn order. Defaults to
+          p1, p2, etc.
+
+        seed, config: See Game.
+    """
+
+    # Number of dice rolls generated at a time. See Dice.
+    DICE_BUFFER_SIZE = 1024
+
+    # Number of cards of one resource type the bank takes for one card of any
+    # other type, as in InputManager.do_trade_bank().
+    BANK_TRADE_RATIO = 4
+
+    def __init__(self, agents, player_names=None, seed=None, config=None):
+
+        super(HeadlessGame, self).__init__(seed, config)
+
+        # Games without a terminal are mostly played in bulk.
+        self.dice.buffer_size = HeadlessGame.DICE_BUFFER_SIZE
+
+        if player_names is None:
+            player_names = ['p{0}'.format(i + 1) for i in range(len(agents))]
+
+        with Config.use(config):
+            self.players = [Player(player_name)
+                            for player_name in player_names]
+
+        ORACLE.set('players', self.players)
+
+        self.agents = dict(zip(self.players, agents))
+        self.input_manager = AgentInputManager(self)
+
+        self.turn_count = 0
+
+        self.has_played_card = False
+        self.bought_cards = []
+
+    def start(self, max_turns=None):
+        """Play the game through.
+
+        Args:
+            max_turns (int): Stop after this many turns, if given.
+
+        Returns:
+            Player. The winner, or None if max_turns ran out first.
+        """
+
+        self.initial_settlement_and_road_placement()
+
+        return self.game_loop(max_turns)
+
+    def create_players(self):
+        """Players are created from the agents given to the constructor."""
+        pass
+
+    def game_loop(self, max_turns=None):
+        """Play turns until a player wins. See start()."""
+
+        points_to_win = self.config.game.points_to_win
+
+        while max_turns is None or self.turn_count < max_turns:
+            player = self.players[self.turn_count % len(self.players)]
+
+            self.play_turn(player)
+            self.turn_count += 1
+
+            if player.get_total_points() >= points_to_win:
+                return player
+
+        return None
+
+    def play_turn(self, player):
+        """Roll, then carry out the player's chosen actions until they end
+        their turn."""
+
+        self.current_player = player
+        ORACLE.set('player', player)
+
+        self.has_played_card = False
+        self.bought_cards = []
+
+        self.roll_dice()
+        self.continue_turn(player)
+
+    def continue_turn(self, player, action=None):
+        """Carry out the player's chosen actions until they end their turn.
+
+        Args:
+            player (Player): Player whose turn it is, who has rolled.
+
+            action (tuple): First action to take, if already chosen. See
+              ActionType.
+        """
+
+        agent = self.agents[player]
+
+        while True:
+            if action is None:
+                actions = self.get_legal_actions(
+                    player, self.has_played_card, self.bought_cards)
+                action = agent.choose_action(self, player, actions)
+
+            if action[0] == ActionType.END_TURN:
+                break
+
+            self.take_action(player, action)
+            self.update_point_counts()
+
+            action = None
+
+    def take_action(self, player, action):
+        """Carry out an action other than ending the turn. See ActionType."""
+
+        action_type, argument = action
+
+        if action_type == ActionType.BUILD:
+            self.place_structure(player, argument)
+
+        elif action_type == ActionType.BUY_DEVELOPMENT_CARD:
+            self.bought_cards.append(self.buy_development_card(player))
+
+        elif action_type == ActionType.PLAY_DEVELOPMENT_CARD:
+            self.has_played_card = True
+
+            try:
+                self.play_development_card(player, argument)
+            except (BoardPositionOccupiedException,
+                    InvalidBaseStructureException,
+                    InvalidStructurePlacementException,
+                    NotEnoughStructuresException):
+                # E.g. road building with nowhere left to build.
+                pass
+
+        elif action_type == ActionType.TRADE:
+            trade_offer = self.agents[player].choose_trade(
+                self, player, self.get_bank_trade_offers(player))
+
+            if trade_offer is not None:
+                self.board.bank.trade(player, trade_offer)
+
+    def get_legal_actions(self, player, has_played_card=False,
+                          bought_cards=()):
+        """Get every action the player may take next.
+
+        Args:
+            player (Player): Player whose turn it is.
+
+            has_played_card (bool): Whether the player has played a
+              development card this turn.
+
+            bought_cards (list): Development cards bought this turn, which
+              can't be played until a later turn.
+
+        Returns:
+            list. Of (ActionType, argument) tuples. See ActionType.
+        """
+
+        actions = []
+
+        for structure_name, structure_type in \
+                sorted(player.structure_types.iteritems()):
+            if not player.remaining_structure_counts[structure_name] or \
+                    not HeadlessGame._can_afford(player, structure_type.cost):
+                continue
+
+            if self.board.legal_placements(player, structure_name):
+                actions.append((ActionType.BUILD, structure_name))
+
+        development_cards = self.board.bank.development_cards
+
+        if development_cards and \
+                HeadlessGame._can_afford(player, development_cards[-1].cost):
+            actions.append((ActionType.BUY_DEVELOPMENT_CARD, None))
+
+        if not has_played_card:
+            for card in player.get_unplayed_development_cards():
+                if card.is_playable and card not in bought_cards:
+                    actions.append((ActionType.PLAY_DEVELOPMENT_CARD, card))
+
+        if self.get_bank_trade_offers(player):
+            actions.append((ActionType.TRADE, None))
+
+        actions.append((ActionType.END_TURN, None))
+
+        return actions
+
+    def get_bank_trade_offers(self, player):
+        """Get every trade the bank would accept from the player."""
+
+        bank = self.board.bank
+        trade_offers = []
+
+        for offered_type in ResourceType.get_arable_types():
+            if player.resources[offered_type] < HeadlessGame.BANK_TRADE_RATIO:
+                continue
+
+            for requested_type in ResourceType.get_arable_types():
+                if requested_type != offered_type and \
+                        bank.resources[requested_type]:
+                    trade_offers.append(TradeOffer(
+                        {offered_type: HeadlessGame.BANK_TRADE_RATIO},
+                        {requested_type: 1}))
+
+        return trade_offers
+
+    @staticmethod
+    def _can_afford(player, cost):
+        return all(player.resources[resource_type] >= count
+                   for resource_type, count in cost.iteritems())
+
+    def choose_placement(self, player, structure,
+                         must_border_claimed_edge=True, struct_x=None,
+                         struct_y=None, struct_vertex_dir=None):
+
+        placements = self.board.legal_placements(
+            player, structure.name, must_border_claimed_edge, struct_x,
+            struct_y, struct_vertex_dir)
+
+        if not placements:
+            raise InvalidStructurePlacementException()
+
+        return self.agents[player].choose_placement(
+            self, player, structure.name, placements)
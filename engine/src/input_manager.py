@@ -208,8 +208,7 @@ class InputManager(cmd.Cmd):
         else:
 
             try:
-                dev_card = self.game.board.bank.buy_development_card(self.player)
-                dev_card.draw_card()
+                dev_card = self.game.buy_development_card(self.player)
 
                 success_msg = 'You received a {0}!'.format(str(dev_card))
 
@@ -242,7 +241,7 @@ class InputManager(cmd.Cmd):
                 return
 
             try:
-                dev_card.play_card()
+                self.game.play_development_card(self.player, dev_card)
                 self.game.update_point_counts()
 
             # TODO: Make clear which exceptions can be caught.
@@ -421,6 +420,65 @@ class InputManager(cmd.Cmd):
 
         return InputManager.prompt_select_list_value(msg, players)
 
+    @staticmethod
+    def prompt_robber_tile(game, player, tiles):
+        """Prompt for a tile to move the robber to, out of the given tiles."""
+
+        tile = None
+
+        while tile not in tiles:
+            x, y = InputManager.prompt_tile_coordinates(game)
+            tile = game.board.get_tile_with_coords(x, y)
+
+            if tile not in tiles:
+                InputManager.output('The robber must move to a new tile.')
+
+        return tile
+
+    @staticmethod
+    def prompt_discard_resources(game, player, resources, count):
+        """Prompt the player to discard the given number of resource cards.
+
+        Args:
+            game (Game): The game being played.
+
+            player (Player): Player who must discard.
+
+            resources (list): The player's resource cards, as given by
+              TradingEntity.get_resource_list().
+
+            count (int): Number of cards to discard.
+
+        Returns:
+            list. Indices into resources of the cards to discard.
+        """
+
+        msg = ("{0}, please enter a comma separated list of the numbers " +
+               "of the {1} cards you would like to discard.").format(
+            player.name, count)
+
+        for index, resource_type in enumerate(resources):
+            print '({0}) {1}'.format(index + 1, resource_type)
+
+        while True:
+            try:
+                indices = [
+                    int(index) - 1 for index in
+                    InputManager.input_default(msg).replace(' ', '').split(',')
+                ]
+
+                if len(set(indices)) != count or \
+                        not all(0 <= index < len(resources)
+                                for index in indices):
+                    raise ValueError
+
+                return indices
+
+            except (ValueError, AttributeError):
+                InputManager.output(
+                    'You must give {0} distinct numbers between 1 and '
+                    '{1}.'.format(count, len(resources)))
+
     @staticmethod
     def prompt_tile_coordinates(game):
 
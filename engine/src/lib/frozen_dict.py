@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+
+class FrozenDict(dict):
+    """A dict that can't be changed once made.
+
+    Used to hand out values that are shared between callers, e.g. those
+    cached by Config.get(), where a caller changing its copy would change
+    everyone else's.
+
+    Pickling and comparing work as with a dict. copy() gives a plain dict,
+    for callers that want to change their own copy.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('{0} is read-only.'.format(type(self).__name__))
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+    @classmethod
+    def freeze(cls, value):
+        """Get a read-only copy of a value, with any dicts it holds frozen.
+
+        Args:
+            value: Any value. Only dicts, and dicts nested in them, are
+              copied.
+
+        Returns:
+            FrozenDict if value is a dict, else value itself.
+        """
+
+        if type(value) is dict:
+            return cls((k, cls.freeze(v)) for k, v in value.iteritems())
+
+        return value
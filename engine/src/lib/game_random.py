@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import random
+import struct
+
+
+class GameRandom(random.Random):
+    """A seeded random number generator that splits into independent streams.
+
+    Each part of a game that needs randomness, e.g. the dice or the bank's
+    deck, draws from its own substream, so that one part drawing more or
+    fewer numbers never shifts what another part draws.
+
+    A substream's seed is derived from an md5 digest of its parent's seed and
+    a key, as with Zobrist keys, so it is the same in every process and run.
+
+    Attributes:
+        seed_value (int): Seed this generator was created with.
+
+    Args:
+        seed (int): Seed to start from. Defaults to one drawn from the random
+          module, so that random.seed() still makes unseeded games
+          repeatable.
+    """
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.getrandbits(64)
+
+        self.seed_value = seed
+
+        super(GameRandom, self).__init__(seed)
+
+    def spawn(self, *key):
+        """Derive an independent substream.
+
+        Args:
+            *key: Strings and ints naming the substream, e.g. 'dice' or
+              ('game', 12). The same key always gives the same substream.
+
+        Returns:
+            GameRandom.
+        """
+
+        digest = hashlib.md5(repr((self.seed_value,) + key)).digest()
+
+        return GameRandom(struct.unpack('<Q', digest[:8])[0])
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import importlib
+
+
+class LazyImport(object):
+    """A callable that stands in for a module's function until first called.
+
+    The module is imported the first time the reference is called, and the
+    function it finds is kept and called directly from then on. Until then,
+    nothing is imported, so configs can name functions of modules that a
+    process never ends up needing.
+
+    Copies are the reference itself, and pickling one pickles only the
+    module and function names, so a process it's sent to imports the module
+    itself, if ever.
+
+    Attributes:
+        module_name (str): Dotted name of the module, e.g.
+          'engine.src.config.card.development.knight'.
+
+        name (str): Name of the function in the module.
+
+    Args:
+        module_name, name (str): See above.
+    """
+
+    def __init__(self, module_name, name):
+        self.module_name = module_name
+        self.name = name
+
+        self._function = None
+
+    def resolve(self):
+        """Import the function, if it hasn't been already, and return it."""
+
+        if self._function is None:
+            module = importlib.import_module(self.module_name)
+            self._function = getattr(module, self.name)
+
+        return self._function
+
+    def __call__(self, *args, **kwargs):
+        return (self._function or self.resolve())(*args, **kwargs)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __eq__(self, other):
+        return type(other) is type(self) and \
+            (other.module_name, other.name) == (self.module_name, self.name)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.module_name, self.name))
+
+    def __reduce__(self):
+        return type(self), (self.module_name, self.name)
+
+    def __repr__(self):
+        return '{0}({1!r}, {2!r})'.format(
+            type(self).__name__, self.module_name, self.name)
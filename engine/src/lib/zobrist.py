@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import struct
+
+
+class Zobrist(object):
+    """Keys for Zobrist hashing of game state.
+
+    A state is hashed by XOR-ing together one 64-bit key per feature it has,
+    e.g. "vertex 12 holds p1's settlement", so that changing a feature only
+    takes XOR-ing out its old key and XOR-ing in its new one.
+
+    Keys are derived from an md5 digest of the feature rather than drawn at
+    random, so hashes of the same state agree across processes and runs.
+    """
+
+    _keys = {}
+
+    @staticmethod
+    def key(*feature):
+        """Get the key of a feature.
+
+        Args:
+            *feature: Strings and ints describing the feature.
+
+        Returns:
+            int. A 64-bit key.
+        """
+
+        if feature not in Zobrist._keys:
+            digest = hashlib.md5(repr(feature)).digest()
+            Zobrist._keys[feature] = struct.unpack('<Q', digest[:8])[0]
+
+        return Zobrist._keys[feature]
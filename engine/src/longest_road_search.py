@@ -1,266 +1,354 @@
-import pdb
-from engine.src.lib.utils import Utils
-from engine.src.direction.edge_direction import EdgeDirection
-from engine.src.direction.edge_vertex_mapping import EdgeVertexMapping
 from engine.src.structure.structure import Structure
-from engine.src.tile.hex_tile import HexTile
 
 
-global vertices
-global edges
-
-
-def reset_metas():
-    global vertices
-    global edges
-    vertices = Utils.nested_dict()
-    edges = Utils.nested_dict()
+class LongestRoadSearch(object):
+    """Find the length of every player's longest road on a board.
 
+    A road is a sequence of distinct, connected edges claimed by the same
+    player, i.e. a trail: vertices may be revisited, but edges may not. A road
+    can end at, but not continue through, a vertex holding another player's
+    structure.
 
-def find_edge_meta(board, x, y, edge_dir):
-    edge = edges[x][y][edge_dir]
+    The search runs over the board's topology. Each player's claimed edges are
+    kept as an integer bitmask indexed by edge id, as are the edges already
+    used by the trail being explored, so that membership tests and
+    backtracking are single bit operations rather than list copies.
 
-    if not edge:
-        tile = board.get_tile_with_coords(x, y)
-        if tile:
-            edge = EdgeMeta(board, x, y, edge_dir)
-        else:
-            edge = None
+    Args:
+        board (HexBoard): Board whose roads to search.
+    """
 
-    return edge
+    def __init__(self, board):
+        self.board = board
 
+    def execute(self):
+        """Find the longest road of each player with at least one road.
 
-def find_vertex_meta(board, x, y, vertex_dir):
-    vertex = vertices[x][y][vertex_dir]
+        Returns:
+            dict. Keys are players and values are their longest road lengths.
+        """
 
-    if not vertex:
-        tile = board.get_tile_with_coords(x, y)
-        if tile:
-            vertex = VertexMeta(board, x, y, vertex_dir)
-        else:
-            vertex = None
+        player_road_len_dict = {}
 
-    return vertex
+        for player, edge_ids in self.find_per_player_claimed_edges().iteritems():
+            blocked_vertex_ids = self.find_blocked_vertices(player)
 
+            player_road_len_dict[player] = LongestRoadSearch.find_max_road_len(
+                self.board.topology, edge_ids, blocked_vertex_ids)
 
-class VertexMeta(object):
+        return player_road_len_dict
 
-    def __init__(self, board, x, y, vertex_dir):
+    def find_per_player_claimed_edges(self):
+        """Get the ids of every claimed edge, keyed by owning player."""
 
-        vertices[x][y][vertex_dir] = self
+        player_claimed_edges_dict = {}
 
-        self.board = board
+        for edge_id, edge_val in enumerate(self.board.edge_vals):
+            if isinstance(edge_val, Structure):
+                player_claimed_edges_dict.setdefault(
+                    edge_val.owning_player, []).append(edge_id)
 
-        self.x = x
-        self.y = y
-        self.tile = self.board.get_tile_with_coords(self.x, self.y)
+        return player_claimed_edges_dict
 
-        self.vertex_dir = vertex_dir
+    def find_blocked_vertices(self, player):
+        """Get the ids of vertices with structures owned by other players."""
 
-        self.neighbors = []
+        return set(
+            vertex_id
+            for vertex_id, vertex_val in enumerate(self.board.vertex_vals)
+            if isinstance(vertex_val, Structure) and
+            vertex_val.owning_player != player
+        )
 
-        self.neighbors = self.find_neighbor_equivalents()
+    @staticmethod
+    def find_max_road_len(topology, edge_ids, blocked_vertex_ids=()):
+        """Find the longest trail through the given edges.
 
-    def find_neighbor_equivalents(self):
+        Args:
+            topology (BoardTopology): Topology the ids refer to.
 
-        neighbors = []
+            edge_ids (iterable): Ids of the edges claimed by a single player.
 
-        # Get the two edges of the found tile that have as an endpoint
-        # a vertex of the given vertex direction.
-        vertex_adj_edge_dirs = EdgeVertexMapping.get_edge_dirs_for_vertex_dir(
-            self.vertex_dir)
+            blocked_vertex_ids (set): Ids of vertices a road may end at but
+              not pass through.
 
-        for vertex_adj_edge_dir in vertex_adj_edge_dirs:
-            neighbor_x = self.tile.x + vertex_adj_edge_dir[0]
-            neighbor_y = self.tile.y + vertex_adj_edge_dir[1]
-            neighbor_tile = self.board.get_neighboring_tile(self.tile, vertex_adj_edge_dir)
+        Returns:
+            int. The number of edges in the longest trail.
+        """
 
-            # Edge tiles may not have neighboring tiles in the given direction.
-            if neighbor_tile:
-                neighbor_vertex_dir = HexTile.get_equivalent_vertex_dir(
-                    self.vertex_dir, vertex_adj_edge_dir)
+        vertex_edges = topology.vertex_edges
+        edge_vertices = topology.edge_vertices
 
-                neighbor = find_vertex_meta(self.board, neighbor_x, neighbor_y, neighbor_vertex_dir)
+        edge_mask = 0
+        start_vertex_ids = set()
 
-                neighbors.append(neighbor)
+        for edge_id in edge_ids:
+            edge_mask |= 1 << edge_id
+            start_vertex_ids.update(edge_vertices[edge_id])
 
-        return neighbors
+        def find_max_path_len(vertex_id, used_mask):
+            max_path_len = 0
 
-    def __str__(self):
-        return '({}, {}) {}'.format(self.x, self.y, self.vertex_dir)
+            for edge_id in vertex_edges[vertex_id]:
+                bit = 1 << edge_id
 
-    def __eq__(self, other):
+                if not edge_mask & bit or used_mask & bit:
+                    continue
 
-        matches = self.x == other.x and \
-                  self.y == other.y and \
-                  self.vertex_dir == other.vertex_dir
+                start_id, end_id = edge_vertices[edge_id]
+                next_vertex_id = end_id if start_id == vertex_id else start_id
 
-        for neighbor in self.neighbors:
-            matches = matches or \
-                      neighbor.x == other.x and \
-                      neighbor.y == other.y and \
-                      neighbor.vertex_dir == other.vertex_dir
+                if next_vertex_id in blocked_vertex_ids:
+                    path_len = 1
+                else:
+                    path_len = 1 + find_max_path_len(next_vertex_id,
+                                                     used_mask | bit)
 
-        return matches
+                if path_len > max_path_len:
+                    max_path_len = path_len
 
+            return max_path_len
 
-class EdgeMeta(object):
+        max_road_len = 0
 
-    def __init__(self, board, x, y, edge_dir):
+        for vertex_id in start_vertex_ids:
+            road_len = find_max_path_len(vertex_id, 0)
 
-        edges[x][y][edge_dir] = self
+            if road_len > max_road_len:
+                max_road_len = road_len
 
-        self.board = board
+        return max_road_len
 
-        self.x = x
-        self.y = y
-        self.tile = self.board.get_tile_with_coords(self.x, self.y)
 
-        self.edge_dir = edge_dir
-        self.edge_val = self.tile.get_edge(self.edge_dir)
+class RoadComponent(object):
+    """A maximal set of one player's roads that are connected to each other.
 
-        # Neighbor equivalent edge meta of same edge.
-        self.neighbor_x = self.tile.x + self.edge_dir[0]
-        self.neighbor_y = self.tile.y + self.edge_dir[1]
-        self.neighbor_edge_dir = self.edge_dir.get_opposite_direction()
+    Attributes:
+        player (Player): Owner of every road in this component.
 
-        edges[self.neighbor_x][self.neighbor_y][self.neighbor_edge_dir] = self
+        edge_ids (set): Ids of the edges making up this component.
 
-    def __str__(self):
-        return '({}, {}) {}'.format(self.x, self.y, self.edge_dir)
+        road_len (int): Length of the longest road within this component.
+    """
 
-    def __repr__(self):
-        return '({}, {}) {}'.format(self.x, self.y, self.edge_dir)
+    def __init__(self, player, edge_ids):
+        self.player = player
+        self.edge_ids = edge_ids
+        self.road_len = 0
 
-    def __eq__(self, other):
 
-        if other is None:
-            return False
+class LongestRoadTracker(object):
+    """Maintains every player's longest road as structures are placed.
 
-        matches_this = self.x == other.x and \
-                       self.y == other.y and \
-                       self.edge_dir == other.edge_dir
+    Each player's roads are partitioned into RoadComponents. Two roads belong
+    to the same component when they share a vertex that doesn't hold another
+    player's structure. Placing a road only re-evaluates the components it
+    touches, merged into one; placing a settlement only re-evaluates the
+    opponent components running through its vertex, which it may split.
 
-        matches_neighbor = self.neighbor_x == other.x and \
-                           self.neighbor_y == other.y and \
-                           self.neighbor_edge_dir == other.edge_dir
+    Attributes:
+        board (HexBoard): Board whose roads are tracked.
 
-        return matches_this or matches_neighbor
+        edge_components (dict): The component of each claimed edge, keyed by
+          edge id.
 
+        player_components (dict): List of components, keyed by player.
 
-class LongestRoadSearch(object):
+    Args:
+        board (HexBoard): Board whose roads are tracked. Roads already on the
+          board are picked up.
+    """
 
     def __init__(self, board):
         self.board = board
+        self.rebuild()
 
-    def execute(self):
-        reset_metas()
+    def rebuild(self):
+        """Recompute every component from the roads currently on the board."""
 
-        player_claimed_edges_dict = self.find_per_player_claimed_edges()
-        player_road_len_dict = self.find_per_player_max_road_lengths(player_claimed_edges_dict)
+        self.edge_components = {}
+        self.player_components = {}
 
-        return player_road_len_dict
+        search = LongestRoadSearch(self.board)
 
-    def find_per_player_claimed_edges(self):
+        for player, edge_ids in \
+                search.find_per_player_claimed_edges().iteritems():
+            for component_edge_ids in self._split(player, set(edge_ids)):
+                self._add_component(player, component_edge_ids)
 
-        player_claimed_edges_dict = Utils.nested_dict()
-        checked_edges = Utils.nested_dict()
+    def get_per_player_road_lens(self):
+        """Get each player's longest road, as LongestRoadSearch.execute()."""
 
-        for x, y in self.board.iter_tile_coords():
-            tile = self.board.get_tile_with_coords(x, y)
+        player_road_len_dict = {}
 
-            if not tile:
-                continue
+        for player, components in self.player_components.iteritems():
+            if components:
+                player_road_len_dict[player] = max(
+                    component.road_len for component in components)
 
-            for edge_dir in EdgeDirection:
-                if not checked_edges[x][y][edge_dir]:
-                    self.add_edge_to_dicts(x, y, edge_dir, player_claimed_edges_dict, checked_edges)
+        return player_road_len_dict
 
-        return player_claimed_edges_dict
+    def snapshot(self):
+        """Capture the current components. See restore()."""
 
-    def add_edge_to_dicts(self, x, y, edge_dir, player_claimed_edges_dict, checked_edges):
+        return (dict(self.edge_components),
+                dict((player, tuple(components)) for player, components in
+                     self.player_components.iteritems()))
 
-        edge_meta = find_edge_meta(self.board, x, y, edge_dir)
+    def restore(self, snapshot):
+        """Return to the components captured by snapshot()."""
 
-        if not edge_meta:
-            checked_edges[x][y][edge_dir] = True
-            return
+        edge_components, player_components = snapshot
 
-        checked_edges[edge_meta.x][edge_meta.y][edge_meta.edge_dir] = True
-        checked_edges[edge_meta.neighbor_x][edge_meta.neighbor_y][edge_meta.neighbor_edge_dir] = True
+        self.edge_components = dict(edge_components)
+        self.player_components = dict(
+            (player, list(components))
+            for player, components in player_components.iteritems())
 
-        if isinstance(edge_meta.edge_val, Structure):
-            player = edge_meta.edge_val.owning_player
+    def add_edge_structure(self, edge_id, structure):
+        """Account for a road newly placed on the given edge.
 
-            if not player_claimed_edges_dict[player]:
-                player_claimed_edges_dict[player] = []
+        Returns:
+            tuple. The components removed and the components added, which
+              revert() takes to undo this placement.
+        """
 
-            player_claimed_edges_dict[player].append(edge_meta)
+        player = structure.owning_player
 
-    def find_per_player_max_road_lengths(self, player_claimed_edges_dict):
+        edge_ids = set([edge_id])
+        removed_components = []
 
-        player_road_len_dict = {}
+        for component in self._find_neighboring_components(edge_id, player):
+            edge_ids.update(component.edge_ids)
+            self._remove_component(component)
+            removed_components.append(component)
 
-        for player, player_claimed_edges in player_claimed_edges_dict.iteritems():
-            player_road_len_dict[player] = self.find_max_road_len(player_claimed_edges)
+        return removed_components, [self._add_component(player, edge_ids)]
 
-        return player_road_len_dict
+    def add_vertex_structure(self, vertex_id, structure):
+        """Account for a structure newly placed on the given vertex.
 
-    def find_max_road_len(self, player_claimed_edges):
+        Returns:
+            tuple. See add_edge_structure().
         """
-        Args:
-            player_claimed_edges (list): List of EdgeMetas.
+
+        touching_components = set(
+            self.edge_components[edge_id]
+            for edge_id in self.board.topology.vertex_edges[vertex_id]
+            if edge_id in self.edge_components
+        )
+
+        removed_components = []
+        added_components = []
+
+        for component in touching_components:
+            if component.player == structure.owning_player:
+                continue
+
+            self._remove_component(component)
+            removed_components.append(component)
+
+            for edge_ids in self._split(component.player, component.edge_ids):
+                added_components.append(
+                    self._add_component(component.player, edge_ids))
+
+        return removed_components, added_components
+
+    def revert(self, delta):
+        """Undo a placement, given the delta its add_*_structure() returned.
+
+        Must be called after the placement is undone on the board, and after
+        any later placement has been reverted.
         """
 
-        max_road_len = 0
+        removed_components, added_components = delta
 
-        for edge_meta in player_claimed_edges:
-            edge_dir = edge_meta.edge_dir
+        for component in added_components:
+            self._remove_component(component)
 
-            vertex_dirs = EdgeVertexMapping.get_vertex_dirs_for_edge_dir(edge_dir)
+        for component in removed_components:
+            self._insert_component(component)
 
-            remaining_edges = [e for e in player_claimed_edges if e != edge_meta]
+    def _is_blocked(self, vertex_id, player):
+        """Whether a road of the given player can't pass the given vertex."""
 
-            start_vertex = find_vertex_meta(self.board, edge_meta.x, edge_meta.y, vertex_dirs[0])
-            end_vertex = find_vertex_meta(self.board, edge_meta.x, edge_meta.y, vertex_dirs[1])
+        vertex_val = self.board.vertex_vals[vertex_id]
 
-            road_len = 1 + self.find_max_path_len(remaining_edges, end_vertex, edge_meta) \
-                         + self.find_max_path_len(remaining_edges, start_vertex, edge_meta)
+        return isinstance(vertex_val, Structure) and \
+            vertex_val.owning_player != player
 
-            if road_len > max_road_len:
-                max_road_len = road_len
+    def _find_neighboring_components(self, edge_id, player):
+        """Get the player's components the given edge would connect to."""
 
-        return max_road_len
+        topology = self.board.topology
+        components = set()
 
-    def find_max_path_len(self, remaining_edges, end_vertex, edge_meta):
+        for vertex_id in topology.edge_vertices[edge_id]:
+            if self._is_blocked(vertex_id, player):
+                continue
 
-        neighbor_edge_metas = map(
-            lambda edge_tuple: find_edge_meta(self.board, *edge_tuple),
-            self.board.get_adjacent_edges(edge_meta.x, edge_meta.y, end_vertex.vertex_dir, False)
+            for other_id in topology.vertex_edges[vertex_id]:
+                component = self.edge_components.get(other_id)
+
+                if component is not None and component.player == player:
+                    components.add(component)
+
+        return components
+
+    def _split(self, player, edge_ids):
+        """Partition the player's edges into connected sets of edges."""
+
+        topology = self.board.topology
+        remaining_edge_ids = set(edge_ids)
+
+        while remaining_edge_ids:
+            stack = [remaining_edge_ids.pop()]
+            component_edge_ids = set(stack)
+
+            while stack:
+                edge_id = stack.pop()
+
+                for vertex_id in topology.edge_vertices[edge_id]:
+                    if self._is_blocked(vertex_id, player):
+                        continue
+
+                    for other_id in topology.vertex_edges[vertex_id]:
+                        if other_id in remaining_edge_ids:
+                            remaining_edge_ids.remove(other_id)
+                            component_edge_ids.add(other_id)
+                            stack.append(other_id)
+
+            yield component_edge_ids
+
+    def _add_component(self, player, edge_ids):
+
+        topology = self.board.topology
+        component = RoadComponent(player, edge_ids)
+
+        blocked_vertex_ids = set(
+            vertex_id for edge_id in edge_ids
+            for vertex_id in topology.edge_vertices[edge_id]
+            if self._is_blocked(vertex_id, player)
         )
 
-        claimed_neighbors = [i for i in neighbor_edge_metas if i in remaining_edges]
+        component.road_len = LongestRoadSearch.find_max_road_len(
+            topology, edge_ids, blocked_vertex_ids)
 
-        if claimed_neighbors:
-            max_path_len = 0
+        self._insert_component(component)
 
-            for claimed_neighbor in claimed_neighbors:
-                remaining_edge_metas = [x for x in remaining_edges if (x != claimed_neighbor and x != edge_meta)]
+        return component
 
-                vertices = EdgeVertexMapping.get_vertex_dirs_for_edge_dir(claimed_neighbor.edge_dir)
+    def _insert_component(self, component):
 
-                vertex_metas = map(
-                    lambda vertex_dir: find_vertex_meta(self.board, claimed_neighbor.x, claimed_neighbor.y, vertex_dir),
-                    vertices
-                )
+        for edge_id in component.edge_ids:
+            self.edge_components[edge_id] = component
 
-                next_end_vertex = next(d for d in vertex_metas if d != end_vertex)
+        self.player_components.setdefault(component.player, []).append(
+            component)
 
-                path_len = 1 + self.find_max_path_len(remaining_edge_metas, next_end_vertex, claimed_neighbor)
+    def _remove_component(self, component):
 
-                if path_len > max_path_len:
-                    max_path_len = path_len
+        for edge_id in component.edge_ids:
+            del self.edge_components[edge_id]
 
-            return max_path_len
-        else:
-            return 0
+        self.player_components[component.player].remove(component)
@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
 from engine.src.lib.utils import Utils
-import re
 from engine.src.config.config import Config
 from engine.src.structure.structure import Structure
+from engine.src.structure.structure_type import StructureType
 from engine.src.trading.trading_entity import TradingEntity
 from engine.src.exceptions import NotEnoughStructuresException
 
@@ -15,16 +15,25 @@ class Player(TradingEntity):
 
         name (str): This player's name.
 
+        structure_types (dict): The StructureType of each structure this
+          player can build, keyed by structure name. Shared by every
+          structure the player builds.
+
     Args:
         name (str): Name to assign a new player.
     """
 
-    def __init__(self, name):
+    __slots__ = ('name', 'development_cards', 'points', 'hidden_points',
+                 'special_points', 'knights', 'longest_road_length',
+                 'remaining_structure_counts', 'structure_types')
 
-        super(Player, self).__init__()
+    def __init__(self, name):
 
+        # Set first, as it identifies this player's resources when hashing.
         self.name = name
 
+        super(Player, self).__init__()
+
         self.development_cards = []
 
         self.points = 0
@@ -35,6 +44,7 @@ class Player(TradingEntity):
         self.longest_road_length = 0
 
         self.remaining_structure_counts = {}
+        self.structure_types = {}
         self.init_structure_counts()
 
     def __hash__(self):
@@ -46,12 +56,46 @@ class Player(TradingEntity):
     def __str__(self):
         return self.name
 
+    def get_zobrist_name(self):
+        return self.name
+
     def init_structure_counts(self):
 
         self.remaining_structure_counts = {}
+        self.structure_types = {}
 
         for structure in Config.get('game.structure.player_built').values():
             self.remaining_structure_counts[structure['name']] = structure['count']
+            self.structure_types[structure['name']] = \
+                StructureType(**structure)
+
+    def snapshot(self):
+        """Capture this player's mutable state. See restore()."""
+
+        return (dict(self.resources), tuple(self.development_cards),
+                tuple((card.played, card.is_playable)
+                      for card in self.development_cards),
+                self.points, self.hidden_points, self.special_points,
+                self.knights, self.longest_road_length,
+                dict(self.remaining_structure_counts))
+
+    def restore(self, snapshot):
+        """Return to the state captured by snapshot()."""
+
+        (resources, development_cards, card_states, self.points,
+         self.hidden_points, self.special_points, self.knights,
+         self.longest_road_length, remaining_structure_counts) = snapshot
+
+        self.resources = dict(resources)
+        self.rehash_resources()
+
+        self.development_cards = list(development_cards)
+        self.remaining_structure_counts = dict(remaining_structure_counts)
+
+        for card, (played, is_playable) in zip(development_cards,
+                                               card_states):
+            card.played = played
+            card.is_playable = is_playable
 
     def get_total_points(self):
         return self.points + self.hidden_points + self.special_points
@@ -83,11 +127,7 @@ class Player(TradingEntity):
         if structure_count > 0:
             self.remaining_structure_counts[structure_name] -= 1
 
-            structure_name = re.sub(r'\s', '_', structure_name).lower()
-            config_path = 'game.structure.player_built.' + structure_name
-            structure_dict = Config.get(config_path)
-
-            return Structure(self, **structure_dict)
+            return Structure(self, self.structure_types[structure_name])
         else:
             raise NotEnoughStructuresException(self, structure_name)
 
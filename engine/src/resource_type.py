@@ -49,13 +49,18 @@ class ResourceType(Enum):
             yield resource_type
 
     @classmethod
-    def random_arable_type(cls):
-        """Return a random non-fallow ResourceType."""
+    def random_arable_type(cls, rng=None):
+        """Return a random non-fallow ResourceType.
 
-        arable_types = ResourceType.get_arable_types()
-        random_index = random.randint(0, len(arable_types))
+        Args:
+            rng (random.Random): Source of randomness. Defaults to the random
+              module.
+        """
 
-        return arable_types[random_index]
+        if rng is None:
+            rng = random
+
+        return rng.choice(ResourceType.get_arable_types())
 
     @classmethod
     def find_by_value(cls, value):
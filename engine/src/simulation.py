@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+import math
+import multiprocessing
+from collections import namedtuple
+
+import numpy as np
+
+from engine.src.config.config import Config
+from engine.src.config.game_config import game_config
+from engine.src.lib.game_random import GameRandom
+from engine.src.headless_game import HeadlessGame
+from engine.src.resource_type import ResourceType
+
+
+# Outcome of a single simulated game, played under the config named
+# config_name, see iter_results(). Players are given by seat index, i.e.
+# their position in the turn order, and winner, longest_road and
+# largest_army are None when nobody holds them. turns holds the game's
+# per-turn summaries, see get_turn_dtype(), if they were recorded, and is
+# None otherwise.
+GameResult = namedtuple('GameResult', [
+    'config_name', 'seed', 'winner', 'turn_count', 'points', 'longest_road',
+    'largest_army', 'turns'
+])
+
+
+def get_structure_names(config=None):
+    """Get the sorted names of the structures players can build.
+
+    Args:
+        config (str): Name of the config variant to look them up in, if any.
+          Defaults to the config loaded. See Config.register().
+    """
+
+    with Config.use(config):
+        return sorted(structure['name'] for structure in
+                      Config.get('game.structure.player_built').values())
+
+
+def get_turn_dtype(config=None):
+    """Get the dtype of per-turn summaries, under the given config.
+
+    Each summary is of one seat's standing after a turn, with its total
+    points, the count of each arable resource type it holds, in the order of
+    ResourceType.get_arable_types(), and the count of each structure it has
+    built, in the order of get_structure_names().
+
+    Args:
+        config (str): See get_structure_names().
+    """
+
+    return np.dtype([
+        ('turn', np.int32),
+        ('player', np.int8),
+        ('points', np.int16),
+        ('resources', np.int16, (len(ResourceType.get_arable_types()),)),
+        ('structures', np.int16, (len(get_structure_names(config)),))
+    ])
+
+
+class SimulationSummary(object):
+    """Running totals over the results of many simulated games.
+
+    Results are added one at a time, so a summary takes the same memory
+    however many games it covers.
+
+    Attributes:
+        player_count (int): Number of seats at each game.
+
+        game_count (int): Number of games added so far.
+
+        unfinished_count (int): Number of games nobody won before running out
+          of turns.
+
+        win_counts (list): Number of games won, per seat.
+
+        longest_road_counts (list): Number of games ending with the longest
+          road held, per seat.
+
+        largest_army_counts (list): As longest_road_counts, for the largest
+          army.
+
+        point_totals (list): Sum of final points, per seat.
+
+        turn_total (int): Sum of the number of turns of every game.
+    """
+
+    def __init__(self, player_count):
+        self.player_count = player_count
+        self.game_count = 0
+        self.unfinished_count = 0
+        self.win_counts = [0] * player_count
+        self.longest_road_counts = [0] * player_count
+        self.largest_army_counts = [0] * player_count
+        self.point_totals = [0] * player_count
+        self.turn_total = 0
+
+    def add(self, result):
+        """Account for the given GameResult."""
+
+        self.game_count += 1
+        self.turn_total += result.turn_count
+
+        if result.winner is None:
+            self.unfinished_count += 1
+        else:
+            self.win_counts[result.winner] += 1
+
+        if result.longest_road is not None:
+            self.longest_road_counts[result.longest_road] += 1
+
+        if result.largest_army is not None:
+            self.largest_army_counts[result.largest_army] += 1
+
+        for seat, points in enumerate(result.points):
+            self.point_totals[seat] += points
+
+    def get_win_rates(self):
+        """Get the fraction of games won, per seat."""
+
+        return [float(win_count) / self.game_count
+                for win_count in self.win_counts]
+
+    def get_win_rate_errors(self):
+        """Get the standard error of each seat's win rate.
+
+        Games are independent, so each seat's wins are binomial and a 95%
+        confidence interval is about two standard errors either side of the
+        win rate.
+        """
+
+        return [math.sqrt(win_rate * (1 - win_rate) / self.game_count)
+                for win_rate in self.get_win_rates()]
+
+    def get_mean_points(self):
+        """Get the average final points, per seat."""
+
+        return [float(point_total) / self.game_count
+                for point_total in self.point_totals]
+
+    def get_mean_turn_count(self):
+        return float(self.turn_total) / self.game_count
+
+
+# Set by _init_worker() in each worker process, so that agent classes and
+# configs are handed over once per process rather than once per game.
+_worker_state = {}
+
+
+def _get_variant_name(config_name, config):
+    """Get the name a config is registered under for games.
+
+    The digest of its contents is part of the name, so a variant of the same
+    name registered by anyone else is never overwritten.
+    """
+
+    return 'simulation:{0}:{1}'.format(config_name, Config.get_digest(config))
+
+
+def _init_worker(agent_classes, configs, variant_names, max_turns,
+                 record_turns):
+    """Register each config as a variant, so that games under any of them
+    can follow each other without reloading, and remember what every game is
+    played with.
+
+    Args:
+        configs (dict): Config of each variant, keyed by name.
+
+        variant_names (dict): Name to register each config under, keyed by
+          the same names.
+    """
+
+    for config_name, config in configs.iteritems():
+        if variant_names[config_name] not in Config.variants:
+            Config.register(variant_names[config_name], config)
+
+    _worker_state['agent_classes'] = agent_classes
+    _worker_state['variant_names'] = variant_names
+    _worker_state['max_turns'] = max_turns
+    _worker_state['record_turns'] = record_turns
+
+
+def _play_game(game_key):
+    """Play one game with the worker's agents and summarize its outcome.
+
+    Args:
+        game_key (tuple): Name of the config to play under, and the seed of
+          the game, which also seeds each of its agents through a substream
+          of their own.
+
+    Returns:
+        GameResult.
+    """
+
+    config_name, seed = game_key
+    rng = GameRandom(seed)
+
+    agents = [agent_class(rng.spawn('agent', seat))
+              for seat, agent_class in
+              enumerate(_worker_state['agent_classes'])]
+
+    game = HeadlessGame(agents, seed=seed,
+                        config=_worker_state['variant_names'][config_name])
+
+    if _worker_state['record_turns']:
+        winner, turns = _play_recorded_game(game, _worker_state['max_turns'])
+    else:
+        winner = game.start(_worker_state['max_turns'])
+        turns = None
+
+    def get_seat(player):
+        return game.players.index(player) if player is not None else None
+
+    return GameResult(
+        config_name, seed, get_seat(winner), game.turn_count,
+        tuple(player.get_total_points() for player in game.players),
+        get_seat(game.get_longest_road_player()),
+        get_seat(game.get_largest_army_player()),
+        turns)
+
+
+def _play_recorded_game(game, max_turns):
+    """Play the game through a turn at a time, summarizing every turn.
+
+    Returns:
+        tuple. Of the winner, as from HeadlessGame.start(), and an np.ndarray
+          of get_turn_dtype() holding each seat's standing after each turn,
+          under the game's config.
+    """
+
+    resource_types = ResourceType.get_arable_types()
+    structure_names = get_structure_names(game.config_name)
+    structure_counts = dict(
+        (structure['name'], structure['count'])
+        for structure in game.board.structure_configs.values())
+
+    game.initial_settlement_and_road_placement()
+
+    rows = []
+    winner = None
+
+    while winner is None and game.turn_count < max_turns:
+        winner = game.game_loop(game.turn_count + 1)
+
+        for seat, player in enumerate(game.players):
+            rows.append((
+                game.turn_count, seat, player.get_total_points(),
+                [player.resources[resource_type]
+                 for resource_type in resource_types],
+                [structure_counts[name] -
+                 player.remaining_structure_counts[name]
+                 for name in structure_names]))
+
+    return winner, np.array(rows, get_turn_dtype(game.config_name))
+
+
+def iter_results(game_count, agent_classes, configs=None, seed=0,
+                 max_turns=1000, processes=None, chunk_size=16,
+                 record_turns=False):
+    """Play games across a pool of worker processes, yielding each result.
+
+    Results are streamed back from the workers as games finish, in no
+    particular order, so no more than a few are held in memory at once.
+
+    Args:
+        game_count (int): Number of games to play under each config.
+
+        agent_classes (list): Class of each seat's agent, in turn order. Each
+          is constructed with a GameRandom to draw from.
+
+        configs (dict): Config of each rule variant to play under, keyed by
+          name, as compiled by skit. Each is registered with
+          Config.register() in the processes games are played in, under a
+          name of its own, so that variants the caller has registered are
+          left alone. Defaults to game_config alone, under the name
+          'default'.
+
+        seed (int): Root seed. Each game is seeded by a substream of it,
+          so that a simulation can be repeated. The nth game of every config
+          has the same seed, so configs are compared on the same boards and
+          rolls as far as their rules allow.
+
+        max_turns (int): Turns after which a game counts as unfinished.
+
+        processes (int): Number of worker processes. Defaults to the number
+          of CPUs. With 1, games are played in this process, where the
+          configs are then registered as variants until the last result.
+
+        chunk_size (int): Number of games sent to a worker at a time.
+
+        record_turns (bool): Whether to summarize every turn of every game,
+          in each result's turns.
+
+    Yields:
+        GameResult.
+    """
+
+    if configs is None:
+        configs = {'default': game_config}
+
+    variant_names = dict(
+        (config_name, _get_variant_name(config_name, config))
+        for config_name, config in configs.iteritems())
+
+    # Each game's seed depends only on its index, so results don't depend on
+    # which worker happens to play which game.
+    rng = GameRandom(seed)
+    game_keys = ((config_name, rng.spawn('game', index).seed_value)
+                 for config_name in sorted(configs)
+                 for index in xrange(game_count))
+
+    init_args = (list(agent_classes), configs, variant_names, max_turns,
+                 record_turns)
+
+    if processes == 1:
+        registered_names = [variant_name
+                            for variant_name in variant_names.values()
+                            if variant_name not in Config.variants]
+        _init_worker(*init_args)
+
+        try:
+            for game_key in game_keys:
+                yield _play_game(game_key)
+        finally:
+            for variant_name in registered_names:
+                Config.unregister(variant_name)
+
+        return
+
+    pool = multiprocessing.Pool(processes, _init_worker, init_args)
+
+    try:
+        for result in pool.imap_unordered(_play_game, game_keys, chunk_size):
+            yield result
+
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def simulate(game_count, agent_classes, configs=None, seed=0,
+             max_turns=1000, processes=None, chunk_size=16):
+    """Play games across a pool of worker processes and summarize them.
+
+    Games under every config are summarized together. To compare configs,
+    simulate each on its own, or group the results of iter_results() by
+    config_name.
+
+    Args:
+        See iter_results().
+
+    Returns:
+        SimulationSummary.
+    """
+
+    summary = SimulationSummary(len(agent_classes))
+
+    for result in iter_results(game_count, agent_classes, configs, seed,
+                               max_turns, processes, chunk_size):
+        summary.add(result)
+
+    return summary
@@ -1,35 +1,67 @@
 # -*- coding: utf-8 -*-
-from engine.src.config.config import Config
-from engine.src.lib.utils import Utils
+
 
 class Structure(object):
-    """
+    """A structure built by a player.
+
+    Properties of the structure's kind, such as its name and cost, are read
+    from its shared StructureType.
+
     Attributes:
-        owning_player
-        name
-        cost
-        point_value
-        extends
-        upgrades
-    """
+        owning_player (Player): Player who built this structure.
 
-    def __init__(self, owning_player, **kwargs):
+        structure_type (StructureType): The kind of structure this is.
+    """
 
-        # Initialize default values.
-        Config.init_from_config(self, 'game.structure.player_built.default')
+    __slots__ = ('owning_player', 'structure_type')
 
-        # Overwrite default values with custom values.
-        Utils.init_from_dict(self, kwargs)
+    def __init__(self, owning_player, structure_type):
 
         self.owning_player = owning_player
+        self.structure_type = structure_type
+
+    @property
+    def name(self):
+        return self.structure_type.name
+
+    @property
+    def cost(self):
+        return self.structure_type.cost
+
+    @property
+    def point_value(self):
+        return self.structure_type.point_value
+
+    @property
+    def base_yield(self):
+        return self.structure_type.base_yield
+
+    @property
+    def extends(self):
+        return self.structure_type.extends
+
+    @property
+    def upgrades(self):
+        return self.structure_type.upgrades
+
+    @property
+    def position_type(self):
+        return self.structure_type.position_type
+
+    def __getattr__(self, name):
+        # Only reached for properties not defined above, e.g. ones added by a
+        # skit variant. Never delegate special or slot names, which copy and
+        # pickle look up before this structure's slots are filled in.
+        if name.startswith('__') or name in Structure.__slots__:
+            raise AttributeError(name)
+
+        return getattr(self.structure_type, name)
 
     def augments(self):
-        if self.is_augmenting_structure():
-            return self.upgrades if self.upgrades else self.extends
-        return None
+        return self.structure_type.augments()
 
     def is_augmenting_structure(self):
-        return bool(self.extends or self.upgrades)
+        return self.structure_type.is_augmenting_structure()
 
     def __str__(self):
         return '{} owned by {}'.format(self.name, self.owning_player)
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from engine.src.config.config import Config
+from engine.src.lib.utils import Utils
+
+
+class StructureType(object):
+    """A kind of structure players can build, as defined in the config.
+
+    Every structure of a given kind references a shared StructureType, rather
+    than holding its own copy of the config's properties.
+
+    Attributes:
+        name
+        cost
+        count
+        point_value
+        base_yield
+        extends
+        upgrades
+        position_type
+        Any further properties the config defines for this structure.
+
+    Args:
+        **kwargs: Properties of this kind of structure, as given by
+          game.structure.player_built.<structure>. Properties left unspecified
+          take their value from game.structure.player_built.default.
+    """
+
+    def __init__(self, **kwargs):
+
+        # Initialize default values.
+        Config.init_from_config(self, 'game.structure.player_built.default')
+
+        # Overwrite default values with custom values.
+        Utils.init_from_dict(self, kwargs)
+
+    def augments(self):
+        if self.is_augmenting_structure():
+            return self.upgrades if self.upgrades else self.extends
+        return None
+
+    def is_augmenting_structure(self):
+        return bool(self.extends or self.upgrades)
+
+    def __str__(self):
+        return self.name
@@ -7,7 +7,7 @@ from engine.src.structure.structure import Structure
 class GameTile(HexTile):
     """A hex tile as used in a game of Settlers of Catan.
 
-    Args:
+    Attributes:
         resource (ResourceType): The resource/terrain of this hex.
 
         chit_value (int): The value of the chit (i.e. the circular number token)
@@ -15,16 +15,66 @@ class GameTile(HexTile):
 
         calamities (list): A list of calamity objects placed on this tile i.e.
           whose passive effects currently affect this tile.
+
+        board (GameBoard): Board this tile belongs to, if any. Indexes tiles by
+          chit value and calamity, so is notified whenever this tile's
+          resource type, chit value or calamities change.
     """
 
+    __slots__ = ('_resource_type', '_chit_value', 'calamities', 'board')
+
     def __init__(self, x, y,
                  resource_type=ResourceType.FALLOW, chit_value=0):
 
         super(GameTile, self).__init__(x, y)
 
-        self.resource_type = resource_type
-        self.chit_value = chit_value
+        self.board = None
         self.calamities = []
+        self._resource_type = resource_type
+        self._chit_value = chit_value
+
+    @property
+    def resource_type(self):
+        return self._resource_type
+
+    @resource_type.setter
+    def resource_type(self, resource_type):
+        if self.board is not None:
+            self.board.unindex_tile(self)
+
+        self._resource_type = resource_type
+
+        if self.board is not None:
+            self.board.index_tile(self)
+
+    @property
+    def chit_value(self):
+        return self._chit_value
+
+    @chit_value.setter
+    def chit_value(self, chit_value):
+        if self.board is not None:
+            self.board.unindex_tile(self)
+
+        self._chit_value = chit_value
+
+        if self.board is not None:
+            self.board.index_tile(self)
+
+    def snapshot(self):
+        """Capture this tile's resource type, chit value and calamities."""
+
+        return self._resource_type, self._chit_value, tuple(self.calamities)
+
+    def restore(self, snapshot):
+        """Return to the state captured by snapshot().
+
+        Unlike setting resource_type or chit_value, doesn't notify the board,
+        which is expected to restore its own indexes.
+        """
+
+        self._resource_type, self._chit_value, calamities = snapshot
+        self.calamities = list(calamities)
 
     def __str__(self):
         return '({0}, {1}) {2} {3}'.format(self.x, self.y,
@@ -54,6 +104,9 @@ class GameTile(HexTile):
             self.calamities
         )
 
+        if self.board is not None:
+            self.board.unregister_calamity(self, calamity)
+
     def add_calamity(self, calamity):
         """Add a calamity to this tile.
 
@@ -71,6 +124,10 @@ class GameTile(HexTile):
             return False
         else:
             self.calamities.append(calamity)
+
+            if self.board is not None:
+                self.board.register_calamity(self, calamity)
+
             return True
 
     def get_calamity_tile_placement_effects(self):
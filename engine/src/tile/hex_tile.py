@@ -30,6 +30,8 @@ class HexTile(Tile):
     TODO: x and y are mostly here for testing purposes. Removable.
     """
 
+    __slots__ = ('x', 'y', 'vertices', 'edges')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
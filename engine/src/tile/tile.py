@@ -2,4 +2,4 @@
 
 
 class Tile(object):
-    pass
+    __slots__ = ()
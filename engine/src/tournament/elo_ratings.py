@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+
+class EloRatings(object):
+    """Elo ratings, updated a multiplayer game at a time.
+
+    A game between n players counts as a game between each pair of them,
+    won by whoever placed higher, with each pairing's update scaled down by
+    n - 1 so that a game moves a rating about as far as a two player game
+    would. Ratings gained and lost in a game always add up to 0.
+
+    Attributes:
+        ratings (dict): Rating of each player, keyed by name.
+
+        game_counts (dict): Number of games rated, per player.
+
+        initial_rating (float): Rating of players before their first game.
+
+        k_factor (float): Largest change of rating in a two player game.
+
+    Args:
+        names (list): Names of the players to rate.
+
+        initial_rating, k_factor (float): See above.
+    """
+
+    def __init__(self, names, initial_rating=1500.0, k_factor=32.0):
+
+        self.initial_rating = initial_rating
+        self.k_factor = k_factor
+
+        self.ratings = dict((name, initial_rating) for name in names)
+        self.game_counts = dict((name, 0) for name in names)
+
+    def get_expected_score(self, name, other_name):
+        """Get the chance of name placing above other_name, going by their
+        ratings, counting a tie as half."""
+
+        return 1 / (1 + 10 ** ((self.ratings[other_name] -
+                                self.ratings[name]) / 400.0))
+
+    def update(self, scores):
+        """Rate a game.
+
+        Args:
+            scores (list): Of (name, score) tuples, one per player, where
+              a higher score places higher. Scores may be anything
+              comparable, e.g. (won, points) tuples.
+        """
+
+        if len(scores) < 2:
+            return
+
+        k_factor = self.k_factor / (len(scores) - 1)
+        deltas = dict((name, 0.0) for name, _ in scores)
+
+        for index, (name, score) in enumerate(scores):
+            for other_name, other_score in scores[index + 1:]:
+                if score > other_score:
+                    actual = 1.0
+                elif score < other_score:
+                    actual = 0.0
+                else:
+                    actual = 0.5
+
+                delta = k_factor * (
+                    actual - self.get_expected_score(name, other_name))
+
+                deltas[name] += delta
+                deltas[other_name] -= delta
+
+        for name, delta in deltas.iteritems():
+            self.ratings[name] += delta
+            self.game_counts[name] += 1
+
+    def get_rankings(self):
+        """Get every player's name and rating, best rated first."""
+
+        return sorted(self.ratings.iteritems(),
+                      key=lambda item: (-item[1], item[0]))
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+import itertools
+import json
+import multiprocessing
+import os
+from collections import namedtuple
+
+from engine.src.config.config import Config
+from engine.src.config.game_config import game_config
+from engine.src.lib.game_random import GameRandom
+from engine.src.headless_game import HeadlessGame
+from engine.src.tournament.elo_ratings import EloRatings
+
+
+# A game to be played. entrants are the names of the entrants at each seat,
+# in turn order. Every seat rotation of the same entrants in the same round
+# shares a seed, and so a board, so that no entrant is favoured by the luck
+# of the layout.
+Match = namedtuple('Match', [
+    'index', 'config_name', 'digest', 'entrants', 'seed'
+])
+
+# Outcome of a Match. Seats are as in the match's entrants, and winner is
+# None if nobody won before running out of turns.
+MatchResult = namedtuple('MatchResult', [
+    'index', 'winner', 'points', 'turn_count'
+])
+
+
+# Set by _init_worker() in each worker process. See simulation.py.
+_worker_state = {}
+
+
+def _init_worker(entrants, configs, max_turns):
+    """Remember what every match is played with, and register each config
+    as a variant, so that matches under any of them can follow each other
+    without reloading.
+
+    Args:
+        configs (dict): Config of each variant, keyed by the name to register
+          it under.
+    """
+
+    _worker_state['entrants'] = entrants
+    _worker_state['max_turns'] = max_turns
+
+    for variant_name, config in configs.iteritems():
+        if variant_name not in Config.variants:
+            Config.register(variant_name, config)
+
+
+def _play_match(match):
+    """Play a match under its config.
+
+    Returns:
+        MatchResult.
+    """
+
+    rng = GameRandom(match.seed)
+
+    agents = [_worker_state['entrants'][name](rng.spawn('agent', seat))
+              for seat, name in enumerate(match.entrants)]
+
+    game = HeadlessGame(agents, player_names=list(match.entrants),
+                        seed=match.seed,
+                        config=Tournament.get_variant_name(match.config_name,
+                                                           match.digest))
+    winner = game.start(_worker_state['max_turns'])
+
+    return MatchResult(
+        match.index,
+        game.players.index(winner) if winner is not None else None,
+        tuple(player.get_total_points() for player in game.players),
+        game.turn_count)
+
+
+class Tournament(object):
+    """A round-robin tournament between agents, under one or more configs.
+
+    Under each config, every combination of player_count entrants plays
+    rounds matches in every seat rotation. Entrants are rated by Elo under
+    each config, see EloRatings, as results come in, with winning first and
+    points second deciding who placed above whom.
+
+    Results are checkpointed to a file as they come in, so that running an
+    interrupted tournament again picks up where it left off, without
+    replaying finished matches. Matches are rated in the order they are
+    scheduled whatever order workers finish them in, so ratings don't depend
+    on how the tournament was split across processes or runs.
+
+    Attributes:
+        entrants (dict): Agent class of each entrant, keyed by name. Each is
+          constructed with a GameRandom to draw from.
+
+        configs (dict): Config of each rule variant, keyed by name, as
+          compiled by skit. Each is registered with Config.register() in the
+          processes matches are played in, under a name of its own, see
+          get_variant_name(), so that variants the caller has registered
+          are left alone.
+
+        config_digests (dict): Digest of the contents of each config, keyed
+          by name.
+
+        player_count (int): Number of seats at each match.
+
+        matches (list): Every Match, in the order they are rated.
+
+        results (list): MatchResult of each match played so far, in order.
+
+        ratings (dict): EloRatings of the entrants, keyed by config name.
+
+        checkpoint_path (str): File results are saved to, if any.
+
+    Args:
+        entrants (dict): See above.
+
+        configs (dict): See above. Defaults to game_config alone, under the
+          name 'default'.
+
+        player_count (int): See above.
+
+        rounds (int): Number of times each combination of entrants plays in
+          each seat rotation.
+
+        seed (int): Root seed, from which each match's seed is derived.
+
+        max_turns (int): Turns after which a match is unfinished, in which
+          case points alone decide who placed above whom.
+
+        k_factor (float): See EloRatings.
+
+        checkpoint_path (str): See above. If the file exists, its results are
+          loaded, as long as it was saved by a tournament of the same
+          entrants, configs, player count, rounds, seed and max turns.
+    """
+
+    CHECKPOINT_VERSION = 2
+
+    def __init__(self, entrants, configs=None, player_count=3, rounds=1,
+                 seed=0, max_turns=1000, k_factor=32.0,
+                 checkpoint_path=None):
+
+        if configs is None:
+            configs = {'default': game_config}
+
+        if len(entrants) < player_count:
+            raise ValueError('{0} entrants can not fill {1} seats.'.format(
+                len(entrants), player_count))
+
+        self.entrants = dict(entrants)
+        self.configs = dict(configs)
+        self.config_digests = dict(
+            (config_name, Config.get_digest(config))
+            for config_name, config in self.configs.iteritems())
+        self.player_count = player_count
+        self.rounds = rounds
+        self.seed = seed
+        self.max_turns = max_turns
+        self.k_factor = k_factor
+        self.checkpoint_path = checkpoint_path
+
+        self.matches = self._schedule()
+        self.results = []
+        self.ratings = dict(
+            (config_name, EloRatings(self.entrants, k_factor=k_factor))
+            for config_name in self.configs)
+
+        if checkpoint_path is not None and os.path.exists(checkpoint_path):
+            self._load_checkpoint()
+
+    def _schedule(self):
+        """List every match, grouped by config."""
+
+        rng = GameRandom(self.seed)
+        matches = []
+
+        for config_name in sorted(self.configs):
+            for round_index in range(self.rounds):
+                for entrants in itertools.combinations(
+                        sorted(self.entrants), self.player_count):
+                    seed = rng.spawn('match', config_name, round_index,
+                                     entrants).seed_value
+
+                    for rotation in range(self.player_count):
+                        matches.append(Match(
+                            len(matches), config_name,
+                            self.config_digests[config_name],
+                            entrants[rotation:] + entrants[:rotation],
+                            seed))
+
+        return matches
+
+    def run(self, processes=None, chunk_size=1, checkpoint_interval=16,
+            max_matches=None):
+        """Play the matches not played yet, rating them as they finish.
+
+        Args:
+            processes (int): Number of worker processes. Defaults to the
+              number of CPUs. With 1, matches are played in this process,
+              where the configs are then registered as variants, see
+              configs, until the run ends.
+
+            chunk_size (int): Number of matches sent to a worker at a time.
+
+            checkpoint_interval (int): Number of results after which to save
+              a checkpoint, if there's a checkpoint path. One is always saved
+              when the run ends, however it ends.
+
+            max_matches (int): Stop after playing this many, if given.
+
+        Returns:
+            dict. See ratings.
+        """
+
+        finished_indices = set(result.index for result in self.results)
+        matches = [match for match in self.matches
+                   if match.index not in finished_indices]
+
+        if max_matches is not None:
+            matches = matches[:max_matches]
+
+        if not matches:
+            return self.ratings
+
+        variants = dict(
+            (Tournament.get_variant_name(config_name,
+                                         self.config_digests[config_name]),
+             config) for config_name, config in self.configs.iteritems())
+        init_args = (self.entrants, variants, self.max_turns)
+
+        # Variants registered in this process, to be unregistered once done.
+        registered_names = []
+
+        if processes == 1:
+            registered_names = [variant_name for variant_name in variants
+                                if variant_name not in Config.variants]
+            _init_worker(*init_args)
+            pool = None
+            results = itertools.imap(_play_match, matches)
+        else:
+            pool = multiprocessing.Pool(processes, _init_worker, init_args)
+            # Ordered, so that matches are rated in the order scheduled.
+            results = pool.imap(_play_match, matches, chunk_size)
+
+        try:
+            for count, result in enumerate(results, 1):
+                self.add_result(result)
+
+                if count % checkpoint_interval == 0:
+                    self.save_checkpoint()
+
+            if pool is not None:
+                pool.close()
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+            for variant_name in registered_names:
+                Config.unregister(variant_name)
+
+            self.save_checkpoint()
+
+        return self.ratings
+
+    @staticmethod
+    def get_variant_name(config_name, digest):
+        """Get the name a config is registered under for matches.
+
+        The digest of its contents is part of the name, so a variant of the
+        same name registered by anyone else is never overwritten, and one
+        registered by an earlier tournament is only reused if the same.
+        """
+
+        return 'tournament:{0}:{1}'.format(config_name, digest)
+
+    def add_result(self, result):
+        """Record a MatchResult and rate it."""
+
+        match = self.matches[result.index]
+
+        self.results.append(result)
+
+        self.ratings[match.config_name].update([
+            (name, (seat == result.winner, points))
+            for seat, (name, points) in
+            enumerate(zip(match.entrants, result.points))
+        ])
+
+    def get_win_counts(self, config_name):
+        """Get the number of matches each entrant has won under a config."""
+
+        win_counts = dict((name, 0) for name in self.entrants)
+
+        for result in self.results:
+            match = self.matches[result.index]
+
+            if match.config_name == config_name and \
+                    result.winner is not None:
+                win_counts[match.entrants[result.winner]] += 1
+
+        return win_counts
+
+    def _get_checkpoint_key(self):
+        """Get what a checkpoint must match to be resumed from."""
+
+        return {
+            'version': Tournament.CHECKPOINT_VERSION,
+            'entrants': sorted(self.entrants),
+            'configs': self.config_digests,
+            'player_count': self.player_count,
+            'rounds': self.rounds,
+            'seed': self.seed,
+            'max_turns': self.max_turns
+        }
+
+    def save_checkpoint(self):
+        """Save the results so far, if there's a checkpoint path."""
+
+        if self.checkpoint_path is None:
+            return
+
+        checkpoint = self._get_checkpoint_key()
+        checkpoint['results'] = [list(result) for result in self.results]
+
+        # Replaced in one go, so an interruption never leaves half a file.
+        with open(self.checkpoint_path + '.tmp', 'w') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+
+        os.rename(self.checkpoint_path + '.tmp', self.checkpoint_path)
+
+    def _load_checkpoint(self):
+        """Load and rate the results saved by save_checkpoint().
+
+        Raises:
+            ValueError. If the checkpoint is of another tournament.
+        """
+
+        with open(self.checkpoint_path) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+
+        results = checkpoint.pop('results')
+
+        if checkpoint != self._get_checkpoint_key():
+            raise ValueError('{0} is a checkpoint of another tournament.'
+                             .format(self.checkpoint_path))
+
+        for index, winner, points, turn_count in results:
+            self.add_result(MatchResult(index, winner, tuple(points),
+                                        turn_count))
@@ -2,6 +2,7 @@
 import random
 
 from engine.src.config.config import Config
+from engine.src.lib.zobrist import Zobrist
 from engine.src.trading.trading_entity import TradingEntity
 from engine.src.trading.trade_offer import TradeOffer
 from engine.src.exceptions import *
@@ -16,12 +17,18 @@ class Bank(TradingEntity):
 
         development_cards (list): A list of different development card objects.
 
+        deck_hash (int): Zobrist hash of the development cards remaining, in
+          order, kept up to date as cards are bought.
+
     Args:
         tile_count (int): Number of tiles for the board this bank will be used
           with.
+
+        rng (random.Random): Shuffles the development cards. Defaults to the
+          random module.
     """
 
-    def __init__(self, tile_count=None):
+    def __init__(self, tile_count=None, rng=None):
         if tile_count is None:
             tile_count = Config.get('game.board.tile_count')
 
@@ -29,7 +36,7 @@ class Bank(TradingEntity):
 
         self.development_cards = []
 
-        self._default_init_development_cards()
+        self._default_init_development_cards(rng)
         self._default_init_resources(tile_count)
 
     def _default_init_resources(self, tile_count):
@@ -50,9 +57,12 @@ class Bank(TradingEntity):
 
         super(Bank, self)._default_init_resources(tile_count)
 
-    def _default_init_development_cards(self):
+    def _default_init_development_cards(self, rng=None):
         """Add a configured number of each development card type to the bank."""
 
+        if rng is None:
+            rng = random
+
         dev_card_dict = Config.get('game.card.development')
 
         for name, card in dev_card_dict.iteritems():
@@ -60,7 +70,37 @@ class Bank(TradingEntity):
                 dev_card = DevelopmentCard(**card)
                 self.development_cards.append(dev_card)
 
-        random.shuffle(self.development_cards)
+        rng.shuffle(self.development_cards)
+
+        self.rehash_development_cards()
+
+    @staticmethod
+    def _get_card_key(position, card):
+        return Zobrist.key('deck', position, card.name)
+
+    def rehash_development_cards(self):
+        """Recompute deck_hash, after development_cards is replaced."""
+
+        self.deck_hash = 0
+
+        for position, card in enumerate(self.development_cards):
+            self.deck_hash ^= Bank._get_card_key(position, card)
+
+    def snapshot(self):
+        """Capture this bank's resources and development card deck."""
+
+        return dict(self.resources), tuple(self.development_cards)
+
+    def restore(self, snapshot):
+        """Return to the state captured by snapshot()."""
+
+        resources, development_cards = snapshot
+
+        self.resources = dict(resources)
+        self.rehash_resources()
+
+        self.development_cards = list(development_cards)
+        self.rehash_development_cards()
 
     def buy_development_card(self, player):
         """Let the given player purchase a development card from the bank."""
@@ -69,6 +109,7 @@ class Bank(TradingEntity):
             raise NotEnoughDevelopmentCardsException
 
         card = self.development_cards.pop()
+        self.deck_hash ^= Bank._get_card_key(len(self.development_cards), card)
 
         # Create a trade offer where there are no requested resources,
         # just offered resources (cost of development card).
@@ -85,5 +126,7 @@ class Bank(TradingEntity):
             return card
         # Otherwise, return the development card to the deck.
         else:
+            self.deck_hash ^= Bank._get_card_key(len(self.development_cards),
+                                                 card)
             self.development_cards.append(card)
             raise NotEnoughResourcesException(obstructing_entity, obstructing_resource_type)
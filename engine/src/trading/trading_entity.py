@@ -2,6 +2,7 @@
 import random
 from collections import Counter
 from engine.src.lib.utils import Utils
+from engine.src.lib.zobrist import Zobrist
 from engine.src.exceptions import NotEnoughResourcesException
 from engine.src.resource_type import ResourceType
 from engine.src.trading.trade_offer import TradeOffer
@@ -15,10 +16,16 @@ class TradingEntity(object):
           entity. Keys are arable ResourceTypes and values are integers
           representing the amount of a particular resource type the entity has.
 
+        zobrist_hash (int): Zobrist hash of this entity's resource counts,
+          kept up to date as resources are deposited and withdrawn.
+
     TODO: This should be an abstract class.
     """
 
+    __slots__ = ('resources', 'zobrist_hash', 'event_log')
+
     def __init__(self):
+        self.event_log = None
         self.resources = {}
         # TODO: Freak error where Python isn't recognizing default arg.
         self._default_init_resources(0)
@@ -37,6 +44,37 @@ class TradingEntity(object):
         for arable_type in ResourceType.get_arable_types():
             self.resources[arable_type] = count
 
+        self.rehash_resources()
+
+    def get_zobrist_name(self):
+        """Get the name identifying this entity in Zobrist hash features."""
+
+        return type(self).__name__
+
+    def _get_resource_key(self, resource_type, count):
+        return Zobrist.key('resources', self.get_zobrist_name(),
+                           resource_type.value, count)
+
+    def rehash_resources(self):
+        """Recompute zobrist_hash, after resources is replaced wholesale."""
+
+        self.zobrist_hash = 0
+
+        for resource_type, count in self.resources.iteritems():
+            self.zobrist_hash ^= self._get_resource_key(resource_type, count)
+
+    def _set_resource_count(self, resource_type, count):
+
+        self.zobrist_hash ^= \
+            self._get_resource_key(resource_type,
+                                   self.resources[resource_type]) ^ \
+            self._get_resource_key(resource_type, count)
+
+        self.resources[resource_type] = count
+
+        if self.event_log is not None:
+            self.event_log.log_resource_count(self, resource_type, count)
+
     def count_resources(self):
         return sum(self.resources.values())
 
@@ -96,23 +134,32 @@ class TradingEntity(object):
             return
 
         if self.resources[resource_type] >= resource_count:
-            self.resources[resource_type] -= resource_count
+            self._set_resource_count(
+                resource_type, self.resources[resource_type] - resource_count)
         else:
             raise NotEnoughResourcesException(self, resource_type)
 
-    def withdraw_random_resource(self):
+    def withdraw_random_resource(self, rng=None):
         """Remove a random resource from this trading entity.
 
         Note that this method only withdraws a single random resource.
         Callers of this method should check to make sure that this entity
         still has resources using self.count_resources().
+
+        Args:
+            rng (random.Random): Source of randomness. Defaults to the random
+              module.
         """
 
+        if rng is None:
+            rng = random
+
         resources = self.get_resource_list()
 
-        resource_type = random.choice(resources)
+        resource_type = rng.choice(resources)
 
-        self.resources[resource_type] -= 1
+        self._set_resource_count(resource_type,
+                                 self.resources[resource_type] - 1)
 
         return resource_type
 
@@ -132,7 +179,8 @@ class TradingEntity(object):
         """
 
         if resource_type != ResourceType.FALLOW:
-            self.resources[resource_type] += resource_count
+            self._set_resource_count(
+                resource_type, self.resources[resource_type] + resource_count)
 
     def trade(self, requesting_entity, trade_offer):
         """Trade one resource for another at a given ratio.
@@ -159,3 +207,6 @@ class TradingEntity(object):
 
         else:
             trade_offer.execute(requesting_entity, self)
+
+            if self.event_log is not None:
+                self.event_log.log_trade(requesting_entity, self)
@@ -4,3 +4,5 @@ from abc import ABCMeta
 
 class Vertex(object):
     __metaclass__ = ABCMeta
+
+    __slots__ = ()
@@ -0,0 +1,51 @@
+import copy
+import os
+import sys
+
+# Add engine package to Python path, as in start.py.
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+sys.path.insert(1, ROOT_PATH)
+
+from engine.src.config.config import Config
+from engine.src.config.game_config import game_config
+
+
+def init_default_config():
+    """Load the engine's default game_config, as skit would a compiled one."""
+
+    Config.config = copy.deepcopy(game_config)
+    Config.init()
+
+
+# Configs compiled by compile_skit_config(), keyed by name.
+_skit_configs = {}
+
+
+def compile_skit_config(name):
+    """Compile a skit variant of config_parser/test, as skit -c does.
+
+    Args:
+        name (str): Name of the variant, e.g. 'more-points'.
+
+    Returns:
+        dict. The variant's config, as skit's run() would load it.
+    """
+
+    if name not in _skit_configs:
+        # skit compiles from, and into, paths relative to config_parser, and
+        # its parser tables are written there too.
+        cwd = os.getcwd()
+        os.chdir(os.path.join(ROOT_PATH, 'config_parser'))
+
+        try:
+            from config_parser import skit
+
+            skit.compile('default.skit')
+            _skit_configs[name] = skit.compile(
+                os.path.join('test', name + '.skit'))[0].get(name)
+        finally:
+            os.chdir(cwd)
+
+    return copy.deepcopy(_skit_configs[name])
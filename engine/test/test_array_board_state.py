@@ -0,0 +1,148 @@
+import random
+import unittest
+
+import numpy as np
+
+from . import init_default_config
+from engine.src.board.game_board import GameBoard
+from engine.src.board.array_board_state import ArrayBoardState
+from engine.src.calamity.robber import Robber
+from engine.src.player import Player
+from engine.src.resource_type import ResourceType
+from engine.src.direction.edge_direction import EdgeDirection
+from engine.src.exceptions import *
+
+
+class ArrayBoardStateTests(unittest.TestCase):
+
+    def setUp(self):
+        init_default_config()
+        self.board = GameBoard(3)
+        self.players = [Player('p1'), Player('p2'), Player('p3')]
+
+        self.robber = Robber()
+        self.board.get_tile_of_resource_type(ResourceType.FALLOW)\
+            .add_calamity(self.robber)
+
+        self.state = ArrayBoardState.attach(self.board, self.players)
+
+    def make_random_move(self, rng):
+        """Place a structure, swap two tiles or move the robber at random."""
+
+        topology = self.board.topology
+        player = rng.choice(self.players)
+        action = rng.random()
+
+        if action < 0.1:
+            self.board.find_tile_with_calamity(self.robber)\
+                .remove_calamity(self.robber)
+            rng.choice(list(self.board.iter_tiles())).add_calamity(self.robber)
+        elif action < 0.2:
+            tile, other_tile = rng.sample(list(self.board.iter_tiles()), 2)
+            tile.resource_type, other_tile.resource_type = \
+                other_tile.resource_type, tile.resource_type
+            tile.chit_value, other_tile.chit_value = \
+                other_tile.chit_value, tile.chit_value
+        elif action < 0.6:
+            x, y, edge_dir = rng.choice(topology.edge_locations)[0]
+
+            try:
+                self.board.place_edge_structure(
+                    x, y, edge_dir, player.get_structure('Road'), False)
+            except (BoardPositionOccupiedException,
+                    InvalidBaseStructureException,
+                    InvalidStructurePlacementException,
+                    NotEnoughStructuresException):
+                pass
+        else:
+            x, y, vertex_dir = rng.choice(topology.vertex_locations)[0]
+            structure_name = rng.choice(['Settlement', 'City'])
+
+            try:
+                self.board.place_vertex_structure(
+                    x, y, vertex_dir, player.get_structure(structure_name),
+                    False)
+            except (BoardPositionOccupiedException,
+                    InvalidBaseStructureException,
+                    InvalidStructurePlacementException,
+                    NotEnoughStructuresException):
+                pass
+
+    def get_board_production(self, roll_value):
+        """Convert the board's production for a roll into an array."""
+
+        production = np.zeros((len(self.players),
+                               len(ResourceType.get_arable_types())), int)
+
+        for player, resources in \
+                self.board.production.get(roll_value, {}).iteritems():
+            for resource_type, count in resources.iteritems():
+                production[self.players.index(player),
+                           ArrayBoardState.RESOURCE_TYPES.index(
+                               resource_type)] += count
+
+        return production
+
+    def test_mirrors_board(self):
+        rng = random.Random(0)
+
+        for _ in range(80):
+            self.make_random_move(rng)
+
+            production_table = self.state.get_production_table()
+
+            for roll_value in range(2, 13):
+                self.assertEqual(
+                    self.state.get_production(roll_value).tolist(),
+                    self.get_board_production(roll_value).tolist())
+                self.assertEqual(
+                    production_table[roll_value].tolist(),
+                    self.get_board_production(roll_value).tolist())
+
+            for player in self.players:
+                for must_border_claimed_edge in [True, False]:
+                    self.assertEqual(
+                        tuple(np.flatnonzero(
+                            self.state.get_edge_placement_mask(
+                                player, 'Road', must_border_claimed_edge))),
+                        self.board.legal_placement_ids(
+                            player, 'Road', must_border_claimed_edge))
+
+                    for structure_name in ['Settlement', 'City']:
+                        self.assertEqual(
+                            tuple(np.flatnonzero(
+                                self.state.get_vertex_placement_mask(
+                                    player, structure_name,
+                                    must_border_claimed_edge))),
+                            self.board.legal_placement_ids(
+                                player, structure_name,
+                                must_border_claimed_edge))
+
+    def test_vertex_scores(self):
+        pips = ArrayBoardState.get_pips()
+
+        self.assertEqual(pips.tolist(),
+                         [0, 0, 1, 2, 3, 4, 5, 6, 5, 4, 3, 2, 1])
+
+        scores = self.state.get_vertex_scores()
+
+        for vertex_id, tile_ids in \
+                enumerate(self.board.topology.vertex_tiles):
+            tiles = [self.board.tiles_by_id[tile_id] for tile_id in tile_ids]
+
+            self.assertEqual(scores[vertex_id], sum(
+                pips[tile.chit_value] for tile in tiles
+                if tile.resource_type != ResourceType.FALLOW and
+                tile not in self.board.blocked_tiles))
+
+    def test_copy_is_independent(self):
+        player = self.players[0]
+        state_copy = self.state.copy()
+
+        self.board.place_edge_structure(
+            0, 0, EdgeDirection.EAST, player.get_structure('Road'), False)
+
+        edge_id = self.board.get_edge_id(0, 0, EdgeDirection.EAST)
+
+        self.assertEqual(self.state.edge_owners[edge_id], 0)
+        self.assertEqual(state_copy.edge_owners[edge_id], -1)
@@ -0,0 +1,123 @@
+import unittest
+
+import numpy as np
+
+from . import init_default_config
+from engine.src.env.batch_game import BatchGame
+from engine.src.exceptions import *
+
+
+class BatchGameTests(unittest.TestCase):
+
+    def setUp(self):
+        init_default_config()
+        self.batch = BatchGame(16, seed=0, max_turns=300)
+        self.initial_bank = self.batch.bank.copy()
+
+    def check_consistency(self):
+        batch = self.batch
+
+        self.assertTrue((batch.hands >= 0).all())
+        self.assertTrue((batch.bank >= 0).all())
+        self.assertEqual((batch.hands.sum(1) + batch.bank).tolist(),
+                         self.initial_bank.tolist())
+
+        for seat in range(batch.player_count):
+            vertex_points = np.where(
+                batch.vertex_owners == seat,
+                batch.structure_point_values[batch.vertex_structures],
+                0).sum(1)
+
+            self.assertEqual(batch.points[:, seat].tolist(),
+                             vertex_points.tolist())
+
+            placed = np.concatenate([
+                np.where(batch.vertex_owners == seat,
+                         batch.vertex_structures, 0),
+                np.where(batch.edge_owners == seat, batch.edge_structures, 0)
+            ], 1)
+
+            # Upgrading doesn't return the structure upgraded to stock.
+            for code in range(1, len(batch.structure_counts)):
+                self.assertTrue((
+                    batch.remaining_structures[:, seat, code] +
+                    (placed == code).sum(1) <=
+                    batch.structure_counts[code]).all())
+
+    def test_games_play_out(self):
+        batch = self.batch
+        while not batch.done.all():
+            mask = batch.get_action_mask()
+
+            self.assertTrue(mask[~batch.done].any(1).all())
+            self.assertFalse(mask[batch.done].any())
+
+            batch.step(batch.sample_actions())
+            self.check_consistency()
+
+        won = batch.winner >= 0
+
+        self.assertTrue(won.any())
+        self.assertTrue((batch.points[won, batch.winner[won]] >=
+                         batch.points_to_win).all())
+        self.assertTrue((batch.turn_count[~won] == batch.max_turns).all())
+
+        observations = batch.get_observations()
+
+        self.assertEqual(observations['decision'].tolist(),
+                         [-1] * batch.batch_size)
+
+        batch.reset([0, 1])
+
+        self.assertEqual(batch.done.tolist(),
+                         [False, False] + [True] * (batch.batch_size - 2))
+
+    def test_initial_placement(self):
+        batch = self.batch
+        action_space = batch.action_space
+        settlement_offset = action_space.build_offsets['Settlement']
+        vertex_count = batch.vertex_owners.shape[1]
+
+        mask = batch.get_action_mask()
+
+        self.assertTrue(mask[:, settlement_offset:
+                             settlement_offset + vertex_count].all())
+        self.assertEqual(mask.sum(1).tolist(),
+                         [vertex_count] * batch.batch_size)
+
+        batch.step(np.full(batch.batch_size, settlement_offset))
+
+        self.assertEqual(batch.phase.tolist(),
+                         [BatchGame.INITIAL_ROAD] * batch.batch_size)
+
+        # Only the roads touching the settlement are legal.
+        edge_ids = batch.rules.topology.vertex_edges[0]
+        road_offset = action_space.build_offsets['Road']
+
+        self.assertEqual(
+            np.flatnonzero(batch.get_action_mask()[0]).tolist(),
+            sorted(road_offset + edge_id for edge_id in edge_ids))
+
+    def test_illegal_action(self):
+        batch = self.batch
+        vertex_owners = batch.vertex_owners.copy()
+
+        with self.assertRaises(IllegalActionException):
+            batch.step(np.full(batch.batch_size,
+                               batch.action_space.end_turn_id))
+
+        self.assertEqual(batch.vertex_owners.tolist(), vertex_owners.tolist())
+
+    def test_seed_reproduces_games(self):
+        other_batch = BatchGame(16, seed=0, max_turns=300)
+
+        for _ in range(200):
+            actions = self.batch.sample_actions(np.random.RandomState(1))
+
+            self.batch.step(actions)
+            other_batch.step(actions)
+
+        for name in ['tile_resources', 'tile_chits', 'vertex_structures',
+                     'edge_owners', 'hands', 'bank', 'points']:
+            self.assertEqual(getattr(self.batch, name).tolist(),
+                             getattr(other_batch, name).tolist())
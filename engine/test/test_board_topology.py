@@ -0,0 +1,120 @@
+import unittest
+
+from . import init_default_config
+from engine.src.board.hex_board import HexBoard
+from engine.src.board.game_board import GameBoard
+from engine.src.direction.edge_direction import EdgeDirection
+from engine.src.direction.vertex_direction import VertexDirection
+from engine.src.vertex import Vertex
+from engine.src.player import Player
+from engine.src.exceptions import InvalidStructurePlacementException
+
+
+class BoardTopologyTests(unittest.TestCase):
+
+    def setUp(self):
+        self.board = HexBoard(3)
+        self.topology = self.board.topology
+
+    def test_counts(self):
+        self.assertEqual(self.topology.tile_count, 19)
+        self.assertEqual(self.topology.vertex_count, 54)
+        self.assertEqual(self.topology.edge_count, 72)
+
+    def test_single_tile_counts(self):
+        topology = HexBoard(1).topology
+
+        self.assertEqual(topology.vertex_count, 6)
+        self.assertEqual(topology.edge_count, 6)
+        self.assertTrue(all(len(tiles) == 1 for tiles in topology.vertex_tiles))
+
+    def test_ids_match_shared_tile_objects(self):
+        for tile_id, (x, y) in enumerate(self.topology.tile_coords):
+            tile = self.board.get_tile_with_coords(x, y)
+
+            for index, vertex_dir in enumerate(VertexDirection):
+                vertex_id = self.topology.tile_vertices[tile_id][index]
+                self.assertIs(tile.get_vertex(vertex_dir),
+                              self.board.vertex_vals[vertex_id])
+
+            for index, edge_dir in enumerate(EdgeDirection):
+                edge_id = self.topology.tile_edges[tile_id][index]
+                self.assertIs(tile.get_edge(edge_dir),
+                              self.board.edge_vals[edge_id])
+
+    def test_adjacency_is_symmetric(self):
+        topology = self.topology
+
+        for vertex_id, neighbors in enumerate(topology.vertex_vertices):
+            self.assertIn(len(neighbors), (2, 3))
+            self.assertEqual(len(neighbors),
+                             len(topology.vertex_edges[vertex_id]))
+
+            for neighbor_id in neighbors:
+                self.assertIn(vertex_id, topology.vertex_vertices[neighbor_id])
+
+        for edge_id, (start_id, end_id) in enumerate(topology.edge_vertices):
+            self.assertIn(edge_id, topology.vertex_edges[start_id])
+            self.assertIn(edge_id, topology.vertex_edges[end_id])
+
+            for adjacent_id in topology.edge_edges[edge_id]:
+                self.assertIn(edge_id, topology.edge_edges[adjacent_id])
+
+    def test_update_vertex_reaches_every_tile(self):
+        vertex = Vertex()
+        self.board.update_vertex(0, 0, VertexDirection.TOP, vertex)
+
+        tiles = self.board.get_adjacent_tiles_to_vertex(
+            0, 0, VertexDirection.TOP)
+
+        self.assertEqual(len(tiles), 3)
+        self.assertEqual(sum(1 for tile in tiles
+                             if vertex in tile.vertices.values()), 3)
+
+    def test_perimeter_vertex_edges(self):
+        # The westernmost tile's top vertex has no north western neighbor,
+        # but the edge leading away from the board still exists on its
+        # north eastern neighbor.
+        x, y = -2, 0
+        edges = self.board.get_adjacent_edges_to_vertex(
+            x, y, VertexDirection.TOP)
+        tiles = self.board.get_adjacent_tiles_to_vertex(
+            x, y, VertexDirection.TOP)
+
+        self.assertEqual(len(tiles), 2)
+        self.assertEqual(len(edges), 3)
+
+
+class GameBoardPlacementTests(unittest.TestCase):
+
+    def setUp(self):
+        init_default_config()
+        self.board = GameBoard(3)
+        self.player = Player('p1')
+
+    def test_distance_rule(self):
+        self.board.place_vertex_structure(
+            0, 0, VertexDirection.TOP,
+            self.player.get_structure('Settlement'), False)
+
+        # The neighboring tile's bottom vertex is one edge away.
+        self.assertRaises(
+            InvalidStructurePlacementException,
+            self.board.place_vertex_structure, -1, 1, VertexDirection.BOTTOM,
+            self.player.get_structure('Settlement'), False)
+
+    def test_initial_road_must_border_settlement(self):
+        self.board.place_vertex_structure(
+            0, 0, VertexDirection.TOP,
+            self.player.get_structure('Settlement'), False)
+
+        self.assertRaises(
+            InvalidStructurePlacementException,
+            self.board.place_edge_structure, 0, 0, EdgeDirection.EAST,
+            self.player.get_structure('Road'), False,
+            0, 0, VertexDirection.TOP)
+
+        # The same edge, addressed from the neighboring tile, is allowed.
+        self.board.place_edge_structure(
+            -1, 1, EdgeDirection.EAST, self.player.get_structure('Road'),
+            False, 0, 0, VertexDirection.TOP)
@@ -0,0 +1,167 @@
+import copy
+import pickle
+import unittest
+
+from . import init_default_config, compile_skit_config
+from engine.src.config.config import Config
+from engine.src.config.game_config import game_config
+from engine.src.exceptions import NoConfigVariantDefinedException
+from engine.src.headless_game import HeadlessGame
+from engine.src.agent.random_agent import RandomAgent
+from engine.src.lib import utils
+from engine.src.lib.lazy_import import LazyImport
+from engine.src.position_type import PositionType
+from engine.src.resource_type import ResourceType
+
+
+class ConfigTests(unittest.TestCase):
+
+    def setUp(self):
+        init_default_config()
+
+    def tearDown(self):
+        init_default_config()
+
+    def test_coerce(self):
+        structures = Config.config['game']['structure']['player_built']
+        cards = Config.config['game']['card']['development']
+
+        # Entries are coerced by their collection's default type.
+        self.assertEqual(structures['city']['cost'],
+                         {ResourceType.GRAIN: 2, ResourceType.ORE: 3})
+        self.assertIs(structures['road']['position_type'], PositionType.EDGE)
+        self.assertIs(cards['default']['play_card'], utils.noop)
+
+    def test_get_is_cached_and_read_only(self):
+        structures = Config.get('game.structure.player_built')
+
+        self.assertIs(Config.get('game.structure.player_built'), structures)
+        self.assertNotIn('default', structures)
+        self.assertIn('default', Config.get('game.structure.player_built',
+                                            remove_default=False))
+
+        with self.assertRaises(TypeError):
+            structures['road'] = None
+
+        with self.assertRaises(TypeError):
+            structures['city']['cost'][ResourceType.ORE] = 0
+
+        # Copies are the same and can be changed.
+        for structures_copy in (copy.deepcopy(structures),
+                                pickle.loads(pickle.dumps(structures, 2))):
+            self.assertEqual(structures_copy, structures)
+
+        structures_copy = structures.copy()
+        structures_copy['road'] = None
+
+    def test_set_invalidates(self):
+        self.assertEqual(Config.get('game.points_to_win'), 10)
+
+        Config.set(12, 'game.points_to_win')
+
+        self.assertEqual(Config.get('game.points_to_win'), 12)
+        self.assertEqual(Config.get('game')['points_to_win'], 12)
+
+        # As does replacing the config dict.
+        init_default_config()
+
+        self.assertEqual(Config.get('game.points_to_win'), 10)
+
+    def test_snapshot(self):
+        snapshot = Config.get_snapshot()
+        structures = snapshot.game.structure.player_built
+
+        self.assertEqual(snapshot.game.board.radius, 3)
+        self.assertEqual(structures.city.cost.get(ResourceType.ORE), 3)
+        self.assertEqual(structures['road'].cost.to_dict(),
+                         {ResourceType.LUMBER: 1, ResourceType.BRICK: 1})
+        self.assertEqual(sorted(structures),
+                         ['castle', 'city', 'default', 'road', 'settlement'])
+
+        with self.assertRaises(TypeError):
+            snapshot.game.points_to_win = 12
+
+        self.assertEqual(pickle.loads(pickle.dumps(snapshot, 2)), snapshot)
+
+        # Defaults fill in what entries leave out, and a new snapshot is made
+        # when the config changes.
+        del Config.config['game']['structure']['player_built']['castle'][
+            'base_yield']
+        Config.set(12, 'game.points_to_win')
+
+        snapshot = Config.get_snapshot()
+
+        self.assertEqual(snapshot.game.points_to_win, 12)
+        self.assertEqual(
+            snapshot.game.structure.player_built.castle.base_yield, 1)
+
+    def test_skit_snapshot(self):
+        Config.config = compile_skit_config('bigger-n-better')
+        Config.init()
+
+        snapshot = Config.get_snapshot()
+
+        self.assertEqual(snapshot.game.points_to_win, 15)
+        self.assertEqual(snapshot.game.board.radius, 4)
+        self.assertEqual(
+            snapshot.game.structure.player_built.city.cost.get(
+                ResourceType.ORE), 3)
+        self.assertIn('victory_point', snapshot.game.card.development)
+
+        game = HeadlessGame([RandomAgent(), RandomAgent(), RandomAgent()],
+                            seed=2)
+        game.start(200)
+
+        self.assertGreater(game.turn_count, 0)
+
+        # Its cards, compiled by skit, are played as the engine's are.
+        self.assertTrue(any(card.played for player in game.players
+                            for card in player.development_cards))
+
+    def test_lazy_card_functions(self):
+        play_card = Config.config['game']['card']['development']['knight'][
+            'play_card']
+
+        self.assertIsInstance(play_card, LazyImport)
+        self.assertIs(copy.deepcopy(play_card), play_card)
+        self.assertEqual(pickle.loads(pickle.dumps(play_card)), play_card)
+
+        from engine.src.config.card.development import knight
+
+        self.assertIs(play_card.resolve(), knight.play_card)
+
+    def test_variants(self):
+        variant = copy.deepcopy(game_config)
+        variant['game']['points_to_win'] = 5
+        variant['game']['board']['radius'] = 4
+
+        Config.register('small', game_config)
+        Config.register('big', variant)
+
+        games = [HeadlessGame([RandomAgent(), RandomAgent()], seed=1,
+                              config=config_name)
+                 for config_name in ('small', 'big', None)]
+
+        # The loaded config is left as it was.
+        self.assertEqual(Config.get('game.points_to_win'), 10)
+        self.assertEqual(variant['game']['points_to_win'], 5)
+
+        self.assertEqual([game.config.game.points_to_win for game in games],
+                         [10, 5, 10])
+        self.assertEqual([game.board.radius for game in games], [3, 4, 3])
+
+        # Games keep to their variant however they're interleaved.
+        for game in games:
+            game.initial_settlement_and_road_placement()
+
+        for _ in range(20):
+            for game in games:
+                game.play_turn(game.players[game.turn_count % 2])
+                game.turn_count += 1
+
+        with Config.use('big'):
+            self.assertEqual(Config.get('game.points_to_win'), 5)
+
+        with self.assertRaises(NoConfigVariantDefinedException):
+            with Config.use('huge'):
+                pass
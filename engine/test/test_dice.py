@@ -0,0 +1,44 @@
+import random
+import unittest
+from collections import Counter
+
+from engine.src.dice import Dice
+
+
+class DiceTests(unittest.TestCase):
+
+    def test_sum_counts(self):
+        self.assertEqual(Dice().get_sum_counts().tolist(),
+                         [0, 0, 1, 2, 3, 4, 5, 6, 5, 4, 3, 2, 1])
+
+        dice = Dice(3, [0, 2, 2, 5])
+        sum_counts = dict(Counter(
+            a + b + c for a in dice.values for b in dice.values
+            for c in dice.values))
+
+        self.assertEqual(
+            dict((value, count) for value, count in
+                 enumerate(dice.get_sum_counts()) if count),
+            sum_counts)
+        self.assertAlmostEqual(dice.get_sum_probabilities().sum(), 1)
+
+    def test_buffered_rolls(self):
+        roll_count = 60000
+        dice = Dice(rng=random.Random(0), buffer_size=1000)
+
+        rolls = [dice.roll() for _ in range(roll_count)]
+
+        self.assertTrue(all(type(roll_value) is int for roll_value in rolls))
+
+        counts = Counter(rolls)
+        probabilities = dice.get_sum_probabilities()
+
+        for value in range(2, 13):
+            # Within about 4 standard deviations.
+            self.assertAlmostEqual(
+                counts[value] / float(roll_count), probabilities[value],
+                delta=0.006)
+
+        same_dice = Dice(rng=random.Random(0), buffer_size=1000)
+
+        self.assertEqual([same_dice.roll() for _ in range(roll_count)], rolls)
@@ -0,0 +1,162 @@
+import copy
+import random
+import unittest
+
+from . import init_default_config
+from engine.src.config.config import Config
+from engine.src.config.game_config import game_config
+from engine.src.headless_game import HeadlessGame
+from engine.src.agent.random_agent import RandomAgent
+from engine.src.structure.structure import Structure
+from engine.src.event_log.event_type import EventType
+from engine.src.event_log.game_log import GameLog
+from engine.src.event_log.game_replay import GameReplay
+
+
+class RecordingAgent(RandomAgent):
+    """Plays at random, noting the game's state before every action."""
+
+    def __init__(self, rng, states):
+        super(RecordingAgent, self).__init__(rng)
+        self.states = states
+
+    def choose_action(self, game, player, actions):
+        self.states.append((len(game.event_log), get_game_state(game)))
+
+        return super(RecordingAgent, self).choose_action(game, player,
+                                                         actions)
+
+
+def get_game_state(game):
+    """Get what a replay should rebuild, numbered as in the game's log."""
+
+    log = game.event_log
+    board = game.board
+
+    def get_structures(vals):
+        return [(log.structure_names.index(val.name),
+                 game.players.index(val.owning_player))
+                if isinstance(val, Structure) else (-1, -1)
+                for val in vals]
+
+    def get_card_counts(player, played):
+        counts = [0] * len(log.card_names)
+
+        for card in player.development_cards:
+            if card.played == played:
+                counts[log.card_names.index(card.name)] += 1
+
+        return counts
+
+    robber_tile = board.find_tile_with_calamity(game.robber)
+
+    return (
+        [[entity.resources[resource_type]
+          for resource_type in log.resource_types]
+         for entity in game.players + [board.bank]],
+        get_structures(board.vertex_vals),
+        get_structures(board.edge_vals),
+        board.topology.tile_ids[(robber_tile.x, robber_tile.y)],
+        [[player.remaining_structure_counts[name]
+          for name in log.structure_names] for player in game.players],
+        [player.points for player in game.players],
+        [player.knights for player in game.players],
+        [player.hidden_points for player in game.players],
+        [get_card_counts(player, False) for player in game.players],
+        [get_card_counts(player, True) for player in game.players],
+        len(board.bank.development_cards)
+    )
+
+
+def get_replay_state(replay):
+    return (
+        replay.resources,
+        zip(replay.vertex_structures, replay.vertex_owners),
+        zip(replay.edge_structures, replay.edge_owners),
+        replay.robber_tile,
+        replay.remaining_structures,
+        replay.points,
+        replay.knights,
+        replay.hidden_points,
+        replay.development_cards,
+        replay.played_cards,
+        len(replay.deck)
+    )
+
+
+class EventLogTests(unittest.TestCase):
+
+    def setUp(self):
+        init_default_config()
+
+    def play_game(self, seed, max_turns=150, config=None):
+        states = []
+        game = HeadlessGame([RecordingAgent(random.Random((seed, seat)),
+                                            states)
+                             for seat in range(3)], seed=seed, config=config)
+        GameLog.attach(game)
+        game.start(max_turns)
+
+        return game, states
+
+    def test_replay_matches_game(self):
+        game, states = self.play_game(5)
+        replay = GameReplay(game.event_log)
+
+        self.assertEqual(len(replay), len(game.event_log))
+
+        for position, state in states:
+            replay.seek(position)
+            self.assertEqual(get_replay_state(replay), state)
+
+        replay.seek(len(replay))
+        self.assertEqual(get_replay_state(replay), get_game_state(game))
+
+        # Seeking backwards replays from the start.
+        position, state = states[len(states) // 2]
+        replay.seek(position)
+        self.assertEqual(get_replay_state(replay), state)
+
+    def test_logs_every_kind_of_event(self):
+        game, _ = self.play_game(6, 400)
+        kinds = set(game.event_log.get_events()['kind'].tolist())
+
+        for event_type in [EventType.ROLL, EventType.RESOURCE_COUNT,
+                           EventType.PLACE, EventType.MOVE_ROBBER,
+                           EventType.BUY_DEVELOPMENT_CARD,
+                           EventType.PLAY_DEVELOPMENT_CARD,
+                           EventType.TRADE, EventType.DISCARD,
+                           EventType.STEAL]:
+            self.assertIn(event_type.value, kinds)
+
+    def test_serialization(self):
+        game, _ = self.play_game(7, 50)
+        log = GameLog.from_bytes(game.event_log.to_bytes())
+
+        self.assertEqual(log.seed, game.rng.seed_value)
+        self.assertEqual(log.player_count, 3)
+        self.assertEqual(log.data, game.event_log.data)
+
+        with self.assertRaises(ValueError):
+            GameLog.from_bytes('XXXX' + game.event_log.to_bytes()[4:])
+
+    def test_replay_under_variant(self):
+        variant = copy.deepcopy(game_config)
+        variant['game']['board']['radius'] = 4
+        del variant['game']['structure']['player_built']['castle']
+
+        Config.register('no-castles', variant)
+
+        game, states = self.play_game(8, 100, 'no-castles')
+        log = GameLog.from_bytes(game.event_log.to_bytes())
+
+        self.assertEqual(log.config_name, 'no-castles')
+        self.assertEqual(log.structure_names, ['City', 'Road', 'Settlement'])
+
+        # The replay is built under the log's variant, not the config loaded.
+        replay = GameReplay(log)
+        replay.seek(len(replay))
+
+        self.assertEqual(replay.topology.tile_count,
+                         game.board.topology.tile_count)
+        self.assertEqual(get_replay_state(replay), get_game_state(game))
@@ -0,0 +1,78 @@
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from . import init_default_config
+from engine.src.agent.random_agent import RandomAgent
+from engine.src.simulation import iter_results
+from engine.src.archive.column_store import ColumnReader, ColumnWriter
+from engine.src.archive.game_archive import (GameArchiveReader,
+                                             archive_simulation)
+
+
+class GameArchiveTests(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        init_default_config()
+
+    def test_column_store_round_trip(self):
+        dtype = np.dtype([('id', np.int32), ('counts', np.int16, (3,))])
+        rows = np.zeros(25, dtype)
+        rows['id'] = np.arange(25)
+        rows['counts'] = np.arange(75).reshape(25, 3)
+
+        with ColumnWriter(self.path, dtype, chunk_size=10) as writer:
+            writer.append(rows[:4])
+            writer.append(rows[4:])
+
+        reader = ColumnReader(self.path)
+
+        self.assertEqual(reader.chunk_lengths, [10, 10, 5])
+        self.assertEqual(len(reader), 25)
+        self.assertTrue(np.array_equal(reader.get_column('counts'),
+                                       rows['counts']))
+
+        chunk = next(reader.iter_chunks(['id']))
+
+        self.assertIsInstance(chunk['id'], np.memmap)
+        self.assertEqual(chunk['id'].tolist(), range(10))
+
+    def test_archive_matches_results(self):
+        agent_classes = [RandomAgent] * 3
+
+        summary = archive_simulation(self.path, 3, agent_classes, seed=4,
+                                     max_turns=60, processes=1,
+                                     rows_per_chunk=100)
+        results = dict((result.seed, result) for result in
+                       iter_results(3, agent_classes, seed=4, max_turns=60,
+                                    processes=1))
+        archive = GameArchiveReader(self.path)
+
+        self.assertEqual(summary.game_count, 3)
+        self.assertEqual(sorted(archive.games.get_column('game_id')),
+                         sorted(results))
+
+        game_ids = archive.turns.get_column('game_id')
+        turns = archive.turns.get_column('turn')
+        points = archive.turns.get_column('points')
+
+        for game_id, turn_count, game_points in zip(
+                archive.games.get_column('game_id'),
+                archive.games.get_column('turn_count'),
+                archive.games.get_column('points')):
+            result = results[game_id]
+
+            self.assertEqual(turn_count, result.turn_count)
+            self.assertEqual(tuple(game_points), result.points)
+
+            # One row per seat per turn, ending with the final points.
+            is_game = game_ids == game_id
+            self.assertEqual(is_game.sum(), 3 * turn_count)
+            self.assertEqual(turns[is_game].max(), turn_count)
+            self.assertEqual(tuple(points[is_game][-3:]), result.points)
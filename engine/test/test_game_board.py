@@ -0,0 +1,220 @@
+import random
+import unittest
+
+from . import init_default_config
+from engine.src.board.game_board import GameBoard
+from engine.src.calamity.robber import Robber
+from engine.src.player import Player
+from engine.src.resource_type import ResourceType
+from engine.src.position_type import PositionType
+from engine.src.direction.edge_direction import EdgeDirection
+from engine.src.direction.vertex_direction import VertexDirection
+from engine.src.structure.structure import Structure
+from engine.src.exceptions import *
+
+
+class GameBoardProductionTests(unittest.TestCase):
+
+    def setUp(self):
+        init_default_config()
+        self.board = GameBoard(3)
+        self.players = [Player('p1'), Player('p2'), Player('p3')]
+
+        self.robber = Robber()
+        self.board.get_tile_of_resource_type(ResourceType.FALLOW)\
+            .add_calamity(self.robber)
+
+    def find_production(self, roll_value):
+        """Compute a roll's production by scanning every tile."""
+
+        production = {}
+
+        for tile in self.board.iter_tiles():
+            if tile.chit_value != roll_value or \
+                    tile.resource_type == ResourceType.FALLOW or \
+                    self.robber in tile.calamities:
+                continue
+
+            for structure in tile.get_adjacent_vertex_structures():
+                player_production = production.setdefault(
+                    structure.owning_player, {})
+                player_production[tile.resource_type] = \
+                    player_production.get(tile.resource_type, 0) + \
+                    structure.base_yield
+
+        return production
+
+    def test_production_matches_tile_scan(self):
+        rng = random.Random(0)
+        topology = self.board.topology
+
+        for _ in range(80):
+            player = rng.choice(self.players)
+            action = rng.random()
+
+            if action < 0.2:
+                tile = rng.choice(list(self.board.iter_tiles()))
+                self.board.find_tile_with_calamity(self.robber)\
+                    .remove_calamity(self.robber)
+                tile.add_calamity(self.robber)
+                continue
+
+            if action < 0.3:
+                # Swap two tiles, as the tile swap cards do.
+                tile, other_tile = rng.sample(list(self.board.iter_tiles()), 2)
+                tile.resource_type, other_tile.resource_type = \
+                    other_tile.resource_type, tile.resource_type
+                tile.chit_value, other_tile.chit_value = \
+                    other_tile.chit_value, tile.chit_value
+            else:
+                structure_name = 'Settlement' if action < 0.7 else 'City'
+                x, y, vertex_dir = rng.choice(topology.vertex_locations)[0]
+
+                try:
+                    self.board.place_vertex_structure(
+                        x, y, vertex_dir, player.get_structure(structure_name),
+                        False)
+                except (BoardPositionOccupiedException,
+                        InvalidBaseStructureException,
+                        InvalidStructurePlacementException,
+                        NotEnoughStructuresException):
+                    continue
+
+            for roll_value in range(2, 13):
+                distributions = self.board.distribute_resources_for_roll(
+                    roll_value)
+
+                # Resource types a player didn't receive are left as empty
+                # nested dicts by GameBoard.distribute_resources().
+                self.assertEqual(
+                    dict((player, dict((resource_type, count) for
+                                       resource_type, count in
+                                       resources.iteritems() if count))
+                         for player, resources in distributions.iteritems()),
+                    self.find_production(roll_value))
+
+    def test_chit_value_index(self):
+        for roll_value in range(2, 13):
+            self.assertEqual(
+                set(self.board.get_tiles_with_chit_value(roll_value)),
+                set(tile for tile in self.board.iter_tiles()
+                    if tile.chit_value == roll_value))
+
+    def test_calamity_registry_follows_robber(self):
+        self.assertIs(self.board.find_robber(), self.robber)
+
+        fallow_tile = self.board.get_tile_of_resource_type(ResourceType.FALLOW)
+        tile = self.board.get_tile_with_coords(0, 0)
+
+        self.assertIs(self.board.find_tile_with_calamity(self.robber),
+                      fallow_tile)
+        self.assertEqual(self.board.blocked_tiles, set([fallow_tile]))
+
+        fallow_tile.remove_calamity(self.robber)
+
+        self.assertIsNone(self.board.find_robber())
+        self.assertEqual(self.board.blocked_tiles, set())
+
+        tile.add_calamity(self.robber)
+
+        self.assertIs(self.board.find_tile_with_calamity(self.robber), tile)
+        self.assertEqual(self.board.blocked_tiles, set([tile]))
+
+
+class GameBoardLegalPlacementTests(unittest.TestCase):
+
+    def setUp(self):
+        init_default_config()
+        self.board = GameBoard(3)
+        self.players = [Player('p1'), Player('p2')]
+
+    def find_valid_placements(self, player, structure_name, *args):
+        """Find legal positions by attempting to validate each one."""
+
+        structure = Structure(player, player.structure_types[structure_name])
+
+        if structure.position_type == PositionType.EDGE:
+            locations = self.board.topology.edge_locations
+            get_value = lambda x, y, edge_dir: \
+                self.board.get_tile_with_coords(x, y).get_edge(edge_dir)
+        else:
+            locations = self.board.topology.vertex_locations
+            get_value = self.board.get_vertex
+
+        valid_placements = []
+
+        for location in locations:
+            x, y, direction = location[0]
+
+            try:
+                self.board.validate_structure_placement(
+                    x, y, get_value(x, y, direction), structure, direction,
+                    *args)
+                valid_placements.append(location[0])
+            except (BoardPositionOccupiedException,
+                    InvalidBaseStructureException,
+                    InvalidStructurePlacementException):
+                pass
+
+        return valid_placements
+
+    def test_matches_validation(self):
+        rng = random.Random(0)
+        topology = self.board.topology
+
+        for _ in range(40):
+            player = rng.choice(self.players)
+
+            if rng.random() < 0.6:
+                x, y, direction = rng.choice(topology.edge_locations)[0]
+                place = self.board.place_edge_structure
+                structure_name = 'Road'
+            else:
+                x, y, direction = rng.choice(topology.vertex_locations)[0]
+                place = self.board.place_vertex_structure
+                structure_name = rng.choice(['Settlement', 'City'])
+
+            try:
+                place(x, y, direction, player.get_structure(structure_name),
+                      False)
+            except (BoardPositionOccupiedException,
+                    InvalidBaseStructureException,
+                    InvalidStructurePlacementException,
+                    NotEnoughStructuresException):
+                continue
+
+            for structure_name in ['Road', 'Settlement', 'City']:
+                for must_border_claimed_edge in [True, False]:
+                    args = (must_border_claimed_edge, None, None, None)
+
+                    self.assertEqual(
+                        self.board.legal_placements(
+                            player, structure_name, *args),
+                        self.find_valid_placements(
+                            player, structure_name, *args))
+
+    def test_initial_road_placements(self):
+        player = self.players[0]
+
+        self.board.place_vertex_structure(
+            0, 0, VertexDirection.TOP, player.get_structure('Settlement'),
+            False)
+
+        placements = self.board.legal_placements(
+            player, 'Road', False, 0, 0, VertexDirection.TOP)
+
+        self.assertEqual(len(placements), 3)
+        self.assertEqual(
+            placements,
+            self.find_valid_placements(player, 'Road', False, 0, 0,
+                                       VertexDirection.TOP))
+
+    def test_cache_is_invalidated_by_placement(self):
+        player = self.players[0]
+
+        self.assertEqual(self.board.legal_placements(player, 'Road'), [])
+
+        self.board.place_edge_structure(
+            0, 0, EdgeDirection.EAST, player.get_structure('Road'), False)
+
+        self.assertEqual(len(self.board.legal_placements(player, 'Road')), 4)
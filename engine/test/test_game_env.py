@@ -0,0 +1,110 @@
+import copy
+import random
+import unittest
+
+import numpy as np
+
+from . import init_default_config
+from engine.src.config.config import Config
+from engine.src.config.game_config import game_config
+from engine.src.agent.random_agent import RandomAgent
+from engine.src.env.game_env import GameEnv
+from engine.src.env.decision_type import DecisionType
+from engine.src.structure.structure import Structure
+from engine.src.exceptions import *
+
+
+class GameEnvTests(unittest.TestCase):
+
+    def setUp(self):
+        init_default_config()
+        self.env = GameEnv([RandomAgent(random.Random(0)),
+                            RandomAgent(random.Random(1))], learner_seat=1)
+
+    def tearDown(self):
+        self.env.close()
+
+    def test_episode(self):
+        rng = random.Random(2)
+        obs = self.env.reset(3)
+        shapes = dict((name, array.shape) for name, array in obs.iteritems())
+        decision_types = set()
+        done = False
+
+        while not done:
+            legal_actions = np.flatnonzero(obs['action_mask'])
+
+            self.assertTrue(len(legal_actions))
+            self.assertEqual(obs['action_mask'].shape,
+                             (self.env.action_space.size,))
+
+            decision_types.add(DecisionType(int(obs['decision'])))
+
+            obs, reward, done, info = self.env.step(rng.choice(legal_actions))
+
+            self.assertEqual(
+                dict((name, array.shape) for name, array in obs.iteritems()),
+                shapes)
+
+        self.assertFalse(obs['action_mask'].any())
+        self.assertEqual(obs['decision'], -1)
+        self.assertIn(reward, [-1, 1])
+        self.assertIn(DecisionType.ACTION, decision_types)
+        self.assertIn(DecisionType.PLACEMENT, decision_types)
+
+        with self.assertRaises(IllegalActionException):
+            self.env.step(0)
+
+    def test_observation_is_relative_to_learner(self):
+        obs = self.env.reset(4)
+        learner = self.env.game.players[1]
+
+        self.env.step(np.flatnonzero(obs['action_mask'])[0])
+        obs = self.env.get_observation()
+
+        for vertex_id, vertex_val in \
+                enumerate(self.env.game.board.vertex_vals):
+            if isinstance(vertex_val, Structure):
+                self.assertEqual(obs['vertex_owners'][vertex_id] == 0,
+                                 vertex_val.owning_player == learner)
+            else:
+                self.assertEqual(obs['vertex_owners'][vertex_id], -1)
+
+        self.assertTrue((obs['vertex_owners'] == 0).any())
+
+    def test_illegal_action(self):
+        obs = self.env.reset(5)
+
+        with self.assertRaises(IllegalActionException):
+            self.env.step(np.flatnonzero(~obs['action_mask'])[0])
+
+    def test_reset_is_reproducible(self):
+        first_obs = self.env.reset(6)
+        self.env.step(np.flatnonzero(first_obs['action_mask'])[0])
+
+        obs = self.env.reset(6)
+
+        # Opponents draw from their own rngs, so only the board is the same.
+        for name in ['tile_resources', 'tile_chits', 'robber']:
+            self.assertEqual(obs[name].tolist(), first_obs[name].tolist())
+
+    def test_variant(self):
+        variant = copy.deepcopy(game_config)
+        variant['game']['board']['radius'] = 4
+        del variant['game']['structure']['player_built']['castle']
+
+        Config.register('no-castles', variant)
+
+        env = GameEnv(self.env.opponents, config='no-castles')
+        obs = env.reset(7)
+
+        try:
+            self.assertEqual(env.game.board.radius, 4)
+            self.assertEqual(env.action_space.structure_names,
+                             ['City', 'Road', 'Settlement'])
+            self.assertEqual(obs['tile_resources'].shape,
+                             (env.game.board.topology.tile_count,))
+
+            obs, _, _, _ = env.step(np.flatnonzero(obs['action_mask'])[0])
+        finally:
+            env.close()
@@ -0,0 +1,201 @@
+import random
+import unittest
+
+from . import init_default_config
+from engine.src.game import Game
+from engine.src.board.array_board_state import ArrayBoardState
+from engine.src.player import Player
+from engine.src.resource_type import ResourceType
+from engine.src.position_type import PositionType
+from engine.src.board.game_board import GameBoard
+from engine.src.exceptions import *
+
+
+class GameSnapshotTests(unittest.TestCase):
+
+    def setUp(self):
+        init_default_config()
+        self.game = Game()
+        self.game.players = [Player('p1'), Player('p2'), Player('p3')]
+
+        ArrayBoardState.attach(self.game.board, self.game.players)
+
+    def make_random_move(self, rng):
+        """Change the board, or move resources around, at random."""
+
+        board = self.game.board
+        topology = board.topology
+        player = rng.choice(self.game.players)
+        action = rng.random()
+
+        if action < 0.1:
+            board.find_tile_with_calamity(self.game.robber)\
+                .remove_calamity(self.game.robber)
+            rng.choice(board.tiles_by_id).add_calamity(self.game.robber)
+        elif action < 0.2:
+            tile, other_tile = rng.sample(board.tiles_by_id, 2)
+            tile.resource_type, other_tile.resource_type = \
+                other_tile.resource_type, tile.resource_type
+            tile.chit_value, other_tile.chit_value = \
+                other_tile.chit_value, tile.chit_value
+        elif action < 0.3:
+            board.distribute_resources_for_roll(rng.randint(2, 12))
+        elif action < 0.35:
+            try:
+                board.bank.buy_development_card(player)
+            except (NotEnoughDevelopmentCardsException,
+                    NotEnoughResourcesException):
+                pass
+        else:
+            if action < 0.7:
+                structure_name = 'Road'
+                locations = topology.edge_locations
+                place = board.place_edge_structure
+            else:
+                structure_name = rng.choice(['Settlement', 'City'])
+                locations = topology.vertex_locations
+                place = board.place_vertex_structure
+
+            x, y, direction = rng.choice(locations)[0]
+
+            try:
+                place(x, y, direction, player.get_structure(structure_name),
+                      False)
+            except (BoardPositionOccupiedException,
+                    InvalidBaseStructureException,
+                    InvalidStructurePlacementException):
+                player.restore_structure(structure_name)
+            except NotEnoughStructuresException:
+                pass
+
+        self.game.update_point_counts()
+
+    def get_state(self):
+        """Get everything a snapshot or undo should restore, for comparison."""
+
+        board = self.game.board
+        array_state = board.array_state
+
+        return (
+            tuple(board.vertex_vals),
+            tuple(board.edge_vals),
+            tuple(tile.snapshot() for tile in board.tiles_by_id),
+            # Undoing a placement may leave a yield of 0 behind.
+            frozenset((roll_value, player, resource_type, count)
+                      for roll_value, player_production in
+                      board.production.iteritems()
+                      for player, resources in player_production.iteritems()
+                      for resource_type, count in resources.iteritems()
+                      if count),
+            dict((chit_value, frozenset(tiles)) for chit_value, tiles in
+                 board.chit_value_tiles.iteritems() if tiles),
+            dict(board.calamity_tiles),
+            frozenset(board.blocked_tiles),
+            board.longest_roads.get_per_player_road_lens(),
+            tuple(getattr(array_state, name).tolist()
+                  for name in ArrayBoardState.STATE_ARRAY_NAMES),
+            tuple(player.snapshot() for player in self.game.players),
+            board.bank.snapshot()
+        )
+
+    def compute_state_hash(self):
+        """Hash the game's state from scratch, as Game.state_hash() would."""
+
+        board = self.game.board
+        bank = board.bank
+        state_hash = 0
+
+        for tile in board.tiles_by_id:
+            state_hash ^= board._get_tile_key(tile)
+
+            for calamity in tile.calamities:
+                state_hash ^= board._get_calamity_key(calamity, tile)
+
+        for vertex_id, vertex_val in enumerate(board.vertex_vals):
+            state_hash ^= GameBoard._get_structure_key(
+                PositionType.VERTEX.value, vertex_id, vertex_val)
+
+        for edge_id, edge_val in enumerate(board.edge_vals):
+            state_hash ^= GameBoard._get_structure_key(
+                PositionType.EDGE.value, edge_id, edge_val)
+
+        for position, card in enumerate(bank.development_cards):
+            state_hash ^= bank._get_card_key(position, card)
+
+        for entity in self.game.players + [bank]:
+            for resource_type, count in entity.resources.iteritems():
+                state_hash ^= entity._get_resource_key(resource_type, count)
+
+        return state_hash
+
+    def give_resources(self, count):
+        for player in self.game.players:
+            for resource_type in ResourceType.get_arable_types():
+                player.deposit_resources(resource_type, count)
+
+    def test_restore(self):
+        rng = random.Random(0)
+        self.give_resources(4)
+
+        for _ in range(30):
+            self.make_random_move(rng)
+
+        snapshot = self.game.snapshot()
+        state = self.get_state()
+
+        for _ in range(3):
+            for _ in range(30):
+                self.make_random_move(rng)
+
+            self.assertNotEqual(self.get_state(), state)
+
+            self.game.restore(snapshot)
+
+            self.assertEqual(self.get_state(), state)
+
+    def test_undo(self):
+        rng = random.Random(1)
+        self.give_resources(4)
+
+        states = []
+
+        for _ in range(60):
+            states.append(self.get_state())
+            self.game.begin_action()
+            self.make_random_move(rng)
+
+        while states:
+            self.game.undo_action()
+            self.assertEqual(self.get_state(), states.pop())
+            self.assertEqual(self.game.state_hash(),
+                             self.compute_state_hash())
+
+        self.assertIsNone(self.game.board.journal)
+
+    def test_state_hash(self):
+        rng = random.Random(2)
+        self.give_resources(4)
+
+        hashes = set([self.game.state_hash()])
+
+        for _ in range(60):
+            self.make_random_move(rng)
+
+            self.assertEqual(self.game.state_hash(),
+                             self.compute_state_hash())
+
+            hashes.add(self.game.state_hash())
+
+        # Moves can cancel out, but mostly the state keeps changing.
+        self.assertGreater(len(hashes), 30)
+
+        snapshot = self.game.snapshot()
+        state_hash = self.game.state_hash()
+
+        for _ in range(30):
+            self.make_random_move(rng)
+
+        self.game.restore(snapshot)
+
+        self.assertEqual(self.game.state_hash(), state_hash)
+        self.assertEqual(self.game.state_hash(), self.compute_state_hash())
@@ -0,0 +1,71 @@
+import random
+import sys
+import unittest
+
+from . import init_default_config
+from engine.src.headless_game import HeadlessGame
+from engine.src.agent.random_agent import RandomAgent
+from engine.src.resource_type import ResourceType
+from engine.src.structure.structure import Structure
+
+
+class HeadlessGameTests(unittest.TestCase):
+
+    def setUp(self):
+        init_default_config()
+
+    def play_game(self, seed, max_turns=400):
+        game = HeadlessGame([RandomAgent(random.Random((seed, seat)))
+                             for seat in range(3)], seed=seed)
+        winner = game.start(max_turns)
+
+        return game, winner
+
+    def test_plays_without_terminal(self):
+        stdin = sys.stdin
+        sys.stdin = None
+
+        try:
+            for seed in range(3):
+                game, winner = self.play_game(seed)
+
+                self.assertGreater(game.turn_count, 0)
+
+                if winner is not None:
+                    self.assertGreaterEqual(winner.get_total_points(), 10)
+        finally:
+            sys.stdin = stdin
+
+    def test_resources_are_conserved(self):
+        game, _ = self.play_game(3, 100)
+
+        for resource_type in ResourceType.get_arable_types():
+            self.assertEqual(
+                game.board.bank.resources[resource_type] +
+                sum(player.resources[resource_type]
+                    for player in game.players),
+                19)
+
+    def test_points_match_board(self):
+        game, _ = self.play_game(4, 100)
+
+        for player in game.players:
+            structures = [vertex_val for vertex_val in game.board.vertex_vals
+                          if isinstance(vertex_val, Structure) and
+                          vertex_val.owning_player == player]
+
+            self.assertEqual(
+                player.points,
+                sum(structure.point_value for structure in structures))
+
+    def test_seed_reproduces_game(self):
+        random.seed(0)
+        game, _ = self.play_game(5, 100)
+
+        random.seed(1)
+        same_game, _ = self.play_game(5, 100)
+
+        other_game, _ = self.play_game(6, 100)
+
+        self.assertEqual(game.state_hash(), same_game.state_hash())
+        self.assertNotEqual(game.state_hash(), other_game.state_hash())
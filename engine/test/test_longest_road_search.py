@@ -0,0 +1,190 @@
+import random
+import unittest
+
+from . import init_default_config
+from .legacy_longest_road_search import LongestRoadSearch as \
+    LegacyLongestRoadSearch
+from engine.src.board.game_board import GameBoard
+from engine.src.player import Player
+from engine.src.structure.structure import Structure
+from engine.src.exceptions import *
+from engine.src.longest_road_search import LongestRoadSearch
+from engine.src.direction.edge_direction import EdgeDirection
+from engine.src.direction.vertex_direction import VertexDirection
+
+
+class LongestRoadSearchTests(unittest.TestCase):
+
+    def setUp(self):
+        init_default_config()
+        self.board = GameBoard(3)
+        self.players = [Player('p1'), Player('p2'), Player('p3')]
+
+    def place_random_roads(self, rng, player, road_count):
+        """Grow a random acyclic road network for the player.
+
+        The legacy search over counts networks that contain a cycle, so new
+        roads only ever lead to vertices the network hasn't reached yet.
+        """
+
+        topology = self.board.topology
+        edge_id = rng.choice([
+            edge_id for edge_id, edge_val in enumerate(self.board.edge_vals)
+            if not isinstance(edge_val, Structure)
+        ])
+
+        reached_vertex_ids = set(topology.edge_vertices[edge_id])
+        edge_ids = [edge_id]
+
+        while len(edge_ids) < road_count:
+            candidates = []
+
+            for vertex_id in reached_vertex_ids:
+                for edge_id in topology.vertex_edges[vertex_id]:
+                    other_id = [other_id for other_id in
+                                topology.edge_vertices[edge_id]
+                                if other_id != vertex_id][0]
+
+                    if other_id not in reached_vertex_ids and \
+                            not isinstance(self.board.edge_vals[edge_id],
+                                           Structure):
+                        candidates.append((edge_id, other_id))
+
+            if not candidates:
+                break
+
+            edge_id, other_id = rng.choice(candidates)
+            edge_ids.append(edge_id)
+            reached_vertex_ids.add(other_id)
+
+        for edge_id in edge_ids:
+            self.board.update_edge_with_id(edge_id,
+                                           player.get_structure('Road'))
+
+    def test_matches_legacy_search_on_random_boards(self):
+        for seed in range(50):
+            rng = random.Random(seed)
+            self.setUp()
+
+            for player in self.players:
+                self.place_random_roads(rng, player, rng.randint(1, 12))
+
+            expected = LegacyLongestRoadSearch(self.board).execute()
+            actual = LongestRoadSearch(self.board).execute()
+
+            self.assertEqual(actual, expected, 'seed {}'.format(seed))
+
+    def test_road_around_tile(self):
+        player = self.players[0]
+
+        for edge_dir in EdgeDirection:
+            self.board.update_edge(0, 0, edge_dir,
+                                   player.get_structure('Road'))
+
+        self.assertEqual(LongestRoadSearch(self.board).execute(), {player: 6})
+
+        # A spur off the ring extends the road by one.
+        self.board.update_edge(1, 0, EdgeDirection.NORTH_WEST,
+                               player.get_structure('Road'))
+
+        self.assertEqual(LongestRoadSearch(self.board).execute(), {player: 7})
+
+    def test_opponent_settlement_breaks_road(self):
+        player, opponent = self.players[:2]
+
+        # Four roads running west to east along the northern edges of the
+        # center tile and its eastern neighbor.
+        for x, edge_dir in [(0, EdgeDirection.NORTH_WEST),
+                            (0, EdgeDirection.NORTH_EAST),
+                            (1, EdgeDirection.NORTH_WEST),
+                            (1, EdgeDirection.NORTH_EAST)]:
+            self.board.update_edge(x, 0, edge_dir,
+                                   player.get_structure('Road'))
+
+        self.assertEqual(LongestRoadSearch(self.board).execute(), {player: 4})
+
+        # Breaking the road at the vertex it shares between the two tiles
+        # leaves two roads of length 2.
+        self.board.update_vertex(0, 0, VertexDirection.TOP_RIGHT,
+                                 opponent.get_structure('Settlement'))
+
+        self.assertEqual(LongestRoadSearch(self.board).execute(), {player: 2})
+
+        # The player's own settlements do not break their road.
+        self.board.update_vertex(0, 0, VertexDirection.TOP_RIGHT,
+                                 player.get_structure('Settlement'))
+
+        self.assertEqual(LongestRoadSearch(self.board).execute(), {player: 4})
+
+
+class LongestRoadTrackerTests(unittest.TestCase):
+
+    def setUp(self):
+        init_default_config()
+        self.board = GameBoard(3)
+        self.players = [Player('p1'), Player('p2'), Player('p3')]
+
+    def test_matches_full_search_after_each_placement(self):
+        rng = random.Random(0)
+        topology = self.board.topology
+
+        for _ in range(120):
+            player = rng.choice(self.players)
+
+            if rng.random() < 0.75:
+                structure_name = 'Road'
+                place = self.board.place_edge_structure
+
+                # Mostly extend the player's existing roads, so that roads
+                # grow long enough for settlements to split them.
+                locations = [
+                    topology.edge_locations[adjacent_id]
+                    for edge_id, edge_val in enumerate(self.board.edge_vals)
+                    if isinstance(edge_val, Structure) and
+                    edge_val.owning_player == player
+                    for adjacent_id in topology.edge_edges[edge_id]
+                ]
+
+                if not locations or rng.random() < 0.1:
+                    locations = topology.edge_locations
+            else:
+                structure_name = 'Settlement'
+                place = self.board.place_vertex_structure
+
+                # Settle next to opponents' roads, where they can be split.
+                locations = [
+                    topology.vertex_locations[vertex_id]
+                    for edge_id, edge_val in enumerate(self.board.edge_vals)
+                    if isinstance(edge_val, Structure) and
+                    edge_val.owning_player != player
+                    for vertex_id in topology.edge_vertices[edge_id]
+                ] or topology.vertex_locations
+
+            x, y, direction = rng.choice(locations)[0]
+
+            try:
+                place(x, y, direction, player.get_structure(structure_name),
+                      False)
+            except (BoardPositionOccupiedException,
+                    InvalidBaseStructureException,
+                    InvalidStructurePlacementException,
+                    NotEnoughStructuresException):
+                continue
+
+            self.assertEqual(self.board.longest_roads.get_per_player_road_lens(),
+                             LongestRoadSearch(self.board).execute())
+
+    def test_rebuild_picks_up_existing_roads(self):
+        player = self.players[0]
+
+        for edge_dir in EdgeDirection:
+            self.board.update_edge(0, 0, edge_dir,
+                                   player.get_structure('Road'))
+
+        self.assertEqual(self.board.longest_roads.get_per_player_road_lens(),
+                         {})
+
+        self.board.longest_roads.rebuild()
+
+        self.assertEqual(self.board.longest_roads.get_per_player_road_lens(),
+                         {player: 6})
@@ -0,0 +1,93 @@
+import random
+import unittest
+
+from . import init_default_config
+from engine.src.headless_game import HeadlessGame
+from engine.src.resource_type import ResourceType
+from engine.src.agent.random_agent import RandomAgent
+from engine.src.agent.mcts_agent import MCTSAgent
+from engine.src.event_log.game_log import GameLog
+
+
+class MCTSAgentTests(unittest.TestCase):
+
+    def setUp(self):
+        init_default_config()
+
+    def create_game(self, agent, seed=0):
+        game = HeadlessGame([agent, RandomAgent(random.Random(seed)),
+                             RandomAgent(random.Random(seed + 1))],
+                            seed=seed)
+        GameLog.attach(game)
+
+        return game
+
+    def start_turn(self, game):
+        """Place the initial structures and roll for the first player, who is
+        then given enough to have a choice of actions."""
+
+        game.initial_settlement_and_road_placement()
+
+        player = game.players[0]
+        game.current_player = player
+        game.roll_dice()
+
+        for resource_type in ResourceType.get_arable_types():
+            game.board.bank.transfer_resources(player, resource_type, 4)
+
+        return player
+
+    def get_state(self, game):
+        return (game.state_hash(), game.turn_count, game.current_player,
+                game.dice.rng.getstate(), game.robber.rng.getstate(),
+                list(game.board.bank.development_cards),
+                str(game.event_log.data))
+
+    def test_search_leaves_game_untouched(self):
+        agent = MCTSAgent(random.Random(0), iterations=30)
+        game = self.create_game(agent)
+        player = self.start_turn(game)
+
+        state = self.get_state(game)
+        actions = game.get_legal_actions(player)
+
+        self.assertIn(agent.choose_action(game, player, actions), actions)
+        self.assertEqual(agent.rollout_count, 30)
+        self.assertEqual(self.get_state(game), state)
+
+    def test_plays_game(self):
+        agent = MCTSAgent(random.Random(1), iterations=10, rollout_turns=3)
+        game = self.create_game(agent, 1)
+        game.start(15)
+
+        self.assertEqual(game.turn_count, 15)
+        self.assertGreater(agent.rollout_count, 0)
+        self.assertGreater(agent.rollouts_per_second, 0)
+
+    def test_parallel_search(self):
+        agent = MCTSAgent(random.Random(2), iterations=20, processes=2)
+        game = self.create_game(agent, 2)
+        player = self.start_turn(game)
+
+        root, rollout_count = agent._search_parallel(game, player)
+
+        self.assertEqual(rollout_count, 20)
+        self.assertEqual(root.visits, 20)
+        self.assertEqual(sum(child.visits
+                             for child in root.children.itervalues()), 20)
+
+    def test_small_searches_are_serial(self):
+        agents = [MCTSAgent(random.Random(3), iterations=20, processes=2),
+                  MCTSAgent(random.Random(3), iterations=20)]
+        choices = []
+
+        for agent in agents:
+            game = self.create_game(agent, 3)
+            player = self.start_turn(game)
+
+            choices.append(agent.choose_action(
+                game, player, game.get_legal_actions(player)))
+
+        # Searching from worker processes would draw their seeds first.
+        self.assertEqual(choices[0], choices[1])
+        self.assertEqual(agents[0].rng.getstate(), agents[1].rng.getstate())
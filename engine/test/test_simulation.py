@@ -0,0 +1,97 @@
+import unittest
+
+from . import init_default_config, compile_skit_config
+from engine.src.agent.random_agent import RandomAgent
+from engine.src.config.config import Config
+from engine.src.config.game_config import game_config
+from engine.src.simulation import iter_results, simulate, \
+    get_structure_names
+
+
+class SimulationTests(unittest.TestCase):
+
+    def setUp(self):
+        init_default_config()
+
+    def tearDown(self):
+        Config.unregister('big-city')
+        init_default_config()
+
+    def test_pool_matches_single_process(self):
+        agent_classes = [RandomAgent] * 3
+
+        pool_results = sorted(iter_results(4, agent_classes, seed=1,
+                                           processes=2, chunk_size=1))
+        results = sorted(iter_results(4, agent_classes, seed=1, processes=1))
+
+        self.assertEqual(pool_results, results)
+        self.assertEqual(len(set(result.seed for result in results)), 4)
+
+    def test_summary(self):
+        summary = simulate(4, [RandomAgent] * 3, seed=2, processes=1)
+        results = list(iter_results(4, [RandomAgent] * 3, seed=2,
+                                    processes=1))
+
+        self.assertEqual(summary.game_count, 4)
+        self.assertEqual(sum(summary.win_counts) + summary.unfinished_count, 4)
+        self.assertEqual(summary.turn_total,
+                         sum(result.turn_count for result in results))
+        self.assertEqual(summary.point_totals,
+                         [sum(result.points[seat] for result in results)
+                          for seat in range(3)])
+        self.assertAlmostEqual(sum(summary.get_win_rates()), 1)
+
+    def test_recorded_turns_under_variant(self):
+        config = compile_skit_config('big-city')
+        agent_classes = [RandomAgent] * 3
+
+        Config.register('big-city', config)
+
+        configs = {'big-city': config}
+        pool_results = sorted(iter_results(2, agent_classes, configs, seed=3,
+                                           max_turns=60, processes=2,
+                                           record_turns=True))
+        results = sorted(iter_results(2, agent_classes, configs, seed=3,
+                                      max_turns=60, processes=1,
+                                      record_turns=True))
+
+        structure_names = get_structure_names('big-city')
+
+        self.assertIn('Big City', structure_names)
+
+        settlement_code = structure_names.index('Settlement')
+
+        for pool_result, result in zip(pool_results, results):
+            self.assertTrue((pool_result.turns == result.turns).all())
+            self.assertEqual(result.turns.dtype['structures'].shape,
+                             (len(structure_names),))
+            self.assertTrue((result.turns['structures'] >= 0).all())
+            self.assertTrue(
+                result.turns['structures'][:, settlement_code].all())
+
+    def test_configs_in_one_pool(self):
+        configs = {'default': game_config,
+                   'big-city': compile_skit_config('big-city')}
+        agent_classes = [RandomAgent] * 3
+        structure_names = get_structure_names()
+
+        Config.register('big-city', configs['big-city'])
+
+        results = sorted(iter_results(2, agent_classes, configs, seed=4,
+                                      max_turns=30, processes=1,
+                                      record_turns=True))
+
+        self.assertEqual([result.config_name for result in results],
+                         ['big-city'] * 2 + ['default'] * 2)
+        self.assertEqual([result.seed for result in results[:2]],
+                         [result.seed for result in results[2:]])
+
+        self.assertEqual(results[0].turns.dtype['structures'].shape,
+                         (len(get_structure_names('big-city')),))
+        self.assertEqual(results[-1].turns.dtype['structures'].shape,
+                         (len(structure_names),))
+
+        # Games are played under variants, leaving the loaded config alone.
+        self.assertEqual(get_structure_names(), structure_names)
+        self.assertFalse([name for name in Config.variants
+                          if name.startswith('simulation:')])
@@ -0,0 +1,105 @@
+import copy
+import os
+import shutil
+import tempfile
+import unittest
+
+from engine.src.agent.random_agent import RandomAgent
+from engine.src.config.config import Config
+from engine.src.config.game_config import game_config
+from engine.src.tournament.elo_ratings import EloRatings
+from engine.src.tournament.tournament import Tournament
+
+
+ENTRANTS = {'a': RandomAgent, 'b': RandomAgent, 'c': RandomAgent}
+
+
+class TournamentTests(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def create_tournament(self, checkpoint_path=None, configs=None,
+                          max_turns=40):
+        return Tournament(ENTRANTS, configs, player_count=2, seed=3,
+                          max_turns=max_turns,
+                          checkpoint_path=checkpoint_path)
+
+    def test_elo_ratings(self):
+        ratings = EloRatings(['a', 'b', 'c'])
+
+        ratings.update([('a', 10), ('b', 4), ('c', 4)])
+
+        self.assertGreater(ratings.ratings['a'], 1500)
+        self.assertEqual(ratings.ratings['b'], ratings.ratings['c'])
+        self.assertAlmostEqual(sum(ratings.ratings.values()), 3 * 1500)
+        self.assertEqual(ratings.get_rankings()[0][0], 'a')
+
+        # Beating a higher rated player gains more than half the K-factor.
+        rating = ratings.ratings['b']
+        ratings.update([('b', 1), ('a', 0)])
+
+        self.assertGreater(ratings.ratings['b'] - rating, 16)
+
+    def test_seat_rotation(self):
+        tournament = self.create_tournament()
+
+        self.assertEqual(
+            sorted(match.entrants for match in tournament.matches),
+            [('a', 'b'), ('a', 'c'), ('b', 'a'), ('b', 'c'), ('c', 'a'),
+             ('c', 'b')])
+
+        # Rotations of the same entrants are played on the same board.
+        seeds = dict((match.entrants, match.seed)
+                     for match in tournament.matches)
+        self.assertEqual(seeds[('a', 'b')], seeds[('b', 'a')])
+        self.assertNotEqual(seeds[('a', 'b')], seeds[('a', 'c')])
+
+    def test_resume(self):
+        ratings = self.create_tournament().run(processes=1)
+
+        checkpoint_path = os.path.join(self.path, 'checkpoint.json')
+        tournament = self.create_tournament(checkpoint_path)
+        tournament.run(processes=1, max_matches=4)
+
+        self.assertEqual(len(tournament.results), 4)
+
+        tournament = self.create_tournament(checkpoint_path)
+
+        self.assertEqual(len(tournament.results), 4)
+        self.assertEqual(tournament.run(processes=1)['default'].ratings,
+                         ratings['default'].ratings)
+        self.assertEqual(len(tournament.results), 6)
+
+        with self.assertRaises(ValueError):
+            Tournament(ENTRANTS, player_count=2, seed=4,
+                       checkpoint_path=checkpoint_path)
+
+        # As is one under a config of the same name but other contents, or
+        # with other max turns.
+        variant = copy.deepcopy(game_config)
+        variant['game']['points_to_win'] = 5
+
+        with self.assertRaises(ValueError):
+            self.create_tournament(checkpoint_path, {'default': variant})
+
+        with self.assertRaises(ValueError):
+            self.create_tournament(checkpoint_path, max_turns=80)
+
+    def test_variants_left_alone(self):
+        variant = copy.deepcopy(game_config)
+        variant['game']['points_to_win'] = 5
+
+        Config.register('default', variant)
+
+        self.create_tournament().run(processes=1)
+
+        with Config.use('default'):
+            self.assertEqual(Config.get('game.points_to_win'), 5)
+
+        # Nor are the tournament's own left behind.
+        self.assertFalse([name for name in Config.variants
+                          if name.startswith('tournament:')])
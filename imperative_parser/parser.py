@@ -424,8 +424,12 @@ def p_empty(p):
     """empty :"""
     pass
 
-test_parser = yacc.yacc(start='stmtlst', errorlog=yacc.NullLogger())
-parser = yacc.yacc(start='topfunc', errorlog=yacc.NullLogger())
+# Each parser gets its own table module, as ply imports tables by module name
+# and would otherwise read another parser's, e.g. skit's.
+test_parser = yacc.yacc(start='stmtlst', tabmodule='stmtlst_parsetab',
+                        errorlog=yacc.NullLogger())
+parser = yacc.yacc(start='topfunc', tabmodule='topfunc_parsetab',
+                   errorlog=yacc.NullLogger())
 
 class BadParseException(Exception):
     def __init__(self, *args, **kwargs):